@@ -29,6 +29,13 @@ bl_info = {'name': 'Armature Panel',
 ## IMPORTS ##
 #############
 import bpy
+import os
+import re
+from collections import deque
+from functools import wraps
+from fnmatch import fnmatchcase
+from time import perf_counter
+from bpy.app.handlers import persistent
 from bpy.types import Operator, PropertyGroup, Menu, Panel
 from bpy.props import *
     # PEP8 Compliant
@@ -37,415 +44,3334 @@ from bpy.props import *
 ###############
 ## FUNCTIONS ##
 ###############
+# ##### PROFILING FUNCTIONS #####
+
+# Profiling state; calls are only timed while enabled. Set
+# ARMATURE_PANEL_PROFILE=1 before starting Blender to also time the add-on's
+# registration, which runs before the panel's toggle exists.
+profiling = {'enabled': (os.environ.get('ARMATURE_PANEL_PROFILE', '0')
+                         not in ('', '0'))}
+# Profile samples; ring buffer of (name, seconds, subject).
+profileSamples = deque(maxlen=8192)
+# Profile counts; calls per name since the last reset.
+profileCounts = {}
+
+
+# Profiled function.
+def profiled(name, subject=None):
+    """
+    Decorator timing the calls of a function while profiling is enabled; name
+    and subject (the bone or armature the call worked on) may be callables
+    that receive the call's arguments.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiling['enabled']:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                duration = (perf_counter() - start)
+                try:
+                    sampleName = name(*args) if callable(name) else name
+                    sampleSubject = subject(*args) if subject else ''
+                except Exception:
+                    sampleName, sampleSubject = (getattr(function, '__name__',
+                                                         'unknown'), '')
+                profileSamples.append((sampleName, duration, sampleSubject))
+                profileCounts[sampleName] = (profileCounts.get(sampleName, 0)
+                                             + 1)
+        return wrapper
+    return decorator
+
+
+# Profile statistics function.
+def profileStatistics():
+    """
+    {name: {'calls', 'p50', 'p99', 'worst'}} from the ring buffer; times in
+    milliseconds, worst lists the three slowest (milliseconds, subject) pairs.
+    """
+    durations = {}
+    for name, duration, subject in profileSamples:
+        durations.setdefault(name, []).append((duration, subject))
+    statistics = {}
+    for name, samples in sorted(durations.items()):
+        samples.sort()
+        last = (len(samples) - 1)
+        statistics[name] = {'calls': profileCounts.get(name, len(samples)),
+                            'p50': (samples[round(last * 0.5)][0] * 1000),
+                            'p99': (samples[round(last * 0.99)][0] * 1000),
+                            'worst': [((duration * 1000), subject) for
+                                      duration, subject in samples[:-4:-1]]}
+    return statistics
+
+
+# Reset profile function.
+def resetProfile():
+    """ Forget every sample and count. """
+    profileSamples.clear()
+    profileCounts.clear()
+
+
+# Profiling update function.
+def profilingUpdate(self, context):
+    """ Enable or disable the timing of the instrumented functions. """
+    profiling['enabled'] = self.profiling
+
+
 # ##### OPERATOR FUNCTIONS #####
 
-# Shape to bone function.
-def shapeToBone(self, context):
+# Shape to bone function.
+@profiled('shapeToBone', lambda self, context: (context.active_object.name +
+                                                ':' + context.active_bone.name))
+def shapeToBone(self, context):
+    """
+    Takes the custom shape assigned to the active pose bone and aligns it to the
+    pose bone's orientation.
+    """
+    
+    # Main variables.
+    shapeToBoneOptions = context.window_manager.shapeToBoneSettings
+    activeArmature = context.active_object
+    activeBone = context.active_bone
+    activePoseBone = activeArmature.pose.bones[activeBone.name]
+    alignShape(activeArmature, activePoseBone, shapeToBoneOptions)
+
+
+# Align shape function.
+@profiled('alignShape', lambda armatureObject, poseBone, options: (
+          armatureObject.name + ':' + poseBone.name))
+def alignShape(armatureObject, poseBone, options):
+    """
+    Per-bone path of shapeToBone; decomposes the target matrix of a single pose
+    bone with mathutils and places its custom shape.
+    """
+    
+    # Main variables.
+    bone = poseBone.bone
+    shapeTransform = poseBone.custom_shape_transform
+    
+    # Custom shape transform.
+    if shapeTransform:
+        targetMatrix = (armatureObject.matrix_world @ shapeTransform.matrix)
+    else:
+        targetMatrix = (armatureObject.matrix_world @ bone.matrix_local)
+    
+    # Location, rotation, scale.
+    targetScale = targetMatrix.to_scale()
+    scaleAverage = ((targetScale[0] + targetScale[1] + targetScale[2]) / 3)
+    placeShape(armatureObject, poseBone, targetMatrix.to_translation(),
+               targetMatrix.to_euler(), (bone.length * scaleAverage), options)
+
+
+# Shapes to bones function.
+@profiled('shapeToBones', lambda armatureObject, poseBones, options:
+          armatureObject.name)
+def shapeToBones(armatureObject, poseBones, options):
+    """
+    Batch path of shapeToBone; reads the bone matrices and lengths of the whole
+    armature in bulk and decomposes every target matrix in one vectorized pass.
+    Returns the number of custom shapes that were aligned.
+    """
+    poseBones = [poseBone for poseBone in poseBones if poseBone.custom_shape]
+    if not poseBones:
+        return 0
+    poseBones, targetMatrices, lengths = alignmentTargets(armatureObject,
+                                                          poseBones, options)
+    placeShapes(armatureObject, poseBones, targetMatrices, lengths, options)
+    return len(poseBones)
+
+
+# Alignment targets function.
+def alignmentTargets(armatureObject, poseBones, options):
+    """
+    (pose bones, target matrices, lengths) for pose bones with custom shapes;
+    in mirror mode the pose bones are reordered and extended by mirrorTargets.
+    """
+    if getattr(options, 'mirrorShapes', False):
+        return mirrorTargets(armatureObject, poseBones)
+    targetMatrices, lengths = shapeTargets(armatureObject, poseBones)
+    return poseBones, targetMatrices, lengths
+
+
+# Mirror targets function.
+def mirrorTargets(armatureObject, poseBones):
+    """
+    Mirror mode of alignmentTargets; only one bone of each left/right pair is
+    aligned from its own matrices, its partner's target is that matrix
+    mirrored across the armature's X axis.
+    """
+    import numpy
+    
+    # Main variables.
+    pairs = mirrorPairs(armatureObject.data)
+    index = poseBoneIndex(armatureObject)
+    selected = {poseBone.name for poseBone in poseBones}
+    primaries = []
+    partners = []
+    done = set()
+    
+    # Pairs; the left bone leads when both sides are aligned.
+    for poseBone in poseBones:
+        name = poseBone.name
+        if name in done:
+            continue
+        partner = index.get(pairs.get(name))
+        if partner is None or not partner.custom_shape:
+            partner = None
+        elif partner.name in selected and splitSide(name)[1] != 'L':
+            continue
+        primaries.append(poseBone)
+        partners.append(partner)
+        done.add(name)
+        if partner:
+            done.add(partner.name)
+    
+    # Targets.
+    targetMatrices, lengths = shapeTargets(armatureObject, primaries)
+    mirrored = [row for row, partner in enumerate(partners) if partner]
+    if mirrored:
+        mirror = numpy.diag((-1.0, 1.0, 1.0, 1.0)).astype(numpy.float32)
+        targetMatrices = numpy.concatenate((targetMatrices, (
+                         mirror @ targetMatrices[mirrored] @ mirror)))
+        lengths = numpy.concatenate((lengths, lengths[mirrored]))
+    return ((primaries + [partners[row] for row in mirrored]), targetMatrices,
+            lengths)
+
+
+# Shape targets function.
+def shapeTargets(armatureObject, poseBones):
+    """
+    Armature space target matrices and bone lengths of the pose bones, read in
+    bulk; the custom shape transform's pose matrix replaces the bone's own rest
+    matrix where one is set.
+    """
+    import numpy
+    
+    # Main variables.
+    bones = armatureObject.data.bones
+    boneIndex = {name: index for index, name in enumerate(bones.keys())}
+    indices = [boneIndex[poseBone.name] for poseBone in poseBones]
+    lengths = numpy.empty(len(bones), dtype=numpy.float32)
+    bones.foreach_get('length', lengths)
+    
+    # Custom shape transform.
+    targetMatrices = matrixArray(bones, 'matrix_local')[indices]
+    transformed = [(row, poseBone.custom_shape_transform.name)
+                   for row, poseBone in enumerate(poseBones)
+                   if poseBone.custom_shape_transform]
+    if transformed:
+        poseIndex = {name: index for index, name in
+                     enumerate(armatureObject.pose.bones.keys())}
+        rows, names = zip(*transformed)
+        poseMatrices = matrixArray(armatureObject.pose.bones, 'matrix')
+        targetMatrices[list(rows)] = poseMatrices[[poseIndex[name]
+                                                   for name in names]]
+    return targetMatrices, lengths[indices]
+
+
+# Shape transforms function.
+def shapeTransforms(armatureObject, targetMatrices, lengths):
+    """
+    World space locations, XYZ euler rotations and uniform sizes for armature
+    space target matrices, decomposed in one vectorized pass.
+    """
+    import numpy
+    worldMatrix = numpy.array(armatureObject.matrix_world, dtype=numpy.float32)
+    location, rotation, scale = decomposeMatrices(worldMatrix @ targetMatrices)
+    size = (scale.mean(axis=1) * lengths)
+    return location.tolist(), rotation.tolist(), size.tolist()
+
+
+# Place shapes function.
+def placeShapes(armatureObject, poseBones, targetMatrices, lengths, options):
+    """
+    Places the custom shape of each pose bone at its armature space target
+    matrix.
+    """
+    for poseBone, location, rotation, size in zip(poseBones, *shapeTransforms(
+            armatureObject, targetMatrices, lengths)):
+        placeShape(armatureObject, poseBone, location, rotation, size, options)
+
+
+# Place shape function.
+def placeShape(armatureObject, poseBone, location, rotation, size, options):
+    """
+    Writes an already decomposed transform to the custom shape of the pose bone
+    and applies the draw and naming options.
+    """
+    
+    # Main variables.
+    shape = poseBone.custom_shape
+    bone = poseBone.bone
+    
+    # Shared shapes are fitted through the bone, never moved or renamed.
+    if options.shareShapes:
+        fitSharedShape(poseBone)
+        if options.showWire:
+            bone.show_wire = True
+        if options.wireDrawType:
+            shape.display_type = 'WIRE'
+        return
+    
+    # Location, rotation, scale.
+    shape.location = location
+    shape.rotation_mode = 'XYZ'
+    shape.rotation_euler = rotation
+    shape.scale = (size, size, size)
+    
+    #Draw options.
+    if options.showWire:
+        bone.show_wire = True
+    if options.wireDrawType:
+        shape.display_type = 'WIRE'
+    
+    # Datablock name.
+    if options.nameShape:
+        targetName = bone.name
+        if options.includeArmatureName:
+            targetName = (armatureObject.name +
+                    options.separateArmatureName +
+                    targetName)
+        shape.name = (options.prefixShapeName + targetName)
+        if shape.data and shape.data.users == 1:
+            if options.prefixShapeDataName:
+                shape.data.name = (options.prefixShapeName + targetName)
+            else:
+                shape.data.name = targetName
+
+
+# Fit shared shape function.
+def fitSharedShape(poseBone):
+    """
+    Fits a custom shape that is shared between bones through the pose bone's own
+    data; the shape is drawn in the space of the bone (or its custom shape
+    transform) scaled by the bone's length, which is what moving the shape
+    object approximates. Any per-bone placement the artist set is kept.
+    """
+    poseBone.use_custom_shape_bone_size = True
+
+
+# Placement state function.
+def placementState(poseBone):
+    """ The pose bone's custom shape placement, for restorePlacement. """
+    names = ('use_custom_shape_bone_size', 'custom_shape_scale',
+             'custom_shape_translation', 'custom_shape_rotation_euler',
+             'custom_shape_scale_xyz')
+    state = {}
+    for name in names:
+        if hasattr(poseBone, name):
+            value = getattr(poseBone, name)
+            state[name] = value.copy() if hasattr(value, 'copy') else value
+    return state
+
+
+# Restore placement function.
+def restorePlacement(poseBone, state):
+    """ Restore a custom shape placement taken with placementState. """
+    for name, value in state.items():
+        setattr(poseBone, name, value)
+
+
+# Shape key function.
+def shapeKey(shape):
+    """
+    Hashable key that is equal for custom shape objects with identical geometry,
+    used to find duplicated widgets.
+    """
+    import numpy
+    
+    # Main variables.
+    data = shape.data
+    if shape.type != 'MESH' or data is None:
+        return (shape.type, (data.as_pointer() if data else shape.as_pointer()))
+    
+    # Geometry.
+    coordinates = numpy.empty((len(data.vertices) * 3), dtype=numpy.float32)
+    data.vertices.foreach_get('co', coordinates)
+    edges = numpy.empty((len(data.edges) * 2), dtype=numpy.int32)
+    data.edges.foreach_get('vertices', edges)
+    loops = numpy.empty(len(data.loops), dtype=numpy.int32)
+    data.loops.foreach_get('vertex_index', loops)
+    return ('MESH', coordinates.round(5).tobytes(), edges.tobytes(),
+            loops.tobytes())
+
+
+# Share shapes function.
+def shareShapes(armatureObject, poseBones, removeUnused):
+    """
+    Points every pose bone whose custom shape duplicates another one at a single
+    shared shape object, and optionally removes the duplicates that nothing but
+    collections uses any more, and their meshes once unused. Returns the number
+    of bones that were remapped.
+    """
+    
+    # Main variables.
+    sharedShapes = {}
+    remapped = set()
+    count = 0
+    
+    # Remap duplicated shapes.
+    for poseBone in poseBones:
+        shape = poseBone.custom_shape
+        if not shape:
+            continue
+        sharedShape = sharedShapes.setdefault(shapeKey(shape), shape)
+        if sharedShape != shape:
+            poseBone.custom_shape = sharedShape
+            remapped.add(shape.name)
+            count += 1
+    
+    # Remove unused shapes; objects still used as a custom shape, parent,
+    # constraint target, by a scene, an instanced collection or anything else
+    # but a plain collection stay.
+    if removeUnused and remapped:
+        shapes = [bpy.data.objects[name] for name in remapped]
+        userMap = bpy.data.user_map(subset=shapes)
+        for shape in shapes:
+            if not all(isinstance(user, bpy.types.Collection) and
+                       not user.users_dupli_group
+                       for user in userMap.get(shape, ())):
+                continue
+            data = shape.data
+            bpy.data.objects.remove(shape)
+            if isinstance(data, bpy.types.Mesh) and data.users == 0:
+                bpy.data.meshes.remove(data)
+    return count
+
+
+# Target pose bones function.
+def targetPoseBones(context, target):
+    """
+    Pose bones of the active armature that an alignment applies to; 'ACTIVE',
+    'SELECTED' or 'ALL'.
+    """
+    
+    # Main variables.
+    pose = context.active_object.pose
+    if target == 'ALL':
+        return list(pose.bones)
+    if target == 'SELECTED':
+        return [poseBone for poseBone in pose.bones if poseBone.bone.select]
+    activeBone = context.active_bone
+    if activeBone:
+        return [pose.bones[activeBone.name]]
+    return []
+
+
+# ##### MATRIX FUNCTIONS #####
+
+# Matrix array function.
+def matrixArray(collection, attribute):
+    """
+    Reads a 4x4 matrix property from every item of a collection with a single
+    foreach_get, returned as a row-major (n, 4, 4) array.
+    """
+    import numpy
+    matrices = numpy.empty((len(collection) * 16), dtype=numpy.float32)
+    collection.foreach_get(attribute, matrices)
+    # Blender stores matrices column-major.
+    return matrices.reshape(-1, 4, 4).transpose(0, 2, 1)
+
+
+# Decompose matrices function.
+def decomposeMatrices(matrices):
+    """
+    Vectorized to_translation(), to_euler() and to_scale() over an (n, 4, 4)
+    array; returns (n, 3) location, XYZ euler rotation and scale arrays.
+    """
+    import numpy
+    
+    # Location, scale.
+    location = matrices[:, :3, 3]
+    basis = matrices[:, :3, :3]
+    scale = numpy.linalg.norm(basis, axis=1)
+    rotation = basis / numpy.where(scale == 0.0, 1.0, scale)[:, numpy.newaxis, :]
+    
+    # Rotation; same branches as mathutils' XYZ euler conversion, which keeps
+    # the one of its two equivalent solutions with the smaller angles.
+    cy = numpy.hypot(rotation[:, 0, 0], rotation[:, 1, 0])
+    stable = cy > (16 * numpy.finfo(numpy.float32).eps)
+    first = numpy.empty((len(matrices), 3), dtype=matrices.dtype)
+    first[:, 0] = numpy.where(stable,
+                              numpy.arctan2(rotation[:, 2, 1], rotation[:, 2, 2]),
+                              numpy.arctan2(-rotation[:, 1, 2], rotation[:, 1, 1]))
+    first[:, 1] = numpy.arctan2(-rotation[:, 2, 0], cy)
+    first[:, 2] = numpy.where(stable,
+                              numpy.arctan2(rotation[:, 1, 0], rotation[:, 0, 0]),
+                              0.0)
+    second = numpy.stack((numpy.arctan2(-rotation[:, 2, 1], -rotation[:, 2, 2]),
+                          numpy.arctan2(-rotation[:, 2, 0], -cy),
+                          numpy.arctan2(-rotation[:, 1, 0], -rotation[:, 0, 0])),
+                         axis=1).astype(matrices.dtype)
+    smaller = (numpy.abs(first).sum(axis=1) <= numpy.abs(second).sum(axis=1))
+    euler = numpy.where((smaller | ~stable)[:, numpy.newaxis], first, second)
+    return location, euler, scale
+
+
+# ##### CACHE FUNCTIONS #####
+
+# Armature cache; derived data keyed by object and armature pointers.
+armatureCache = {}
+armatureCacheStats = {'hits': 0, 'misses': 0, 'hitTime': 0.0, 'missTime': 0.0}
+# Armature cache state; benchmark.py switches the cache off to measure what it
+# saves per redraw.
+armatureCacheState = {'enabled': True}
+# Message bus owner.
+msgbusOwner = object()
+
+
+# Armature cache entry function.
+def armatureCacheEntry(armatureObject):
+    """
+    Cached derived data for an armature object. The entry lives until the
+    armature datablock is updated, a bone is renamed, or undo/redo/file load
+    replaces the data it points at.
+    """
+    if not armatureCacheState['enabled']:
+        return {'armature': armatureObject.data}
+    key = (armatureObject.as_pointer(), armatureObject.data.as_pointer())
+    entry = armatureCache.get(key)
+    if entry is None:
+        entry = armatureCache[key] = {'armature': armatureObject.data}
+    return entry
+
+
+# Panel data function.
+def panelData(context):
+    """
+    Armature, mode, active pose bone and its parent's name for
+    ARMATURE_PT_armaturePanel.draw, served from the armature cache.
+    """
+    
+    # Main variables.
+    start = perf_counter()
+    object = context.object
+    entry = armatureCacheEntry(object)
+    bone = context.active_bone
+    activeName = bone.name if bone else ''
+    
+    # Cache hit.
+    if entry.get('activeName') == activeName and entry.get('mode') == context.mode:
+        armatureCacheStats['hits'] += 1
+        armatureCacheStats['hitTime'] += (perf_counter() - start)
+        return entry
+    
+    # Cache miss.
+    entry['activeName'] = activeName
+    entry['mode'] = context.mode
+    entry['poseBone'] = object.pose.bones.get(activeName) if bone else None
+    entry['parentName'] = bone.parent.name if bone and bone.parent else "None"
+    armatureCacheStats['misses'] += 1
+    armatureCacheStats['missTime'] += (perf_counter() - start)
+    return entry
+
+
+# Pose bone index function.
+def poseBoneIndex(armatureObject):
+    """ Cached {name: pose bone} index of the armature object. """
+    entry = armatureCacheEntry(armatureObject)
+    if 'poseBoneIndex' not in entry:
+        entry['poseBoneIndex'] = {poseBone.name: poseBone for poseBone in
+                                  armatureObject.pose.bones}
+    return entry['poseBoneIndex']
+
+
+# Bone depths function.
+def boneDepths(armatureObject):
+    """ Cached {name: hierarchy depth} of the armature's bones; roots are 0. """
+    entry = armatureCacheEntry(armatureObject)
+    if 'boneDepths' not in entry:
+        depths = {}
+        # Parents are always listed before their children.
+        for bone in armatureObject.data.bones:
+            depths[bone.name] = ((depths[bone.parent.name] + 1)
+                                 if bone.parent else 0)
+        entry['boneDepths'] = depths
+    return entry['boneDepths']
+
+
+# Armature cache report function.
+def armatureCacheReport():
+    """
+    Hits and misses of the panel data cache with their measured average time;
+    the redraw time the cache saves is measured by benchmark.py, drawing with
+    the cache on and off.
+    """
+    stats = armatureCacheStats
+    return "Cache: {} hits ({:.4f} ms), {} misses ({:.4f} ms)".format(
+           stats['hits'], ((stats['hitTime'] * 1000) / max(1, stats['hits'])),
+           stats['misses'], ((stats['missTime'] * 1000) /
+                             max(1, stats['misses'])))
+
+
+# Clear armature cache function.
+@persistent
+def clearArmatureCache(*args):
+    """ Drop every armature cache entry and bone name index. """
+    armatureCache.clear()
+    boneSearchCache.clear()
+    mirrorPairCache.clear()
+    for tree in hierarchyCache.values():
+        tree['stale'] = True
+    bulkConstraintCache['key'] = None
+    bulkConstraintCache['matches'] = []
+    clearLint()
+
+
+# Armature cache depsgraph handler.
+@persistent
+def armatureCacheDepsgraphUpdate(scene, depsgraph):
+    """
+    Invalidates the entries of armature datablocks that were updated; object
+    transform updates (e.g. playback) leave the cache intact.
+    """
+    if not armatureCache and not hierarchyCache:
+        return
+    updated = {update.id.original.as_pointer() for update in depsgraph.updates
+               if isinstance(update.id, bpy.types.Armature)}
+    if updated:
+        for key in [key for key in armatureCache if key[1] in updated]:
+            del armatureCache[key]
+
+        # Only edit mode changes the hierarchy; boneHierarchy compares the
+        # parents before rebuilding.
+        for key in updated:
+            tree = hierarchyCache.get(key)
+            if tree is not None and tree['editMode']:
+                tree['stale'] = True
+
+
+# Armature cache load handler.
+@persistent
+def armatureCacheLoad(*args):
+    """ Clear the cache and subscribe to bone renames after a file load. """
+    clearArmatureCache()
+    lintEntries.clear()
+    hierarchyCache.clear()
+    widgetCache.clear()
+    subscribeArmatureCache()
+
+
+# Subscribe armature cache function.
+def subscribeArmatureCache():
+    """ Bone renames invalidate the armature cache. """
+    for boneType in (bpy.types.Bone, bpy.types.EditBone):
+        bpy.msgbus.subscribe_rna(key=(boneType, 'name'), owner=msgbusOwner,
+                                 args=(), notify=clearArmatureCache)
+
+
+# ##### HIERARCHY FUNCTIONS #####
+
+# Hierarchy cache; {armature pointer: tree}, see boneHierarchy.
+hierarchyCache = {}
+
+
+# Bone hierarchy function.
+def boneHierarchy(armature):
+    """
+    Cached parent index array of the armature's bones, or edit bones in edit
+    mode, with child lists and depths; rebuilt only when the bone names or
+    parents changed. The expanded bones of the tree view survive rebuilds.
+    """
+    import numpy
+    
+    # Main variables.
+    editMode = armature.is_editmode
+    bones = armature.edit_bones if editMode else armature.bones
+    key = armature.as_pointer()
+    tree = hierarchyCache.get(key)
+    if (tree is not None and tree['editMode'] == editMode and
+            len(tree['names']) == len(bones)):
+        if not tree['stale']:
+            return tree
+        
+        # Moving bones marks the tree stale too; compare the parents first.
+        names = bones.keys()
+        parentNames = [(bone.parent.name if bone.parent else '')
+                       for bone in bones]
+        if names == tree['names'] and parentNames == tree['parentNames']:
+            tree['stale'] = False
+            return tree
+    
+    # Parents.
+    names = bones.keys()
+    parentNames = [(bone.parent.name if bone.parent else '') for bone in bones]
+    index = {name: row for row, name in enumerate(names)}
+    parents = numpy.array([index.get(name, -1) for name in parentNames],
+                          dtype=numpy.int32)
+    children = {}
+    for row, parent in enumerate(parents.tolist()):
+        children.setdefault(parent, []).append(row)
+    
+    # Depths; walked down from the roots.
+    depths = ([0] * len(names))
+    stack = list(children.get(-1, ()))
+    while stack:
+        row = stack.pop()
+        for child in children.get(row, ()):
+            depths[child] = (depths[row] + 1)
+            stack.append(child)
+    tree = hierarchyCache[key] = {
+        'editMode': editMode, 'stale': False, 'names': names,
+        'parentNames': parentNames, 'parents': parents, 'children': children, 'depths': depths,
+        'expanded': (tree['expanded'] if tree else set()), 'rows': None}
+    return tree
+
+
+# Tree rows function.
+def treeRows(tree, visibleFlag):
+    """
+    (flags, order) for UIList.filter_items; roots and the children of expanded
+    bones are visible, in depth-first order. Recomputed only when a bone is
+    expanded or collapsed.
+    """
+    if tree['rows'] is not None:
+        return tree['rows']
+    
+    # Main variables.
+    children = tree['children']
+    expanded = tree['expanded']
+    names = tree['names']
+    flags = ([0] * len(names))
+    order = ([0] * len(names))
+    position = 0
+    
+    # Depth-first order; visible while every ancestor is expanded.
+    stack = [(row, True) for row in reversed(children.get(-1, ()))]
+    while stack:
+        row, visible = stack.pop()
+        order[row] = position
+        position += 1
+        if visible:
+            flags[row] = visibleFlag
+        childVisible = (visible and names[row] in expanded)
+        stack.extend((child, childVisible) for child in
+                     reversed(children.get(row, ())))
+    tree['rows'] = (flags, order)
+    return tree['rows']
+
+
+# ##### LIVE ALIGN FUNCTIONS #####
+
+# Live align state; edit bone snapshots keyed by armature pointer and the
+# armature objects waiting for the coalescing timer.
+liveAlignSnapshots = {}
+liveAlignPending = set()
+# Live align interval; seconds updates are coalesced over.
+liveAlignInterval = 0.1
+
+
+# Edit bone snapshot function.
+def editBoneSnapshot(editBones):
+    """ Head, tail and roll of every edit bone as an (n, 7) array. """
+    import numpy
+    count = len(editBones)
+    heads = numpy.empty((count * 3), dtype=numpy.float32)
+    tails = numpy.empty((count * 3), dtype=numpy.float32)
+    rolls = numpy.empty(count, dtype=numpy.float32)
+    editBones.foreach_get('head', heads)
+    editBones.foreach_get('tail', tails)
+    editBones.foreach_get('roll', rolls)
+    return numpy.column_stack((heads.reshape(-1, 3), tails.reshape(-1, 3),
+                               rolls))
+
+
+# Live align function.
+def liveAlign(armatureObject, options):
+    """
+    Aligns the custom shapes of the edit bones that moved since the previous
+    call, and of the bones that use one of them as custom shape transform.
+    """
+    import numpy
+    
+    # Main variables.
+    editBones = armatureObject.data.edit_bones
+    names = editBones.keys()
+    snapshot = editBoneSnapshot(editBones)
+    key = armatureObject.data.as_pointer()
+    previous = liveAlignSnapshots.get(key)
+    liveAlignSnapshots[key] = (names, snapshot)
+    
+    # Changed bones; everything after bones were added, removed or renamed.
+    if previous is None or previous[0] != names:
+        changed = set(names)
+    else:
+        moved = numpy.abs(snapshot - previous[1]).max(axis=1) > 1e-6
+        changed = {names[index] for index in numpy.flatnonzero(moved)}
+    if not changed:
+        return 0
+    poseBones = [poseBone for poseBone in armatureObject.pose.bones
+                 if poseBone.custom_shape and
+                 (poseBone.name in changed or (poseBone.custom_shape_transform
+                  and poseBone.custom_shape_transform.name in changed))]
+    poseBones = [poseBone for poseBone in poseBones if poseBone.name in editBones]
+    if not poseBones:
+        return 0
+    
+    # Edit bone matrices stand in for the rest and pose matrices.
+    boneIndex = {name: index for index, name in enumerate(names)}
+    matrices = matrixArray(editBones, 'matrix')
+    lengths = numpy.empty(len(editBones), dtype=numpy.float32)
+    editBones.foreach_get('length', lengths)
+    indices = [boneIndex[poseBone.name] for poseBone in poseBones]
+    targets = [boneIndex.get(poseBone.custom_shape_transform.name, row)
+               if poseBone.custom_shape_transform else row
+               for poseBone, row in zip(poseBones, indices)]
+    placeShapes(armatureObject, poseBones, matrices[targets], lengths[indices],
+                options)
+    return len(poseBones)
+
+
+# Live align timer function.
+def liveAlignTimer():
+    """ Aligns every armature that changed since the timer was registered. """
+    options = bpy.context.window_manager.shapeToBoneSettings
+    for name in liveAlignPending:
+        armatureObject = bpy.data.objects.get(name)
+        if (armatureObject and armatureObject.type == 'ARMATURE' and
+                armatureObject.mode == 'EDIT'):
+            liveAlign(armatureObject, options)
+    liveAlignPending.clear()
+    return None
+
+
+# Live align depsgraph handler.
+@persistent
+def liveAlignDepsgraphUpdate(scene, depsgraph):
+    """
+    Queues armatures in edit mode whose data changed; repeated updates within
+    liveAlignInterval are coalesced into one timer call.
+    """
+    for update in depsgraph.updates:
+        if not isinstance(update.id, bpy.types.Armature):
+            continue
+        armature = update.id.original
+        if armature.is_editmode:
+            for object in scene.objects:
+                if object.data == armature:
+                    liveAlignPending.add(object.name)
+    if liveAlignPending and not bpy.app.timers.is_registered(liveAlignTimer):
+        bpy.app.timers.register(liveAlignTimer, first_interval=liveAlignInterval)
+
+
+# Live align update function.
+def liveAlignUpdate(self, context):
+    """ Add or remove the live align handler when the option is toggled. """
+    handlers = bpy.app.handlers.depsgraph_update_post
+    if self.liveAlign and liveAlignDepsgraphUpdate not in handlers:
+        handlers.append(liveAlignDepsgraphUpdate)
+    elif not self.liveAlign:
+        stopLiveAlign()
+
+
+# Stop live align function.
+def stopLiveAlign():
+    """ Remove the live align handler and timer and forget the snapshots. """
+    if liveAlignDepsgraphUpdate in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(liveAlignDepsgraphUpdate)
+    if bpy.app.timers.is_registered(liveAlignTimer):
+        bpy.app.timers.unregister(liveAlignTimer)
+    liveAlignPending.clear()
+    liveAlignSnapshots.clear()
+
+
+# ##### SEARCH FUNCTIONS #####
+
+# Bone search cache; {armature pointer: (bone count, boneNameIndex)}.
+boneSearchCache = {}
+# Side patterns; suffixes and prefixes such as .L, _r, -Left, L_, right.
+sideSuffix = re.compile(r'(?P<separator>[._\- ])(?P<side>[lLrR]|left|right|Left'
+                        r'|Right|LEFT|RIGHT)(?P<number>\.\d+)?$')
+# Mirror sides; side spellings and their opposites.
+mirrorSides = {'L': 'R', 'R': 'L', 'l': 'r', 'r': 'l', 'left': 'right',
+               'right': 'left', 'Left': 'Right', 'Right': 'Left',
+               'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+# Mirror pair cache; {armature pointer: (bone count, {name: partner name})}.
+mirrorPairCache = {}
+sidePrefix = re.compile(r'^(?P<side>[lLrR]|left|right|Left|Right|LEFT|RIGHT)'
+                        r'(?P<separator>[._\- ])')
+
+
+# Split side function.
+def splitSide(name):
+    """
+    Splits a bone name into its name without the side and the side itself, 'L',
+    'R' or '' for names without one.
+    """
+    match = sideSuffix.search(name)
+    if match:
+        return ((name[:match.start()] + (match.group('number') or '')),
+                match.group('side')[0].upper())
+    match = sidePrefix.match(name)
+    if match:
+        return (name[match.end():], match.group('side')[0].upper())
+    return (name, '')
+
+
+# Mirror name function.
+def mirrorName(name):
+    """ The name of the opposite side's bone; name itself when it has no side. """
+    match = sideSuffix.search(name) or sidePrefix.match(name)
+    if not match:
+        return name
+    side = match.group('side')
+    return (name[:match.start('side')] + mirrorSides[side] +
+            name[match.end('side'):])
+
+
+# Mirror pairs function.
+def mirrorPairs(armature):
+    """
+    Cached {name: opposite side name} of the armature's bones that have a
+    partner; rebuilt after a bone is renamed or the bone count changes.
+    """
+    key = armature.as_pointer()
+    count = len(armature.bones)
+    cached = mirrorPairCache.get(key)
+    if cached is None or cached[0] != count:
+        names = set(armature.bones.keys())
+        pairs = {}
+        for name in names:
+            partnerName = mirrorName(name)
+            if partnerName != name and partnerName in names:
+                pairs[name] = partnerName
+        cached = mirrorPairCache[key] = (count, pairs)
+    return cached[1]
+
+
+# Name trigrams function.
+def nameTrigrams(name):
+    """ Set of the three character substrings of a lower case name. """
+    return {name[index:(index + 3)] for index in range(len(name) - 2)}
+
+
+# Name words function.
+def nameWords(name):
+    """ The alphabetic words of a lower case name, e.g. 'foot', 'ik'. """
+    return re.findall(r'[a-z]+', name)
+
+
+# Typo distance function.
+def typoDistance(first, second, limit):
+    """
+    Edit distance counting a swap of neighbouring letters as one edit (optimal
+    string alignment); any distance above limit is returned as limit + 1.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return (limit + 1)
+    previous = None
+    row = list(range(len(second) + 1))
+    for firstIndex in range(1, (len(first) + 1)):
+        current = [firstIndex] + ([0] * len(second))
+        for secondIndex in range(1, (len(second) + 1)):
+            cost = (first[firstIndex - 1] != second[secondIndex - 1])
+            current[secondIndex] = min((row[secondIndex] + 1),
+                                       (current[secondIndex - 1] + 1),
+                                       (row[secondIndex - 1] + cost))
+            if (previous is not None and secondIndex > 1 and
+                    first[firstIndex - 1] == second[secondIndex - 2] and
+                    first[firstIndex - 2] == second[secondIndex - 1]):
+                current[secondIndex] = min(current[secondIndex],
+                                           (previous[secondIndex - 2] + 1))
+        if min(current) > limit:
+            return (limit + 1)
+        previous, row = row, current
+    return min(row[-1], (limit + 1))
+
+
+# Abbreviation function.
+def isAbbreviation(short, word):
+    """ Whether short is word with letters left out, e.g. 'fngr', 'finger'. """
+    letters = iter(word)
+    return (short[:1] == word[:1] and len(short) < len(word) and
+            all(letter in letters for letter in short))
+
+
+# Bone name index class.
+class boneNameIndex:
+    """
+    Trigram index over the names of an armature's bones; ranks exact, prefix,
+    substring and fuzzy matches and prefers bones on the side the query names.
+    Candidates are counted and ranked as arrays, so a query costs a pass over
+    the postings of its trigrams instead of a Python loop over every match.
+    """
+    
+    # Init.
+    def __init__(self, names):
+        """ Build the index; cost is linear in the number of bones. """
+        import numpy
+        
+        # Main variables.
+        self.names = list(names)
+        self.keys = []
+        self.sides = []
+        trigrams = {}
+        self.words = {}
+        for index, name in enumerate(self.names):
+            base, side = splitSide(name)
+            key = base.lower()
+            self.keys.append(key)
+            self.sides.append(side)
+            for trigram in nameTrigrams(key):
+                trigrams.setdefault(trigram, []).append(index)
+            for word in set(nameWords(key)):
+                self.words.setdefault(word, []).append(index)
+        
+        # Arrays; postings, sides, key lengths and the rank of each name in
+        # sorted order, which breaks ties.
+        self.trigrams = {trigram: numpy.array(indices, dtype=numpy.int32)
+                         for trigram, indices in trigrams.items()}
+        self.keyArray = numpy.array(self.keys, dtype=str)
+        self.sideArray = numpy.array(self.sides, dtype='<U1')
+        self.lengths = numpy.array([len(key) for key in self.keys],
+                                   dtype=numpy.int32)
+        self.nameRanks = numpy.empty(len(self.names), dtype=numpy.int32)
+        self.nameRanks[numpy.argsort(numpy.array(self.names, dtype=str),
+                                     kind='stable')] = numpy.arange(
+                                         len(self.names), dtype=numpy.int32)
+        self.words = {word: numpy.array(indices, dtype=numpy.int32)
+                      for word, indices in self.words.items()}
+        self.wordLengths = {}
+        for word in self.words:
+            self.wordLengths.setdefault(len(word), []).append(word)
+    
+    # Typo candidates.
+    def typoCandidates(self, key):
+        """
+        Scores of the names whose words are within one or two edits of the
+        query's words (transposed, missing or wrong letters), or that the query
+        abbreviates, as an array over the names; compared once per distinct
+        word of a near enough length, not per bone.
+        """
+        import numpy
+        queryWords = [word for word in nameWords(key) if len(word) >= 3]
+        counts = numpy.zeros(len(self.names), dtype=numpy.int32)
+        for queryWord in queryWords:
+            limit = (1 if len(queryWord) <= 4 else 2)
+            matched = []
+            for length, words in self.wordLengths.items():
+                if length < (len(queryWord) - limit):
+                    continue
+                abbreviations = (length > len(queryWord))
+                typos = (length <= (len(queryWord) + limit))
+                if not (abbreviations or typos):
+                    continue
+                for word in words:
+                    if ((typos and typoDistance(queryWord, word, limit) <= limit)
+                            or (abbreviations and
+                                isAbbreviation(queryWord, word))):
+                        matched.append(self.words[word])
+            if matched:
+                counts[numpy.unique(numpy.concatenate(matched))] += 1
+        if not queryWords:
+            return counts.astype(numpy.float32)
+        return numpy.where(((counts * 2) >= len(queryWords)),
+                           (0.5 * counts / len(queryWords)),
+                           0.0).astype(numpy.float32)
+    
+    # Search.
+    def search(self, query, limit=20):
+        """ Names of the best matching bones for query, best first. """
+        import numpy
+        
+        # Main variables.
+        base, side = splitSide(query.strip())
+        key = base.lower()
+        queryTrigrams = nameTrigrams(key)
+        
+        # Candidates; short queries are too short for trigrams, every key
+        # holding them is a substring match.
+        if not queryTrigrams:
+            contains = (numpy.char.find(self.keyArray, key) >= 0)
+            scores = contains.astype(numpy.float32)
+        else:
+            postings = [self.trigrams[trigram] for trigram in queryTrigrams
+                        if trigram in self.trigrams]
+            counts = (numpy.bincount(numpy.concatenate(postings),
+                                     minlength=len(self.names))
+                      if postings else numpy.zeros(len(self.names),
+                                                   dtype=numpy.int64))
+            scores = (counts / len(queryTrigrams)).astype(numpy.float32)
+            scores[scores < 0.3] = 0.0
+            # Only keys holding every trigram of the query can contain it.
+            contains = (counts == len(queryTrigrams))
+            rows = numpy.flatnonzero(contains)
+            if len(rows):
+                contains[rows] = (numpy.char.find(self.keyArray[rows], key) >= 0)
+        
+        # Typos; trigrams miss swapped and dropped letters in short names.
+        if numpy.count_nonzero(scores) < limit:
+            scores = numpy.maximum(scores, self.typoCandidates(key))
+        candidates = numpy.flatnonzero(scores)
+        if not len(candidates):
+            return []
+        
+        # Rank; exact, prefix and substring matches first, then the side.
+        total = scores[candidates]
+        rows = candidates[contains[candidates]]
+        if len(rows):
+            bonus = numpy.where(numpy.char.startswith(self.keyArray[rows], key),
+                                2.0, 1.0)
+            bonus[self.lengths[rows] == len(key)] = 3.0
+            total[contains[candidates]] += bonus
+        if side:
+            total += numpy.where((self.sideArray[candidates] == side), 0.5, -1.0)
+        order = numpy.lexsort((self.nameRanks[candidates],
+                               self.lengths[candidates], -total))
+        return [self.names[index] for index in candidates[order[:limit]]]
+
+
+# Bone search index function.
+def boneSearchIndex(armature):
+    """
+    Cached name index of the armature's bones; rebuilt after a bone is renamed
+    (which clears the cache) or when the bone count changes.
+    """
+    key = armature.as_pointer()
+    count = len(armature.bones)
+    cached = boneSearchCache.get(key)
+    if cached is None or cached[0] != count:
+        cached = boneSearchCache[key] = (count,
+                                         boneNameIndex(armature.bones.keys()))
+    return cached[1]
+
+
+# Bone search benchmark function.
+def boneSearchBenchmark(count=10000, queries=('hand.L', 'hnad.R', 'fngr',
+                                              'spine_0', 'foot_ik_r', 'x')):
+    """
+    Times building the index over count synthetic bone names and compares its
+    queries against a linear substring scan, which is what prop_search does
+    and finds no typos; returns timings in milliseconds and the number of
+    names each returned. The build is paid once per change of the bones.
+    """
+    
+    # Synthetic names; every part comes on both sides and without one.
+    parts = ('spine', 'neck', 'head', 'arm', 'forearm', 'hand', 'finger',
+             'thigh', 'shin', 'foot', 'toe', 'eye', 'lip', 'brow', 'tail')
+    names = ["{}_{:03d}{}".format(parts[index % len(parts)],
+                                  (index // len(parts)),
+                                  ('.L', '.R', '')[(index // len(parts)) % 3])
+             for index in range(count)]
+    
+    # Build.
+    start = perf_counter()
+    index = boneNameIndex(names)
+    results = {'bones': count, 'build': ((perf_counter() - start) * 1000)}
+    
+    # Queries.
+    for query in queries:
+        start = perf_counter()
+        found = index.search(query)
+        indexTime = ((perf_counter() - start) * 1000)
+        start = perf_counter()
+        linearFound = [name for name in names if query.lower() in name.lower()]
+        linearTime = ((perf_counter() - start) * 1000)
+        results[query] = {'index': indexTime, 'linear': linearTime,
+                          'indexResults': len(found),
+                          'linearResults': len(linearFound)}
+    return results
+
+
+# ##### POSE STORE FUNCTIONS #####
+
+# Pose channels; (pose bone attribute, float count) in stored order.
+poseChannels = (('location', 3), ('rotation_quaternion', 4),
+                ('rotation_euler', 3), ('rotation_axis_angle', 4),
+                ('scale', 3))
+poseChannelCount = sum(size for attribute, size in poseChannels)
+
+
+# Read pose function.
+def readPose(poseBones):
+    """ Every pose channel of every pose bone as an (n, 17) float32 array. """
+    import numpy
+    count = len(poseBones)
+    values = numpy.empty((count, poseChannelCount), dtype=numpy.float32)
+    offset = 0
+    for attribute, size in poseChannels:
+        buffer = numpy.empty((count * size), dtype=numpy.float32)
+        poseBones.foreach_get(attribute, buffer)
+        values[:, offset:(offset + size)] = buffer.reshape(count, size)
+        offset += size
+    return values
+
+
+# Write pose function.
+def writePose(poseBones, values):
+    """ Write an array from readPose back with one foreach_set per channel. """
+    import numpy
+    offset = 0
+    for attribute, size in poseChannels:
+        poseBones.foreach_set(attribute, numpy.ascontiguousarray(
+                              values[:, offset:(offset + size)]).ravel())
+        offset += size
+
+
+# Encode array function.
+def encodeArray(array):
+    """ Compressed, text-safe form of a float32 array for a StringProperty. """
+    import base64
+    import numpy
+    import zlib
+    return base64.b64encode(zlib.compress(array.astype(numpy.float32)
+                                          .tobytes())).decode('ascii')
+
+
+# Decode array function.
+def decodeArray(text):
+    """ Inverse of encodeArray. """
+    import base64
+    import numpy
+    import zlib
+    return numpy.frombuffer(zlib.decompress(base64.b64decode(text)),
+                            dtype=numpy.float32)
+
+
+# Capture pose function.
+def capturePose(armatureObject, snapshot, selectedOnly):
+    """
+    Store the pose channels of all or only the selected pose bones in a pose
+    snapshot property group; returns the number of bones stored.
+    """
+    import base64
+    import zlib
+    poseBones = armatureObject.pose.bones
+    names = poseBones.keys()
+    values = readPose(poseBones)
+    if selectedOnly:
+        rows = [row for row, poseBone in enumerate(poseBones)
+                if poseBone.bone.select]
+        names = [names[row] for row in rows]
+        values = values[rows]
+    snapshot.boneNames = base64.b64encode(zlib.compress(
+                         '\n'.join(names).encode('utf-8'))).decode('ascii')
+    snapshot.data = encodeArray(values)
+    return len(names)
+
+
+# Snapshot pose function.
+def snapshotPose(snapshot, poseBones, values):
+    """
+    The current pose array with the rows of the bones stored in the snapshot
+    replaced; bones that no longer exist are skipped.
+    """
+    import base64
+    import zlib
+    names = zlib.decompress(base64.b64decode(snapshot.boneNames)).decode(
+            'utf-8').split('\n') if snapshot.boneNames else []
+    stored = decodeArray(snapshot.data).reshape(-1, poseChannelCount)
+    index = {name: row for row, name in enumerate(poseBones.keys())}
+    rows = [(row, index[name]) for row, name in enumerate(names)
+            if name in index]
+    values = values.copy()
+    if rows:
+        sources, targets = zip(*rows)
+        values[list(targets)] = stored[list(sources)]
+    return values
+
+
+# Blend pose function.
+def blendPose(first, second, factor):
+    """
+    Pose arrays blended by factor; linear for every channel except the
+    quaternions, which are normalized after flipping to the same hemisphere.
+    """
+    import numpy
+    result = (first + ((second - first) * factor))
+    quaternions = slice(3, 7)
+    flip = numpy.where(((first[:, quaternions] * second[:, quaternions])
+                        .sum(axis=1) < 0.0), -1.0, 1.0)[:, numpy.newaxis]
+    quaternion = (first[:, quaternions] + (((second[:, quaternions] * flip) -
+                                            first[:, quaternions]) * factor))
+    length = numpy.linalg.norm(quaternion, axis=1)[:, numpy.newaxis]
+    result[:, quaternions] = (quaternion / numpy.where(length == 0.0, 1.0,
+                                                       length))
+    return result
+
+
+# Apply pose function.
+def applyPose(armatureObject, snapshot, blendSnapshot=None, factor=1.0):
+    """
+    Apply a stored pose in one bulk write; with blendSnapshot the result is
+    blended from snapshot towards blendSnapshot by factor, otherwise from the
+    current pose towards snapshot.
+    """
+    poseBones = armatureObject.pose.bones
+    current = readPose(poseBones)
+    values = snapshotPose(snapshot, poseBones, current)
+    if blendSnapshot is not None:
+        values = blendPose(values, snapshotPose(blendSnapshot, poseBones,
+                                                values), factor)
+    elif factor != 1.0:
+        values = blendPose(current, values, factor)
+    writePose(poseBones, values)
+    armatureObject.update_tag()
+
+
+# ##### SELECTION SET FUNCTIONS #####
+
+# Bone ids function.
+def boneIds(armature):
+    """
+    Stable ids of the armature's bones in bone order; bones without one, or
+    sharing one with an earlier bone after a duplication, get a new id. Ids are
+    never reused, so selection sets survive bones being added and removed.
+    """
+    import numpy
+    bones = armature.bones
+    ids = numpy.empty(len(bones), dtype=numpy.int32)
+    bones.foreach_get('armaturePanelBoneId', ids)
+    fresh = numpy.ones(len(ids), dtype=bool)
+    fresh[numpy.unique(ids, return_index=True)[1]] = False
+    fresh |= (ids == 0)
+    if fresh.any():
+        start = max(armature.armaturePanelNextBoneId, (int(ids.max()) + 1))
+        ids[fresh] = numpy.arange(start, (start + int(fresh.sum())))
+        armature.armaturePanelNextBoneId = (start + int(fresh.sum()))
+        bones.foreach_set('armaturePanelBoneId', ids)
+    return ids
+
+
+# Bone flags function.
+def boneFlags(armature, attribute):
+    """ A boolean bone attribute of every bone, read in bulk. """
+    import numpy
+    flags = numpy.empty(len(armature.bones), dtype=bool)
+    armature.bones.foreach_get(attribute, flags)
+    return flags
+
+
+# Selection set mask function.
+def selectionSetMask(selectionSet, ids):
+    """ Which bones, by their ids, are members of the selection set. """
+    import base64
+    import numpy
+    import zlib
+    bits = numpy.unpackbits(numpy.frombuffer(zlib.decompress(base64.b64decode(
+           selectionSet.bits)), dtype=numpy.uint8)).astype(bool) if (
+           selectionSet.bits) else numpy.zeros(0, dtype=bool)
+    mask = numpy.zeros(len(ids), dtype=bool)
+    stored = (ids < len(bits))
+    mask[stored] = bits[ids[stored]]
+    return mask
+
+
+# Store selection set function.
+def storeSelectionSet(selectionSet, ids, mask):
+    """
+    Store the members of mask as a compressed bitset indexed by bone id; bits
+    of bones that do not exist right now (e.g. removed in edit mode and
+    restored by undo) are kept.
+    """
+    import base64
+    import numpy
+    import zlib
+    bits = selectionSetMask(selectionSet, numpy.arange(max(
+           selectionSet.bitCount, (int(ids.max()) + 1) if len(ids) else 0)))
+    bits[ids] = mask
+    selectionSet.bitCount = len(bits)
+    selectionSet.bits = base64.b64encode(zlib.compress(numpy.packbits(bits)
+                                         .tobytes())).decode('ascii')
+    return int(mask.sum())
+
+
+# Combine selection set function.
+def combineSelectionSet(selectionSet, ids, operand, operation):
+    """
+    Update the selection set with the operand mask; 'ASSIGN', 'UNION',
+    'INTERSECT' or 'SUBTRACT'. Returns the new number of members.
+    """
+    mask = selectionSetMask(selectionSet, ids)
+    if operation == 'ASSIGN':
+        mask = operand
+    elif operation == 'UNION':
+        mask |= operand
+    elif operation == 'INTERSECT':
+        mask &= operand
+    else:
+        mask &= ~operand
+    return storeSelectionSet(selectionSet, ids, mask)
+
+
+# Apply selection set function.
+def applySelectionSet(armature, mask, operation, extend=False):
+    """
+    Select, deselect, hide or reveal the members of a selection set with one
+    foreach_set; 'SELECT', 'DESELECT', 'HIDE' or 'REVEAL'.
+    """
+    bones = armature.bones
+    if operation in ('SELECT', 'DESELECT'):
+        select = boneFlags(armature, 'select')
+        if operation == 'DESELECT':
+            select &= ~mask
+        else:
+            select = ((select | mask) if extend else mask) & ~boneFlags(armature, 'hide')
+        bones.foreach_set('select', select)
+    else:
+        hide = boneFlags(armature, 'hide')
+        if operation == 'HIDE':
+            hide |= mask
+            bones.foreach_set('select', (boneFlags(armature, 'select') & ~mask))
+        else:
+            hide &= ~mask
+        bones.foreach_set('hide', hide)
+    armature.update_tag()
+
+
+# ##### LINT FUNCTIONS #####
+
+# Lint entries; {armature object pointer: {'names', 'shapes', 'results',
+# 'dirty', 'full'}}.
+lintEntries = {}
+# Lint pending; armature object names waiting for the continuous lint timer.
+lintPending = set()
+# Lint interval; seconds dirty bones are coalesced over in continuous mode.
+lintInterval = 0.25
+
+
+# Lint bone function.
+def lintBone(armatureObject, poseBone, options):
+    """
+    Issues of a single pose bone as (display context, message, constraint
+    index) tuples; the constraint index is -1 for issues of the bone itself.
+    """
+    
+    # Main variables.
+    issues = []
+    bone = poseBone.bone
+    
+    # Constraint targets.
+    for constraintIndex, constraint in enumerate(poseBone.constraints):
+        targets = list(getattr(constraint, 'targets', ()))
+        if hasattr(constraint, 'target'):
+            targets.append(constraint)
+        for target in targets:
+            if target.target is None:
+                issues.append(('BONE_CONSTRAINT', "{}: no target".format(
+                               constraint.name), constraintIndex))
+            elif (target.target.type == 'ARMATURE' and target.subtarget and
+                  target.subtarget not in target.target.data.bones):
+                issues.append(('BONE_CONSTRAINT', "{}: sub-target '{}' does no"
+                               "t exist".format(constraint.name,
+                                                target.subtarget),
+                               constraintIndex))
+    
+    # Custom shape alignment; shared shapes are fitted through the bone.
+    shape = poseBone.custom_shape
+    if shape and not options.shareShapes and shape.type != 'EMPTY':
+        shapeTransform = poseBone.custom_shape_transform
+        if shapeTransform:
+            targetMatrix = (armatureObject.matrix_world @ shapeTransform.matrix)
+        else:
+            targetMatrix = (armatureObject.matrix_world @ bone.matrix_local)
+        size = (bone.length * (sum(targetMatrix.to_scale()) / 3))
+        tolerance = (1e-4 * max(1.0, size))
+        rotation = targetMatrix.to_quaternion().rotation_difference(
+                   shape.matrix_basis.to_quaternion())
+        if ((shape.location - targetMatrix.to_translation()).length > tolerance
+                or max(abs(scale - size) for scale in shape.scale) > tolerance
+                or min(rotation.angle, (6.283185 - rotation.angle)) > 1e-3):
+            issues.append(('SHAPE_TO_BONE', "Custom shape is not aligned", -1))
+    
+    # B-Bone custom handles.
+    for end in ('start', 'end'):
+        if (getattr(bone, 'bbone_handle_type_' + end) != 'AUTO' and
+                getattr(bone, 'bbone_custom_handle_' + end) is None):
+            issues.append(('BONE', "B-Bone {} handle bone is missing".format(
+                           end), -1))
+    
+    # Deform envelope.
+    if bone.use_deform and (bone.envelope_distance == 0.0 or
+                            bone.envelope_weight == 0.0):
+        issues.append(('BONE', "Deform bone has a zero envelope", -1))
+    return issues
+
+
+# Lint entry function.
+def lintEntry(armatureObject):
+    """ Lint state of the armature object, fully dirty when new. """
+    key = armatureObject.as_pointer()
+    entry = lintEntries.get(key)
+    if entry is None or len(entry['names']) != len(armatureObject.data.bones):
+        entry = lintEntries[key] = {'names': armatureObject.data.bones.keys(),
+                                    'shapes': {}, 'results': {}, 'rows': None,
+                                    'dirty': set(), 'full': True}
+    return entry
+
+
+# Lint rows function.
+def lintRows(entry):
+    """
+    [(bone name, display context, text, constraint index)] of the entry's
+    results sorted by bone name, for the Rig Check panel; rebuilt only after a
+    run changed the results.
+    """
+    if entry['rows'] is None:
+        entry['rows'] = [(name, displayContext, "{}: {}".format(name, message),
+                          constraintIndex)
+                         for name, issues in sorted(entry['results'].items())
+                         for displayContext, message, constraintIndex in issues]
+    return entry['rows']
+
+
+# Run lint function.
+def runLint(armatureObject, options):
+    """
+    Re-checks the bones dirtied since the previous run, or every bone on the
+    first run; returns the cached {bone name: issues} of the bones with issues.
+    """
+    
+    # Main variables.
+    entry = lintEntry(armatureObject)
+    index = poseBoneIndex(armatureObject)
+    if entry['full']:
+        entry['results'].clear()
+        entry['shapes'].clear()
+        names = entry['names']
+    else:
+        names = [name for name in entry['dirty'] if name in index]
+    
+    # Check.
+    for name in names:
+        poseBone = index[name]
+        if poseBone.custom_shape:
+            entry['shapes'].setdefault(poseBone.custom_shape.as_pointer(),
+                                       set()).add(name)
+        issues = lintBone(armatureObject, poseBone, options)
+        if issues:
+            entry['results'][name] = issues
+        else:
+            entry['results'].pop(name, None)
+    entry['dirty'].clear()
+    entry['full'] = False
+    entry['rows'] = None
+    return entry['results']
+
+
+# Lint depsgraph handler.
+@persistent
+def lintDepsgraphUpdate(scene, depsgraph):
+    """
+    Marks the selected bones of updated armatures, and the bones of moved
+    custom shapes, dirty; continuous mode re-checks them on a timer.
+    """
+    if not lintEntries:
+        return
+    import numpy
+    for update in depsgraph.updates:
+        updatedObject = update.id.original
+        if not isinstance(updatedObject, bpy.types.Object):
+            continue
+        pointer = updatedObject.as_pointer()
+        
+        # Armatures.
+        entry = lintEntries.get(pointer)
+        if entry is not None:
+            bones = updatedObject.data.bones
+            if len(bones) != len(entry['names']):
+                entry['full'] = True
+            else:
+                selected = numpy.empty(len(bones), dtype=bool)
+                bones.foreach_get('select', selected)
+                entry['dirty'].update(entry['names'][row] for row in
+                                      numpy.flatnonzero(selected))
+            lintPending.add(updatedObject.name)
+            continue
+        
+        # Custom shapes.
+        for armaturePointer, entry in lintEntries.items():
+            names = entry['shapes'].get(pointer)
+            if names:
+                entry['dirty'].update(names)
+    if (lintPending and bpy.context.window_manager.armaturePanelSettings.
+            lintContinuous and not bpy.app.timers.is_registered(lintTimer)):
+        bpy.app.timers.register(lintTimer, first_interval=lintInterval)
+
+
+# Lint timer function.
+def lintTimer():
+    """ Re-check the dirty bones of the pending armatures and redraw. """
+    options = bpy.context.window_manager.shapeToBoneSettings
+    for name in lintPending:
+        armatureObject = bpy.data.objects.get(name)
+        if armatureObject and armatureObject.type == 'ARMATURE':
+            runLint(armatureObject, options)
+    lintPending.clear()
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+    return None
+
+
+# Clear lint function.
+@persistent
+def clearLint(*args):
+    """ Every armature is fully re-checked on its next run. """
+    for entry in lintEntries.values():
+        entry['full'] = True
+
+
+# ##### BULK CONSTRAINT FUNCTIONS #####
+
+# Bulk constraint cache; the matches of the last gathered selection and filter.
+bulkConstraintCache = {'key': None, 'matches': []}
+
+
+# Bulk constraints function.
+def bulkConstraints(armatureObject, constraintType, pattern):
+    """
+    [(pose bone, constraint names)] of the constraints on the selected pose
+    bones that match the type and name pattern; cached until the selection,
+    the filter or the constraint names of a selected bone change.
+    """
+    import numpy
+    
+    # Key; constraints added, removed or renamed change the names.
+    bones = armatureObject.data.bones
+    selected = numpy.empty(len(bones), dtype=bool)
+    bones.foreach_get('select', selected)
+    boneNames = bones.keys()
+    poseBones = armatureObject.pose.bones
+    selectedBones = [poseBones[boneNames[row]] for row in
+                     numpy.flatnonzero(selected)]
+    key = (armatureObject.as_pointer(), selected.tobytes(), constraintType,
+           pattern, tuple(tuple(poseBone.constraints.keys())
+                          for poseBone in selectedBones))
+    if bulkConstraintCache['key'] == key:
+        return bulkConstraintCache['matches']
+    
+    # Gather.
+    matches = []
+    for poseBone in selectedBones:
+        names = [constraint.name for constraint in poseBone.constraints
+                 if (constraintType == 'ALL' or
+                     constraint.type == constraintType) and
+                 fnmatchcase(constraint.name, pattern or '*')]
+        if names:
+            matches.append((poseBone, names))
+    bulkConstraintCache['key'] = key
+    bulkConstraintCache['matches'] = matches
+    return matches
+
+
+# Set bulk constraints function.
+def setBulkConstraints(armatureObject, matches, attribute, value):
+    """
+    Writes a float or boolean constraint property to every match with one
+    foreach_get and foreach_set per bone; constraints removed since gathering
+    are skipped.
+    """
+    import numpy
+    for poseBone, names in matches:
+        constraints = poseBone.constraints
+        indices = [index for index in map(constraints.find, names)
+                   if index >= 0]
+        values = numpy.empty(len(constraints), dtype=(
+                 bool if attribute == 'mute' else numpy.float32))
+        constraints.foreach_get(attribute, values)
+        values[indices] = value
+        constraints.foreach_set(attribute, values)
+    armatureObject.update_tag()
+
+
+# Bulk influence update function.
+def bulkInfluenceUpdate(self, context):
+    """
+    Live preview of the influence while dragging; window manager properties
+    push no undo steps, so bulkConstraintOperator commits the value as one.
+    """
+    armatureObject = context.active_object
+    if context.mode != 'POSE' or not self.bulkConstraints:
+        return
+    setBulkConstraints(armatureObject, bulkConstraints(
+                       armatureObject, self.bulkConstraintType,
+                       self.bulkConstraintName), 'influence',
+                       self.bulkInfluence)
+
+
+# ##### BONE GROUP FUNCTIONS #####
+
+# Bone group rule matches function.
+def boneGroupRuleMatches(armatureObject, rule):
+    """ Names of the pose bones that a bone group rule applies to. """
+    
+    # Main variables.
+    names = poseBoneIndex(armatureObject).keys()
+    
+    # Name patterns.
+    if rule.matchType == 'GLOB':
+        return [name for name in names if fnmatchcase(name, rule.pattern)]
+    if rule.matchType == 'REGEX':
+        pattern = re.compile(rule.pattern)
+        return [name for name in names if pattern.search(name)]
+    
+    # Layer.
+    if rule.matchType == 'LAYER':
+        bones = armatureObject.data.bones
+        return [name for name in names if bones[name].layers[rule.layer]]
+    
+    # Depth.
+    depths = boneDepths(armatureObject)
+    return [name for name in names
+            if rule.depthMin <= depths[name] <= rule.depthMax]
+
+
+# Apply bone group rules function.
+def applyBoneGroupRules(armatureObject, rules, createGroups):
+    """
+    Assigns pose bones to bone groups by rule, in order, so later rules win;
+    returns the number of assignments.
+    """
+    
+    # Main variables.
+    pose = armatureObject.pose
+    index = poseBoneIndex(armatureObject)
+    count = 0
+    
+    # Rules.
+    for rule in rules:
+        if not rule.enabled or not rule.groupName:
+            continue
+        group = pose.bone_groups.get(rule.groupName)
+        if group is None:
+            if not createGroups:
+                continue
+            group = pose.bone_groups.new(name=rule.groupName)
+        for name in boneGroupRuleMatches(armatureObject, rule):
+            index[name].bone_group = group
+            count += 1
+    return count
+
+
+# ##### WIDGET FUNCTIONS #####
+
+# Widget property; custom property holding the widget key of a widget mesh.
+widgetProperty = 'armaturePanelWidget'
+
+# Widget cache; {widget key: mesh name}, checked against the mesh on use.
+widgetCache = {}
+
+
+# Widget key function.
+def widgetKey(widgetType, radius, resolution, offset):
+    """
+    Key that is equal for widgets with the same shape and parameters; radius
+    and offset are kept exactly (repr), so any two values the float properties
+    can hold give different widgets.
+    """
+    return "{}:{!r}:{}:{!r}".format(widgetType, float(radius), int(resolution),
+                                    float(offset))
+
+
+# Widget ring function.
+def widgetRing(radius, resolution, offset, axes=(0, 2)):
+    """ Closed ring of resolution vertices in the plane of axes, at offset. """
+    import numpy
+    angles = numpy.linspace(0.0, (2 * numpy.pi), resolution, endpoint=False)
+    vertices = numpy.zeros((resolution, 3))
+    vertices[:, 1] = offset
+    vertices[:, axes[0]] = (numpy.cos(angles) * radius)
+    vertices[:, axes[1]] = (numpy.sin(angles) * radius)
+    return vertices.tolist()
+
+
+# Widget loop function.
+def widgetLoop(start, count):
+    """ Edges closing count vertices from start into a loop. """
+    return [((start + index), (start + ((index + 1) % count)))
+            for index in range(count)]
+
+
+# Widget geometry function.
+def widgetGeometry(widgetType, radius, resolution, offset):
+    """
+    Vertices and edges of a widget in bone space, where the bone runs from 0 to
+    1 along Y; custom shapes are drawn scaled by the bone length.
+    """
+    import numpy
+    
+    # Circle.
+    if widgetType == 'CIRCLE':
+        return widgetRing(radius, resolution, offset), widgetLoop(0, resolution)
+    
+    # Square.
+    if widgetType == 'SQUARE':
+        vertices = [[-radius, offset, -radius], [radius, offset, -radius],
+                    [radius, offset, radius], [-radius, offset, radius]]
+        return vertices, widgetLoop(0, 4)
+    
+    # Sphere; three rings around the bone.
+    if widgetType == 'SPHERE':
+        vertices = []
+        edges = []
+        for axes in ((0, 2), (0, 1), (1, 2)):
+            ring = widgetRing(radius, resolution, 0.0, axes)
+            for vertex in ring:
+                vertex[1] += offset
+            edges += widgetLoop(len(vertices), resolution)
+            vertices += ring
+        return vertices, edges
+    
+    # Cube.
+    if widgetType == 'CUBE':
+        vertices = [[x, (offset + y), z] for x in (-radius, radius)
+                    for y in (-radius, radius) for z in (-radius, radius)]
+        edges = [(first, second) for first in range(8) for second in
+                 range(first + 1, 8) if bin(first ^ second).count('1') == 1]
+        return vertices, edges
+    
+    # Arrow; along the bone, with its head at the tail.
+    if widgetType == 'ARROW':
+        vertices = [[0.0, offset, 0.0], [0.0, 1.0, 0.0],
+                    [-radius, (1.0 - radius), 0.0],
+                    [radius, (1.0 - radius), 0.0]]
+        return vertices, [(0, 1), (1, 2), (1, 3)]
+    
+    # Gear; resolution teeth around a ring.
+    angles = numpy.linspace(0.0, (2 * numpy.pi), (resolution * 4),
+                            endpoint=False)
+    radii = numpy.tile((radius, (radius * 1.25), (radius * 1.25), radius),
+                       resolution)
+    vertices = numpy.zeros(((resolution * 4), 3))
+    vertices[:, 0] = (numpy.cos(angles) * radii)
+    vertices[:, 1] = offset
+    vertices[:, 2] = (numpy.sin(angles) * radii)
+    return vertices.tolist(), widgetLoop(0, (resolution * 4))
+
+
+# Widget mesh function.
+def widgetMesh(widgetType, radius, resolution, offset):
+    """
+    The mesh of a widget; each shape and parameter combination is created once
+    and reused from the cache, or from the file, afterwards.
+    """
+    
+    # Cached mesh.
+    key = widgetKey(widgetType, radius, resolution, offset)
+    mesh = bpy.data.meshes.get(widgetCache.get(key, ''))
+    if mesh is not None and mesh.get(widgetProperty) == key:
+        return mesh
+    
+    # Widget meshes of the file; renamed or appended since the last scan.
+    widgetCache.clear()
+    for mesh in bpy.data.meshes:
+        if widgetProperty in mesh and not mesh.library:
+            widgetCache[mesh[widgetProperty]] = mesh.name
+    mesh = bpy.data.meshes.get(widgetCache.get(key, ''))
+    if mesh is not None:
+        return mesh
+    
+    # New mesh.
+    vertices, edges = widgetGeometry(widgetType, radius, resolution, offset)
+    mesh = bpy.data.meshes.new('WGT-' + widgetType.lower())
+    mesh.from_pydata(vertices, edges, [])
+    mesh.update()
+    mesh[widgetProperty] = key
+    widgetCache[key] = mesh.name
+    return mesh
+
+
+# Widget collection function.
+def widgetCollection(scene):
+    """ Hidden collection of the scene that new widget objects are linked to. """
+    collection = bpy.data.collections.get('Widgets')
+    if collection is None:
+        collection = bpy.data.collections.new('Widgets')
+        collection.hide_viewport = True
+        collection.hide_render = True
+    if collection.name not in scene.collection.children:
+        scene.collection.children.link(collection)
+    return collection
+
+
+# Assign widgets function.
+@profiled('assignWidgets', lambda armatureObject, poseBones, mesh, collection,
+          options: armatureObject.name)
+def assignWidgets(armatureObject, poseBones, mesh, collection, options):
+    """
+    Makes the widget mesh the custom shape of every pose bone and aligns it
+    with the shape to bone options; with shared shapes every bone uses one
+    object, otherwise each bone gets its own object using the shared mesh.
+    Returns the number of bones the widget was assigned to.
+    """
+    
+    # Shared object.
+    if options.shareShapes:
+        name = (options.prefixShapeName + mesh.name)
+        shape = bpy.data.objects.get(name)
+        if shape is None or shape.data != mesh:
+            shape = bpy.data.objects.new(name, mesh)
+            shape[widgetProperty] = True
+            collection.objects.link(shape)
+        for poseBone in poseBones:
+            poseBone.custom_shape = shape
+        return shapeToBones(armatureObject, poseBones, options)
+    
+    # Object per bone; widget objects of a single bone are reused.
+    users = {}
+    for poseBone in armatureObject.pose.bones:
+        if poseBone.custom_shape:
+            users[poseBone.custom_shape.name] = (users.get(
+                poseBone.custom_shape.name, 0) + 1)
+    for poseBone in poseBones:
+        shape = poseBone.custom_shape
+        if (shape and shape.get(widgetProperty) and shape.type == 'MESH' and
+                users[shape.name] == 1):
+            shape.data = mesh
+        else:
+            shape = bpy.data.objects.new((options.prefixShapeName +
+                                          poseBone.name), mesh)
+            shape[widgetProperty] = True
+            collection.objects.link(shape)
+            poseBone.custom_shape = shape
+    return shapeToBones(armatureObject, poseBones, options)
+
+
+#############
+## CLASSES ##
+#############
+# ##### PROPERTY GROUP CLASSES #####
+
+# Constraint type options; every constraint type and 'ALL'.
+constraintTypeOptions = ([('ALL', 'All Types', "Constraints of every type.")] +
+                         [(item.identifier, item.name, item.description) for
+                          item in bpy.types.Constraint.bl_rna.properties['type']
+                          .enum_items])
+
+# Widget type options.
+widgetTypeOptions = [('CIRCLE', 'Circle', "Ring around the bone.", 'MESH_CIRCLE', 0),
+                     ('SQUARE', 'Square', "Square around the bone.", 'MESH_PLANE', 1),
+                     ('SPHERE', 'Sphere', "Three rings around the bone.", 'MESH_UVSPHERE', 2),
+                     ('CUBE', 'Cube', "Box around the bone.", 'MESH_CUBE', 3),
+                     ('ARROW', 'Arrow', "Arrow along the bone.", 'FORWARD', 4),
+                     ('GEAR', 'Gear', "Toothed ring around the bone.", 'SETTINGS', 5)]
+
+# Shape to bone property group class.
+class shapeToBonePropertyGroup(bpy.types.PropertyGroup):
+    """
+    Property group; space_view3d_armature.py
+    Properties for shapeToBoneOperator class that effect how it will proceed.
+    """
+    # Show wire.
+    showWire : BoolProperty(name='Draw Wire', description="Turn on the bones dr"
+                            "aw wire option when the shape is aligned to the bo"
+                            "ne (Bone is always drawn as a wire-frame regardles"
+                            "s of the view-port draw mode.)", default=True)
+    # Wire draw type.
+    wireDrawType : BoolProperty(name='Wire Draw Type', description="Change the "
+                                "custom shape object draw type to wire, when th"
+                                "e shape is aligned to the bone.",
+                                default=True)
+    # Name shape.
+    nameShape : BoolProperty(name='Auto-Name', description="Automatically name "
+                                "and prefix the custom shape based on the bone it "
+                                "is assigned to.", default=True)
+    # Prefix shape name.
+    prefixShapeName : StringProperty(name='Prefix', description="Use this prefi"
+                                        "x when naming a custom bone shape. (Leave"
+                                        " blank if you do not wish to prefix the n"
+                                        "ame.)", default='')
+    # Prefix shape data name.
+    prefixShapeDataName : BoolProperty(name='Prefix Shape Data Name',
+                                        description="Prefix the custom shape's o"
+                                        "bject data name in addition to prefixin"
+                                        "g the custom shapes name.",
+                                        default=False)
+    # Include armature name.
+    includeArmatureName : BoolProperty(name='Include Armature Name',
+                                        description="Include the armature name w"
+                                        "hen renaming the custom shape.",
+                                        default=False)
+    # Seperate armature name.
+    separateArmatureName : StringProperty(name='Separator', description="Separa"
+                                            "te the name of the armature and the "
+                                            "name of the bone with this character"
+                                            ".", default='-')
+    # Bone target.
+    boneTarget : EnumProperty(name='Bones', description="Pose bones whose cust"
+                              "om shapes are aligned.",
+                              items=[('ACTIVE', 'Active', "Align the custom sha"
+                                      "pe of the active pose bone.", 'BONE_DATA',
+                                      0),
+                                     ('SELECTED', 'Selected', "Align the custom"
+                                      " shapes of all selected pose bones.",
+                                      'RESTRICT_SELECT_OFF', 1),
+                                     ('ALL', 'All', "Align the custom shapes of"
+                                      " every pose bone in the armature.",
+                                      'ARMATURE_DATA', 2)],
+                              default='ACTIVE')
+    # Share shapes.
+    shareShapes : BoolProperty(name='Shared Shapes', description="Leave custom"
+                               " shapes that are shared between bones in place"
+                               " and fit each bone through its own custom shap"
+                               "e placement instead of moving and renaming the"
+                               " shape object.", default=False)
+    # Mirror shapes.
+    mirrorShapes : BoolProperty(name='Mirror', description="Align left and rig"
+                                "ht counterparts in one pass; the opposite sid"
+                                "e's shape is placed at the mirrored transform"
+                                ".", default=False)
+    # Live align.
+    liveAlign : BoolProperty(name='Live Align', description="Keep custom shape"
+                             "s aligned while bones are edited in edit mode; o"
+                             "nly bones that moved are realigned.",
+                             default=False, update=liveAlignUpdate)
+    # Widget type.
+    widgetType : EnumProperty(name='Widget', description="Shape of the widget"
+                              " assigned to the selected bones.",
+                              items=widgetTypeOptions, default='CIRCLE')
+    # Widget radius.
+    widgetRadius : FloatProperty(name='Radius', description="Size of the widg"
+                                 "et relative to the bone length.", default=0.5,
+                                 min=0.01, soft_max=2.0)
+    # Widget resolution.
+    widgetResolution : IntProperty(name='Resolution', description="Segments o"
+                                   "f round widgets; teeth of the gear.",
+                                   default=16, min=3, max=128)
+    # Widget offset.
+    widgetOffset : FloatProperty(name='Offset', description="Position of the "
+                                 "widget along the bone; 0 is the head, 1 the "
+                                 "tail.", default=0.0, soft_min=0.0,
+                                 soft_max=1.0, subtype='FACTOR')
+
+
+# Bone group rule property group class.
+class boneGroupRulePropertyGroup(bpy.types.PropertyGroup):
+    """
+    Property group; space_view3d_armature.py
+    A single rule of boneGroupRulesOperator; which pose bones are assigned to
+    which bone group.
+    """
+    # Enabled.
+    enabled : BoolProperty(name='Enabled', description="Apply this rule.",
+                           default=True)
+    # Group name.
+    groupName : StringProperty(name='Group', description="Bone group that the "
+                               "matching pose bones are assigned to.",
+                               default='')
+    # Match type.
+    matchType : EnumProperty(name='Match', description="How pose bones are mat"
+                             "ched by this rule.",
+                             items=[('GLOB', 'Glob', "Match bone names with a "
+                                     "wildcard pattern, e.g. 'finger_*.L'."),
+                                    ('REGEX', 'Regex', "Match bone names with "
+                                     "a regular expression."),
+                                    ('LAYER', 'Layer', "Match bones on an arma"
+                                     "ture layer."),
+                                    ('DEPTH', 'Depth', "Match bones by their d"
+                                     "epth in the hierarchy.")],
+                             default='GLOB')
+    # Pattern.
+    pattern : StringProperty(name='Pattern', description="Glob or regular expr"
+                             "ession the bone name is matched against.",
+                             default='*')
+    # Layer.
+    layer : IntProperty(name='Layer', description="Armature layer the bones mu"
+                        "st be on.", default=0, min=0, max=31)
+    # Depth minimum.
+    depthMin : IntProperty(name='Min Depth', description="Smallest hierarchy d"
+                           "epth, root bones are 0.", default=0, min=0)
+    # Depth maximum.
+    depthMax : IntProperty(name='Max Depth', description="Largest hierarchy de"
+                           "pth.", default=0, min=0)
+
+
+# Pose snapshot property group class.
+class poseSnapshotPropertyGroup(bpy.types.PropertyGroup):
+    """
+    Property group; space_view3d_armature.py
+    A stored pose of the pose store; bone names and pose channels compressed
+    into strings.
+    """
+    # Bone names.
+    boneNames : StringProperty(name='Bone Names', description="Compressed name"
+                               "s of the stored bones.", default='')
+    # Data.
+    data : StringProperty(name='Data', description="Compressed pose channels o"
+                          "f the stored bones.", default='')
+
+
+# Selection set property group class.
+class selectionSetPropertyGroup(bpy.types.PropertyGroup):
+    """
+    Property group; space_view3d_armature.py
+    A named selection set; a compressed bitset indexed by stable bone id.
+    """
+    # Bits.
+    bits : StringProperty(name='Bits', description="Compressed bitset of the m"
+                          "ember bone ids.", default='')
+    # Bit count.
+    bitCount : IntProperty(name='Bit Count', description="Number of bone ids t"
+                           "he bitset covers.", default=0, min=0)
+
+
+# Armature panel property group class.
+class armaturePanelPropertyGroup(bpy.types.PropertyGroup):
+    """
+    Property Group; space_view3d_armature.py
+    Properties for armaturePanel class that effect how it is displayed.
+    """
+    # Context options.
+    contextOptions = [('ARMATURE', 'Armature Options', "Display options that pu"
+                        "rtain to the properties window armature context.", 'ARM'
+                        'ATURE_DATA', 0),
+                        ('BONE', 'Bone Options', "Display options that purtain to"
+                        " the properties window bone context", 'BONE_DATA', 1),
+                        ('BONE_CONSTRAINT', 'Bone Constraint Options', "Display o"
+                        "ptions that purtain to the properties window bone const"
+                        "raint context.", 'CONSTRAINT_BONE', 2),
+                        ('SHAPE_TO_BONE', 'Shape to Bone', "Display options that "
+                        "purtain to the operator; 'Shape to Bone'", 'AUTO', 3)]
+    # Display context.
+    displayContext : EnumProperty(name='Display Context', description="Type of context to display in this panel.",items=contextOptions, default='ARMATURE')
+    # Pose blend name.
+    poseBlendName : StringProperty(name='Blend Pose', description="Stored pose"
+                                   " to blend the active pose with; the curren"
+                                   "t pose when empty.", default='')
+    # Pose blend factor.
+    poseBlendFactor : FloatProperty(name='Factor', description="Blend factor o"
+                                    "f the pose application.", default=1.0,
+                                    min=0.0, max=1.0, subtype='FACTOR')
+    # Selection set operand.
+    selectionSetOperand : StringProperty(name='Operand', description="Selecti"
+                                         "on set combined with the active one;"
+                                         " the selected bones when empty.",
+                                         default='')
+    # Bulk constraints.
+    bulkConstraints : BoolProperty(name='Multi-Bone', description="Edit the ma"
+                                   "tching constraints of every selected pose "
+                                   "bone at once.", default=False)
+    # Bulk constraint type.
+    bulkConstraintType : EnumProperty(name='Type', description="Only edit cons"
+                                      "traints of this type.",
+                                      items=constraintTypeOptions,
+                                      default='ALL')
+    # Bulk constraint name.
+    bulkConstraintName : StringProperty(name='Name', description="Only edit co"
+                                        "nstraints whose name matches this wil"
+                                        "dcard pattern.", default='*')
+    # Bulk influence.
+    bulkInfluence : FloatProperty(name='Influence', description="Influence of "
+                                  "the matching constraints; previewed while d"
+                                  "ragging, Apply keeps it as one undo step.", default=1.0, min=0.0, max=1.0,
+                                  subtype='FACTOR', update=bulkInfluenceUpdate)
+    # Bulk sub-target.
+    bulkSubtarget : StringProperty(name='Sub-Target', description="Sub-target "
+                                   "bone for the matching constraints.",
+                                   default='')
+    # Lint continuous.
+    lintContinuous : BoolProperty(name='Continuous', description="Re-check the"
+                                  " bones that changed while you work.",
+                                  default=False)
+    # Profiling.
+    profiling : BoolProperty(name='Profiling', description="Time the panel dra"
+                             "w, shape alignment and registration; adds a litt"
+                             "le overhead while enabled.",
+                             default=profiling['enabled'],
+                             update=profilingUpdate)
+    # Progress.
+    progress : FloatProperty(name='Progress', description="Progress of the run"
+                             "ning rig-wide operation.", default=0.0, min=0.0,
+                             max=100.0, subtype='PERCENTAGE')
+    # Progress label.
+    progressLabel : StringProperty(name='Progress Label', description="Name of"
+                                   " the running rig-wide operation; empty whe"
+                                   "n none is running.", default='')
+
+# ##### OPERATOR CLASSES #####
+
+# Shape to bone operator class.
+class shapeToBoneOperator(bpy.types.Operator):
+    """
+    Align currently assigned custom bone shape on a visible scene layer to
+    active pose bone.
+    """
+    # Main variables.
+    bl_idname = 'pose.shape_to_bone'
+    bl_label = 'Align to Bone'
+    bl_description = ("Align currently assigned custom bone shape on a visible scene layer to active pose bone.")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Compare timing.
+    compareTiming : BoolProperty(name='Compare Timing', description="Also run "
+                                 "the per-bone alignment path and report the t"
+                                 "ime taken by both.", default=False)
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE' and context.active_bone or a batch target. """
+        if context.mode != 'POSE':
+            return False
+        shapeToBoneOptions = context.window_manager.shapeToBoneSettings
+        return (context.active_bone is not None or
+                shapeToBoneOptions.boneTarget != 'ACTIVE')
+    
+    # Draw.
+    def draw(self, context):        
+        """ Draw the shapleToBone settings. """
+        shapeToBoneOptions = context.window_manager.shapeToBoneSettings
+        layout = self.layout
+        column = layout.column(align=True)
+        column.prop(shapeToBoneOptions, 'boneTarget', text="")
+        column.prop(shapeToBoneOptions, 'shareShapes')
+        column.prop(shapeToBoneOptions, 'mirrorShapes')
+        column.prop(shapeToBoneOptions, 'showWire')
+        column.prop(shapeToBoneOptions, 'wireDrawType')
+        column.prop(shapeToBoneOptions, 'nameShape')
+        column.prop(shapeToBoneOptions, 'prefixShapeName', text="Prefix:")
+        column.prop(shapeToBoneOptions, 'prefixShapeDataName')
+        column.prop(shapeToBoneOptions, 'includeArmatureName')
+        column.prop(shapeToBoneOptions, 'separateArmatureName')
+        column.prop(self, 'compareTiming')
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute shapeToBone """
+        shapeToBoneOptions = context.window_manager.shapeToBoneSettings
+        if (shapeToBoneOptions.boneTarget == 'ACTIVE' and not
+                self.compareTiming and not shapeToBoneOptions.mirrorShapes):
+            shapeToBone(self, context)
+            return {'FINISHED'}
+        armatureObject = context.active_object
+        poseBones = targetPoseBones(context, shapeToBoneOptions.boneTarget)
+        
+        # Per-bone path.
+        if self.compareTiming:
+            start = perf_counter()
+            for poseBone in poseBones:
+                if poseBone.custom_shape:
+                    alignShape(armatureObject, poseBone, shapeToBoneOptions)
+            perBoneTime = (perf_counter() - start)
+        
+        # Batch path.
+        start = perf_counter()
+        count = shapeToBones(armatureObject, poseBones, shapeToBoneOptions)
+        batchTime = (perf_counter() - start)
+        
+        if self.compareTiming:
+            self.report({'INFO'}, "Aligned {} shapes; per-bone {:.2f} ms, batc"
+                        "h {:.2f} ms".format(count, (perBoneTime * 1000),
+                                             (batchTime * 1000)))
+        else:
+            self.report({'INFO'}, "Aligned {} shapes in {:.2f} ms".format(
+                        count, (batchTime * 1000)))
+        return {'FINISHED'}
+
+# Chunked operator class.
+class chunkedOperator:
+    """
+    Mix-in for modal, timer-driven operators that process a rig in chunks of
+    at most chunkBudget seconds per tick, show their progress in the panel and
+    roll back when cancelled with Esc. While running only view navigation
+    passes through, so no undo, edit or mode change can invalidate the data
+    being processed or add undo steps of its own. Execute processes every item
+    at once, for scripts and background sessions. Subclasses implement
+    prepare, process, rollback and finish.
+    """
+    # Main variables.
+    chunkBudget = 0.004
+    timerInterval = 0.01
+    navigationEvents = {'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE', 'MIDDLEMOUSE',
+                        'WHEELUPMOUSE', 'WHEELDOWNMOUSE', 'TRACKPADPAN',
+                        'TRACKPADZOOM', 'MOUSEROTATE', 'NDOF_MOTION',
+                        'WINDOW_DEACTIVATE'}
+    
+    # Prepare.
+    def prepare(self, context):
+        """ Collect the work; returns the number of items to process. """
+        return 0
+    
+    # Process.
+    def process(self, context, index):
+        """ Process a single item. """
+    
+    # Rollback.
+    def rollback(self, context):
+        """ Undo the items processed so far. """
+    
+    # Finish.
+    def finish(self, context):
+        """ Called once every item was processed. """
+    
+    # Execute.
+    def execute(self, context):
+        """ Prepare and process every item without a timer. """
+        self.count = self.prepare(context)
+        if not self.count:
+            return {'CANCELLED'}
+        self.index = 0
+        while self.index < self.count:
+            self.process(context, self.index)
+            self.index += 1
+        self.finish(context)
+        return {'FINISHED'}
+    
+    # Invoke.
+    def invoke(self, context, event):
+        """ Prepare the work and start the timer. """
+        self.count = self.prepare(context)
+        if not self.count:
+            return {'CANCELLED'}
+        self.index = 0
+        windowManager = context.window_manager
+        self.timer = windowManager.event_timer_add(self.timerInterval,
+                                                   window=context.window)
+        self.timerDuration = self.timer.time_duration
+        windowManager.modal_handler_add(self)
+        windowManager.progress_begin(0, self.count)
+        self.setProgress(context, self.bl_label)
+        return {'RUNNING_MODAL'}
+    
+    # Modal.
+    def modal(self, context, event):
+        """
+        Process a chunk per tick of the own timer; Esc cancels and rolls back.
+        Navigation and other handlers' timers pass through, every other event
+        is swallowed until the work is done.
+        """
+        if event.type == 'ESC':
+            self.rollback(context)
+            self.stop(context)
+            self.report({'INFO'}, "Cancelled; changes rolled back")
+            return {'CANCELLED'}
+        if event.type in self.navigationEvents:
+            return {'PASS_THROUGH'}
+        if event.type.startswith('TIMER'):
+            # Only the own timer's duration advances when it fires.
+            if (event.type != 'TIMER' or
+                    self.timer.time_duration == self.timerDuration):
+                return {'PASS_THROUGH'}
+            self.timerDuration = self.timer.time_duration
+        else:
+            return {'RUNNING_MODAL'}
+        
+        # Chunk.
+        deadline = (perf_counter() + self.chunkBudget)
+        while self.index < self.count and perf_counter() < deadline:
+            self.process(context, self.index)
+            self.index += 1
+        context.window_manager.progress_update(self.index)
+        self.setProgress(context, self.bl_label)
+        if self.index < self.count:
+            return {'RUNNING_MODAL'}
+        self.finish(context)
+        self.stop(context)
+        return {'FINISHED'}
+    
+    # Stop.
+    def stop(self, context):
+        """ Remove the timer and clear the progress. """
+        windowManager = context.window_manager
+        windowManager.event_timer_remove(self.timer)
+        windowManager.progress_end()
+        self.setProgress(context, '')
+    
+    # Set progress.
+    def setProgress(self, context, label):
+        """ Show the progress in the panel. """
+        armaturePanelOptions = context.window_manager.armaturePanelSettings
+        armaturePanelOptions.progressLabel = label
+        armaturePanelOptions.progress = ((self.index * 100) / self.count)
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+# Shape to bone modal operator class.
+class shapeToBoneModalOperator(chunkedOperator, bpy.types.Operator):
+    """
+    Align and name custom shapes in time-budgeted chunks, keeping the interface
+    responsive on large rigs.
+    """
+    # Main variables.
+    bl_idname = 'pose.shape_to_bone_modal'
+    bl_label = 'Align Custom Shapes'
+    bl_description = ("Align the custom shapes of the selected or all pose bones in the background; Esc cancels.")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
+    
+    # Prepare.
+    def prepare(self, context):
+        """ Decompose every target in one pass and remember the old state. """
+        
+        # Main variables.
+        self.options = context.window_manager.shapeToBoneSettings
+        self.armatureObject = context.active_object
+        target = self.options.boneTarget
+        self.poseBones = [poseBone for poseBone in
+                          targetPoseBones(context, target)
+                          if poseBone.custom_shape]
+        if not self.poseBones:
+            return 0
+        
+        # Transforms; mirror mode adds the partners of the target bones.
+        self.poseBones, targetMatrices, lengths = alignmentTargets(
+            self.armatureObject, self.poseBones, self.options)
+        self.transforms = list(zip(*shapeTransforms(self.armatureObject,
+                                                    targetMatrices, lengths)))
+        
+        # Rollback state.
+        self.shapeStates = {}
+        self.boneStates = []
+        for poseBone in self.poseBones:
+            shape = poseBone.custom_shape
+            if shape not in self.shapeStates:
+                self.shapeStates[shape] = (shape.name,
+                                           getattr(shape.data, 'name', None),
+                                           shape.location.copy(),
+                                           shape.rotation_mode,
+                                           shape.rotation_euler.copy(),
+                                           shape.scale.copy(),
+                                           shape.display_type)
+            self.boneStates.append((poseBone, poseBone.bone.show_wire,
+                                    placementState(poseBone)))
+        return len(self.poseBones)
+    
+    # Process.
+    def process(self, context, index):
+        """ Place a single custom shape. """
+        location, rotation, size = self.transforms[index]
+        placeShape(self.armatureObject, self.poseBones[index], location,
+                   rotation, size, self.options)
+    
+    # Rollback.
+    def rollback(self, context):
+        """ Restore every shape and bone touched so far. """
+        for poseBone, showWire, placement in self.boneStates[:self.index]:
+            poseBone.bone.show_wire = showWire
+            restorePlacement(poseBone, placement)
+        for shape, state in self.shapeStates.items():
+            (name, dataName, location, rotationMode, rotation, scale,
+             displayType) = state
+            shape.name = name
+            if dataName is not None:
+                shape.data.name = dataName
+            shape.location = location
+            shape.rotation_mode = rotationMode
+            shape.rotation_euler = rotation
+            shape.scale = scale
+            shape.display_type = displayType
+    
+    # Finish.
+    def finish(self, context):
+        """ Report the result. """
+        self.report({'INFO'}, "Aligned {} shapes".format(self.count))
+
+# Share shapes operator class.
+class shareShapesOperator(bpy.types.Operator):
+    """
+    Replace duplicated custom shapes with a single shared shape object.
+    """
+    # Main variables.
+    bl_idname = 'pose.share_custom_shapes'
+    bl_label = 'Share Custom Shapes'
+    bl_description = ("Point bones whose custom shapes have identical geometry at one shared shape object.")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Remove unused.
+    removeUnused : BoolProperty(name='Remove Unused', description="Delete the "
+                                "duplicated shape objects and meshes that are n"
+                                "o longer used by any bone.", default=True)
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute shareShapes """
+        shapeToBoneOptions = context.window_manager.shapeToBoneSettings
+        target = shapeToBoneOptions.boneTarget
+        if target == 'ACTIVE':
+            target = 'ALL'
+        count = shareShapes(context.active_object,
+                            targetPoseBones(context, target),
+                            self.removeUnused)
+        self.report({'INFO'}, "Shared custom shapes on {} bones".format(count))
+        return {'FINISHED'}
+
+# Widget operator class.
+class widgetOperator(bpy.types.Operator):
+    """
+    Assign a generated widget to the selected pose bones and align it.
+    """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_widget'
+    bl_label = 'Assign Widget'
+    bl_description = ("Make a generated widget the custom shape of the selected bones and align it.")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute assignWidgets """
+        shapeToBoneOptions = context.window_manager.shapeToBoneSettings
+        poseBones = (targetPoseBones(context, 'SELECTED') or
+                     targetPoseBones(context, 'ACTIVE'))
+        if not poseBones:
+            self.report({'WARNING'}, "No bones selected")
+            return {'CANCELLED'}
+        mesh = widgetMesh(shapeToBoneOptions.widgetType,
+                          shapeToBoneOptions.widgetRadius,
+                          shapeToBoneOptions.widgetResolution,
+                          shapeToBoneOptions.widgetOffset)
+        count = assignWidgets(context.active_object, poseBones, mesh,
+                              widgetCollection(context.scene),
+                              shapeToBoneOptions)
+        self.report({'INFO'}, "Assigned {} to {} bones".format(mesh.name, count))
+        return {'FINISHED'}
+
+# Bone search operator class.
+class boneSearchOperator(bpy.types.Operator):
+    """
+    Search the bones of an armature through a prebuilt name index and assign
+    the chosen bone to a bone field of the active bone.
+    """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_bone_search'
+    bl_label = 'Search Bones'
+    bl_description = ("Fuzzy, side-aware bone search for this field.")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Field.
+    field : EnumProperty(name='Field', description="Bone field to assign.",
+                         items=[('BBONE_START', 'Start Handle', ""),
+                                ('BBONE_END', 'End Handle', ""),
+                                ('SHAPE_TRANSFORM', 'Custom Shape Transform', ""),
+                                ('SUBTARGET', 'Constraint Sub-Target', "")])
+    # Query.
+    query : StringProperty(name='Search', description="Bone name to look for;"
+                           " typos are tolerated and a side (.L/.R, _l/_r) is p"
+                           "referred.", default='')
+    # Bone name.
+    boneName : StringProperty(name='Bone', description="Bone to assign; the be"
+                              "st match of the query when empty.", default='',
+                              options={'SKIP_SAVE'})
+    # Clear.
+    clear : BoolProperty(name='Clear', description="Empty the field instead of"
+                         " searching.", default=False, options={'SKIP_SAVE'})
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; context.active_bone and mode == 'POSE'. """
+        return context.active_bone and context.mode == 'POSE'
+    
+    # Search armature.
+    def searchArmature(self, context):
+        """ Armature whose bones the field can point at. """
+        if self.field == 'SUBTARGET':
+            constraint = self.activeConstraint(context)
+            target = getattr(constraint, 'target', None)
+            if target and target.type == 'ARMATURE':
+                return target.data
+            return None
+        return context.active_object.data
+    
+    # Active constraint.
+    def activeConstraint(self, context):
+        """ Constraint selected in the panel's constraint list. """
+        poseBone = context.active_object.pose.bones[context.active_bone.name]
+        index = poseBone.armaturePanelConstraintIndex
+        if 0 <= index < len(poseBone.constraints):
+            return poseBone.constraints[index]
+        return None
+    
+    # Invoke.
+    def invoke(self, context, event):
+        """ Show the search dialog unless a bone was chosen or cleared. """
+        if self.boneName or self.clear:
+            return self.execute(context)
+        return context.window_manager.invoke_props_dialog(self, width=300)
+    
+    # Draw.
+    def draw(self, context):
+        """ Draw the query and its ranked results. """
+        layout = self.layout
+        layout.prop(self, 'query', text="", icon='VIEWZOOM')
+        armature = self.searchArmature(context)
+        if armature is None or not self.query:
+            return
+        column = layout.column(align=True)
+        column.operator_context = 'EXEC_DEFAULT'
+        for name in boneSearchIndex(armature).search(self.query, limit=12):
+            searchOperator = column.operator(self.bl_idname, text=name,
+                                             icon='BONE_DATA')
+            searchOperator.field = self.field
+            searchOperator.boneName = name
+    
+    # Execute.
+    def execute(self, context):
+        """ Assign the chosen bone to the field, or empty it. """
+        
+        # Main variables.
+        armature = self.searchArmature(context)
+        bone = context.active_bone
+        poseBone = context.active_object.pose.bones[bone.name]
+        
+        # Clear.
+        if self.clear:
+            if self.field == 'BBONE_START':
+                bone.bbone_custom_handle_start = None
+            elif self.field == 'BBONE_END':
+                bone.bbone_custom_handle_end = None
+            elif self.field == 'SHAPE_TRANSFORM':
+                poseBone.custom_shape_transform = None
+            elif self.activeConstraint(context):
+                self.activeConstraint(context).subtarget = ''
+            return {'FINISHED'}
+        if armature is None:
+            self.report({'WARNING'}, "No armature to search")
+            return {'CANCELLED'}
+        name = self.boneName
+        if not name:
+            results = boneSearchIndex(armature).search(self.query, limit=1)
+            if not results:
+                self.report({'WARNING'}, "No bone matches '{}'".format(self.query))
+                return {'CANCELLED'}
+            name = results[0]
+        
+        # Assign.
+        if self.field == 'BBONE_START':
+            bone.bbone_custom_handle_start = armature.bones[name]
+        elif self.field == 'BBONE_END':
+            bone.bbone_custom_handle_end = armature.bones[name]
+        elif self.field == 'SHAPE_TRANSFORM':
+            poseBone.custom_shape_transform = context.active_object.pose.bones[name]
+        else:
+            self.activeConstraint(context).subtarget = name
+        return {'FINISHED'}
+
+# Bone group rules operator class.
+class boneGroupRulesOperator(bpy.types.Operator):
+    """
+    Assign pose bones to bone groups by the panel's bone group rules.
+    """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_group_rules'
+    bl_label = 'Apply Group Rules'
+    bl_description = ("Assign pose bones to bone groups by name pattern, layer or hierarchy depth in a single undo step.")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Create groups.
+    createGroups : BoolProperty(name='Create Groups', description="Create bone"
+                                " groups named by a rule that do not exist yet.",
+                                default=True)
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute applyBoneGroupRules """
+        try:
+            count = applyBoneGroupRules(context.active_object,
+                                        context.active_object.data.armaturePanelGroupRules,
+                                        self.createGroups)
+        except re.error as error:
+            self.report({'ERROR'}, "Invalid pattern: {}".format(error))
+            return {'CANCELLED'}
+        self.report({'INFO'}, "Made {} bone group assignments".format(count))
+        return {'FINISHED'}
+
+
+# Bone group rule edit operator class.
+class boneGroupRuleEditOperator(bpy.types.Operator):
+    """
+    Add or remove a bone group rule.
+    """
+    # Main variables.
+    bl_idname = 'view3d.armature_panel_group_rule_edit'
+    bl_label = 'Edit Group Rules'
+    bl_description = ("Add or remove a bone group rule.")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Action.
+    action : EnumProperty(name='Action', items=[('ADD', 'Add', ""),
+                                                ('REMOVE', 'Remove', "")])
+    
+    # Execute.
+    def execute(self, context):
+        """ Add a rule for the active bone group, or remove the active rule. """
+        armature = context.active_object.data
+        rules = armature.armaturePanelGroupRules
+        if self.action == 'ADD':
+            rule = rules.add()
+            boneGroup = context.active_object.pose.bone_groups.active
+            if boneGroup:
+                rule.groupName = boneGroup.name
+            armature.armaturePanelGroupRuleIndex = (len(rules) - 1)
+        elif rules:
+            rules.remove(armature.armaturePanelGroupRuleIndex)
+            armature.armaturePanelGroupRuleIndex = max(0, min(
+                armature.armaturePanelGroupRuleIndex, (len(rules) - 1)))
+        return {'FINISHED'}
+
+# Pose capture operator class.
+class poseCaptureOperator(bpy.types.Operator):
+    """
+    Store the current pose in the pose store.
+    """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_pose_capture'
+    bl_label = 'Store Pose'
+    bl_description = ("Store the pose of all or the selected pose bones.")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Name.
+    name : StringProperty(name='Name', description="Name of the stored pose.",
+                          default='Pose')
+    # Selected only.
+    selectedOnly : BoolProperty(name='Selected Only', description="Only store "
+                                "the selected pose bones.", default=False)
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute capturePose """
+        armatureObject = context.active_object
+        poses = armatureObject.armaturePanelPoses
+        snapshot = poses.add()
+        snapshot.name = self.name
+        count = capturePose(armatureObject, snapshot, self.selectedOnly)
+        armatureObject.armaturePanelPoseIndex = (len(poses) - 1)
+        self.report({'INFO'}, "Stored {} bones".format(count))
+        return {'FINISHED'}
+
+
+# Pose remove operator class.
+class poseRemoveOperator(bpy.types.Operator):
+    """
+    Remove the active pose from the pose store.
+    """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_pose_remove'
+    bl_label = 'Remove Pose'
+    bl_description = ("Remove the active stored pose.")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; an active stored pose. """
+        object = context.active_object
+        return (object is not None and object.type == 'ARMATURE' and
+                0 <= object.armaturePanelPoseIndex < len(object.armaturePanelPoses))
+    
+    # Execute.
+    def execute(self, context):
+        """ Remove the active stored pose. """
+        armatureObject = context.active_object
+        armatureObject.armaturePanelPoses.remove(armatureObject.armaturePanelPoseIndex)
+        armatureObject.armaturePanelPoseIndex = max(0, (armatureObject.armaturePanelPoseIndex - 1))
+        return {'FINISHED'}
+
+
+# Pose apply operator class.
+class poseApplyOperator(bpy.types.Operator):
+    """
+    Apply the active stored pose, optionally blended.
+    """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_pose_apply'
+    bl_label = 'Apply Pose'
+    bl_description = ("Apply the active stored pose in one bulk write, blended with the blend pose or the current pose by the factor.")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE' and an active stored pose. """
+        return context.mode == 'POSE' and poseRemoveOperator.poll(context)
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute applyPose """
+        armaturePanelOptions = context.window_manager.armaturePanelSettings
+        armatureObject = context.active_object
+        poses = armatureObject.armaturePanelPoses
+        applyPose(armatureObject, poses[armatureObject.armaturePanelPoseIndex],
+                  poses.get(armaturePanelOptions.poseBlendName),
+                  armaturePanelOptions.poseBlendFactor)
+        return {'FINISHED'}
+
+
+# Selection set add operator class.
+class selectionSetAddOperator(bpy.types.Operator):
+    """
+    Store the selected bones as a new selection set.
+    """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_selection_set_add'
+    bl_label = 'Add Selection Set'
+    bl_description = ("Store the selected bones as a new selection set.")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Name.
+    name : StringProperty(name='Name', default='Set')
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute storeSelectionSet """
+        armature = context.active_object.data
+        selectionSets = armature.armaturePanelSelectionSets
+        selectionSet = selectionSets.add()
+        selectionSet.name = self.name
+        count = storeSelectionSet(selectionSet, boneIds(armature),
+                                  boneFlags(armature, 'select'))
+        armature.armaturePanelSelectionSetIndex = (len(selectionSets) - 1)
+        self.report({'INFO'}, "Stored {} bones".format(count))
+        return {'FINISHED'}
+
+
+# Selection set remove operator class.
+class selectionSetRemoveOperator(bpy.types.Operator):
     """
-    Takes the custom shape assigned to the active pose bone and aligns it to the
-    pose bone's orientation.
+    Remove the active selection set.
     """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_selection_set_remove'
+    bl_label = 'Remove Selection Set'
+    bl_description = ("Remove the active selection set.")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; an active selection set. """
+        object = context.active_object
+        return (object is not None and object.type == 'ARMATURE' and
+                0 <= object.data.armaturePanelSelectionSetIndex <
+                len(object.data.armaturePanelSelectionSets))
     
+    # Execute.
+    def execute(self, context):
+        """ Remove the active selection set. """
+        armature = context.active_object.data
+        armature.armaturePanelSelectionSets.remove(armature.armaturePanelSelectionSetIndex)
+        armature.armaturePanelSelectionSetIndex = max(0, (armature.armaturePanelSelectionSetIndex - 1))
+        return {'FINISHED'}
+
+
+# Selection set operator class.
+class selectionSetOperator(bpy.types.Operator):
+    """
+    Edit the active selection set or apply it to the bones.
+    """
     # Main variables.
-    shapeToBoneOptions = context.window_manager.shapeToBoneSettings
-    activeArmature = context.active_object
-    activeBone = context.active_bone
-    activePoseBone = activeArmature.pose.bones[activeBone.name]
-    shape = activePoseBone.custom_shape
-    shapeTransform = activePoseBone.custom_shape_transform
+    bl_idname = 'pose.armature_panel_selection_set'
+    bl_label = 'Selection Set'
+    bl_description = ("Edit the active selection set or select, hide or reveal its bones.")
+    bl_options = {'REGISTER', 'UNDO'}
     
-    # Custom shape transform.
-    if shapeTransform:
-        targetMatrix = (activeArmature.matrix_world @ shapeTransform.matrix)
-    else:
-        targetMatrix = (activeArmature.matrix_world @ activeBone.matrix_local)
+    # Action.
+    action : EnumProperty(name='Action',
+                          items=[('SELECT', 'Select', "Select the bones of the set."),
+                                 ('DESELECT', 'Deselect', "Deselect the bones of the set."),
+                                 ('HIDE', 'Hide', "Hide the bones of the set."),
+                                 ('REVEAL', 'Reveal', "Reveal the bones of the set."),
+                                 ('ASSIGN', 'Assign', "Replace the set with the operand."),
+                                 ('UNION', 'Union', "Add the operand to the set."),
+                                 ('INTERSECT', 'Intersect', "Keep the bones that are also in the operand."),
+                                 ('SUBTRACT', 'Subtract', "Remove the operand from the set.")],
+                          default='SELECT')
+    # Extend.
+    extend : BoolProperty(name='Extend', description="Add the bones to the sel"
+                          "ection instead of replacing it.", default=False)
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE' and an active selection set. """
+        return context.mode == 'POSE' and selectionSetRemoveOperator.poll(context)
     
-    # Location, rotation, scale.
-    shape.location = targetMatrix.to_translation()
-    shape.rotation_mode = 'XYZ'
-    shape.rotation_euler = targetMatrix.to_euler()
-    targetScale = targetMatrix.to_scale()
-    scaleAverage = ((targetScale[0] + targetScale[1] + targetScale[2]) / 3)
-    shape.scale = ((activeBone.length * scaleAverage),
-                   (activeBone.length * scaleAverage),
-                   (activeBone.length * scaleAverage))
+    # Execute.
+    def execute(self, context):
+        """ Execute combineSelectionSet or applySelectionSet """
+        armaturePanelOptions = context.window_manager.armaturePanelSettings
+        armature = context.active_object.data
+        selectionSets = armature.armaturePanelSelectionSets
+        selectionSet = selectionSets[armature.armaturePanelSelectionSetIndex]
+        ids = boneIds(armature)
+        
+        # Edit the set.
+        if self.action in ('ASSIGN', 'UNION', 'INTERSECT', 'SUBTRACT'):
+            operandSet = selectionSets.get(armaturePanelOptions.selectionSetOperand)
+            if operandSet is None:
+                operand = boneFlags(armature, 'select')
+            else:
+                operand = selectionSetMask(operandSet, ids)
+            count = combineSelectionSet(selectionSet, ids, operand, self.action)
+            self.report({'INFO'}, "{} has {} bones".format(selectionSet.name, count))
+            return {'FINISHED'}
+        
+        # Apply the set.
+        applySelectionSet(armature, selectionSetMask(selectionSet, ids),
+                          self.action, self.extend)
+        if context.area:
+            context.area.tag_redraw()
+        return {'FINISHED'}
+
+
+# Bulk constraint operator class.
+class bulkConstraintOperator(bpy.types.Operator):
+    """
+    Edit the matching constraints of every selected pose bone in one pass.
+    """
+    # Main variables.
+    bl_idname = 'pose.armature_panel_bulk_constraints'
+    bl_label = 'Edit Constraints'
+    bl_description = ("Edit the matching constraints of all selected pose bones as a single undo step.")
+    bl_options = {'REGISTER', 'UNDO'}
     
-    #Draw options.
-    if shapeToBoneOptions.showWire:
-        activeBone.show_wire = True
-    if shapeToBoneOptions.wireDrawType:
-        shape.display_type = 'WIRE'
+    # Action.
+    action : EnumProperty(name='Action',
+                          items=[('INFLUENCE', 'Set Influence', ""),
+                                 ('MUTE', 'Mute', ""),
+                                 ('UNMUTE', 'Unmute', ""),
+                                 ('SUBTARGET', 'Set Sub-Target', "")],
+                          default='INFLUENCE')
+
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
     
-    # Datablock name.
-    if shapeToBoneOptions.nameShape:
-        targetName = activeBone.name
-        if shapeToBoneOptions.includeArmatureName:
-            targetName = (activeArmature.name +
-                    shapeToBoneOptions.separateArmatureName +
-                    targetName)
-        shape.name = (shapeToBoneOptions.prefixShapeName + targetName)
-        if shapeToBoneOptions.prefixShapeDataName:
-            shape.data.name = (shapeToBoneOptions.prefixShapeName + targetName)
+    # Execute.
+    def execute(self, context):
+        """ Execute setBulkConstraints """
+        armaturePanelOptions = context.window_manager.armaturePanelSettings
+        armatureObject = context.active_object
+        matches = bulkConstraints(armatureObject,
+                                  armaturePanelOptions.bulkConstraintType,
+                                  armaturePanelOptions.bulkConstraintName)
+        if self.action == 'INFLUENCE':
+            setBulkConstraints(armatureObject, matches, 'influence',
+                               armaturePanelOptions.bulkInfluence)
+        elif self.action in {'MUTE', 'UNMUTE'}:
+            setBulkConstraints(armatureObject, matches, 'mute',
+                               (self.action == 'MUTE'))
         else:
-            shape.data.name = targetName
-
+            for poseBone, names in matches:
+                for name in names:
+                    constraint = poseBone.constraints.get(name)
+                    if hasattr(constraint, 'subtarget'):
+                        constraint.subtarget = armaturePanelOptions.bulkSubtarget
+            armatureObject.update_tag()
+        self.report({'INFO'}, "Edited {} constraints".format(
+                    sum(len(names) for poseBone, names in matches)))
+        return {'FINISHED'}
 
-#############
-## CLASSES ##
-#############
-# ##### PROPERTY GROUP CLASSES #####
 
-# Shape to bone property group class.
-class shapeToBonePropertyGroup(bpy.types.PropertyGroup):
+# Tree toggle operator class.
+class treeToggleOperator(bpy.types.Operator):
     """
-    Property group; space_view3d_armature.py
-    Properties for shapeToBoneOperator class that effect how it will proceed.
+    Expand or collapse a bone of the bone tree.
     """
-    # Show wire.
-    showWire : BoolProperty(name='Draw Wire', description="Turn on the bones dr"
-                            "aw wire option when the shape is aligned to the bo"
-                            "ne (Bone is always drawn as a wire-frame regardles"
-                            "s of the view-port draw mode.)", default=True)
-    # Wire draw type.
-    wireDrawType : BoolProperty(name='Wire Draw Type', description="Change the "
-                                "custom shape object draw type to wire, when th"
-                                "e shape is aligned to the bone.",
-                                default=True)
-    # Name shape.
-    nameShape : BoolProperty(name='Auto-Name', description="Automatically name "
-                                "and prefix the custom shape based on the bone it "
-                                "is assigned to.", default=True)
-    # Prefix shape name.
-    prefixShapeName : StringProperty(name='Prefix', description="Use this prefi"
-                                        "x when naming a custom bone shape. (Leave"
-                                        " blank if you do not wish to prefix the n"
-                                        "ame.)", default='')
-    # Prefix shape data name.
-    prefixShapeDataName : BoolProperty(name='Prefix Shape Data Name',
-                                        description="Prefix the custom shape's o"
-                                        "bject data name in addition to prefixin"
-                                        "g the custom shapes name.",
-                                        default=False)
-    # Include armature name.
-    includeArmatureName : BoolProperty(name='Include Armature Name',
-                                        description="Include the armature name w"
-                                        "hen renaming the custom shape.",
-                                        default=False)
-    # Seperate armature name.
-    separateArmatureName : StringProperty(name='Separator', description="Separa"
-                                            "te the name of the armature and the "
-                                            "name of the bone with this character"
-                                            ".", default='-')
+    # Main variables.
+    bl_idname = 'view3d.armature_panel_tree_toggle'
+    bl_label = 'Expand Bone'
+    bl_description = ("Show or hide the children of this bone.")
+    
+    # Bone name.
+    boneName : StringProperty(name='Bone', default='')
+    
+    # Execute.
+    def execute(self, context):
+        """ Toggle the bone; the visible rows are recomputed on the next draw. """
+        tree = boneHierarchy(context.active_object.data)
+        tree['expanded'].symmetric_difference_update({self.boneName})
+        tree['rows'] = None
+        return {'FINISHED'}
 
 
-# Armature panel property group class.
-class armaturePanelPropertyGroup(bpy.types.PropertyGroup):
+# Reparent operator class.
+class reparentOperator(bpy.types.Operator):
     """
-    Property Group; space_view3d_armature.py
-    Properties for armaturePanel class that effect how it is displayed.
+    Parent the selected bones to a bone of the bone tree.
     """
-    # Context options.
-    contextOptions = [('ARMATURE', 'Armature Options', "Display options that pu"
-                        "rtain to the properties window armature context.", 'ARM'
-                        'ATURE_DATA', 0),
-                        ('BONE', 'Bone Options', "Display options that purtain to"
-                        " the properties window bone context", 'BONE_DATA', 1),
-                        ('BONE_CONSTRAINT', 'Bone Constraint Options', "Display o"
-                        "ptions that purtain to the properties window bone const"
-                        "raint context.", 'CONSTRAINT_BONE', 2),
-                        ('SHAPE_TO_BONE', 'Shape to Bone', "Display options that "
-                        "purtain to the operator; 'Shape to Bone'", 'AUTO', 3)]
-    # Display context.
-    displayContext : EnumProperty(name='Display Context', description="Type of context to display in this panel.",items=contextOptions, default='ARMATURE')
+    # Main variables.
+    bl_idname = 'armature.armature_panel_reparent'
+    bl_label = 'Parent Selected'
+    bl_description = ("Parent the selected bones to this bone.")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Parent name.
+    parentName : StringProperty(name='Parent', description="Clears the parent "
+                                "when empty.", default='')
+    
+    @classmethod
+    # Poll.
+    def poll(cls, context):
+        """ poll; mode == 'EDIT_ARMATURE'. """
+        return context.mode == 'EDIT_ARMATURE'
+    
+    # Execute.
+    def execute(self, context):
+        """ Reparent, skipping the parent and its ancestors to avoid cycles. """
+        editBones = context.active_object.data.edit_bones
+        parent = editBones.get(self.parentName)
+        ancestors = set()
+        ancestor = parent
+        while ancestor:
+            ancestors.add(ancestor.name)
+            ancestor = ancestor.parent
+        count = 0
+        for editBone in editBones:
+            if editBone.select and editBone.name not in ancestors:
+                editBone.use_connect = False
+                editBone.parent = parent
+                count += 1
+        self.report({'INFO'}, "Reparented {} bones".format(count))
+        return {'FINISHED'}
 
-# ##### OPERATOR CLASSES #####
 
-# Shape to bone operator class.
-class shapeToBoneOperator(bpy.types.Operator):
+# Lint operator class.
+class lintOperator(bpy.types.Operator):
     """
-    Align currently assigned custom bone shape on a visible scene layer to
-    active pose bone.
+    Check the rig for broken constraint targets, unaligned custom shapes,
+    missing B-Bone handles and zero envelope deform bones.
     """
     # Main variables.
-    bl_idname = 'pose.shape_to_bone'
-    bl_label = 'Align to Bone'
-    bl_description = ("Align currently assigned custom bone shape on a visible scene layer to active pose bone.")
-    bl_options = {'REGISTER', 'UNDO'}
+    bl_idname = 'pose.armature_panel_lint'
+    bl_label = 'Check Rig'
+    bl_description = ("Check the rig for common problems; only bones changed since the previous check are checked again.")
+    
+    # Full.
+    full : BoolProperty(name='Full', description="Check every bone, not only "
+                        "the bones changed since the previous check.",
+                        default=False)
 
     @classmethod
     # Poll.
     def poll(cls, context):
-        """ poll; context.active_bone and mode == 'POSE'. """
-        return context.active_bone and context.mode == 'POSE'
-    
-    # Draw.
-    def draw(self, context):        
-        """ Draw the shapleToBone settings. """
-        shapeToBoneOptions = context.window_manager.shapeToBoneSettings
-        layout = self.layout
-        column = layout.column(align=True)
-        column.prop(shapeToBoneOptions, 'showWire')
-        column.prop(shapeToBoneOptions, 'wireDrawType')
-        column.prop(shapeToBoneOptions, 'nameShape')
-        column.prop(shapeToBoneOptions, 'prefixShapeName', text="Prefix:")
-        column.prop(shapeToBoneOptions, 'prefixShapeDataName')
-        column.prop(shapeToBoneOptions, 'includeArmatureName')
-        column.prop(shapeToBoneOptions, 'separateArmatureName')
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
     
     # Execute.
     def execute(self, context):
-        """ Execute shapeToBone """
-        shapeToBone(self, context)
+        """ Execute runLint """
+        armatureObject = context.active_object
+        if self.full:
+            lintEntry(armatureObject)['full'] = True
+        results = runLint(armatureObject,
+                          context.window_manager.shapeToBoneSettings)
+        self.report({'INFO'}, "{} bones with issues".format(len(results)))
         return {'FINISHED'}
 
-# ##### INTERFACE CLASSES #####
 
-    # Armature panel class.
-class ARMATURE_PT_armaturePanel(bpy.types.Panel):
+# Lint jump operator class.
+class lintJumpOperator(bpy.types.Operator):
     """
-    Armature panel for the add-on; space_view3d_armature.py
-    This panel is located in the 3D view's properties window, while in pose or
-    armature edit mode, decided to go with a unique design here.
+    Make a bone with an issue active and show the tab the issue belongs to.
     """
     # Main variables.
-    bl_space_type = 'VIEW_3D'
-    bl_region_type = 'UI'
-    bl_label = 'Armature'
-    bl_category = "Armature"
+    bl_idname = 'pose.armature_panel_lint_jump'
+    bl_label = 'Jump to Bone'
+    bl_description = ("Select the bone and show the issue in the panel.")
+    bl_options = {'REGISTER', 'UNDO'}
     
-    # Poll.
+    # Bone name.
+    boneName : StringProperty(name='Bone', default='')
+    # Display context.
+    displayContext : StringProperty(name='Tab', default='BONE')
+    # Constraint index.
+    constraintIndex : IntProperty(name='Constraint', default=-1)
+
     @classmethod
+    # Poll.
     def poll(cls, context):
-        """ poll; context.mode in {'POSE', 'EDIT_ARMATURE'}. """
-        return context.mode in {'POSE', 'EDIT_ARMATURE'}
+        """ poll; mode == 'POSE'. """
+        return context.mode == 'POSE'
     
-    # Draw.
-    def draw(self, context):
-        
-        # Main variables.
-        armaturePanelOptions = context.window_manager.armaturePanelSettings
-        object = context.object
-        armature = bpy.data.armatures[object.name]
-        bone = context.active_bone
-        poseBone = object.pose.bones[bone.name]
-        bone_list = "bones"
-        arm = bpy.data.armatures
-        
-        # Layout
-        layout = self.layout
-        column = layout.column(align=True)
-        
-        # Display options.
-        columnRow = column.row()
-        columnRow.prop(armaturePanelOptions, 'displayContext', text="",expand=True)
-
-        # Armature options.
-        if armaturePanelOptions.displayContext == 'ARMATURE':
-            column.separator()
-            column.template_ID(object, 'data')
-            column.separator()
-            column.label(text="Skeleton:")
-            column.separator()
-            if context.mode == 'POSE':
-                columnRow = column.row()
-                columnRow.prop(armature, 'pose_position', text="")
-                column.separator()
-            column.prop(armature, 'layers', text="")
-            column.separator()
-            column.label(text="Display :")
-            column.separator()
-            column.prop(armature, 'display_type', text="")
-            columnSplit = column.split(align=True)
-            columnSplit.prop(armature, 'show_names', text="Names",toggle=True)
-            columnSplit.prop(armature, 'show_group_colors', text="Colors",toggle=True)
-            columnSplit = column.split(align=True)
-            columnSplit.prop(armature, 'show_axes', text="Axes",toggle=True)
-            if object:
-                columnSplit.prop(object, 'show_in_front', text="In Front",toggle=True)
-
-            columnSplit = column.split(align=True)
-            columnSplit.prop(armature, 'show_bone_custom_shapes',text="Shapes", toggle=True)
-
-            # Bone groups
-            boneGroups = object.pose.bone_groups.active
-            column.separator()
-            column.label(text="Bone Groups:")
-            column.separator()
-            if boneGroups:
-                rowCount = 4
-            else:
-                rowCount = 1
-            columnRow = column.row()
-            columnRow.template_list('UI_UL_list', 'bone_groups',
-                                    object.pose, 'bone_groups',
-                                    object.pose.bone_groups,
-                                    'active_index', rows=rowCount)
-            rowColumn = columnRow.column(align=True)
-            rowColumn.active = object.proxy is None
-            rowColumn.operator('pose.group_add', icon='ADD', text="")
-            rowColumn.operator('pose.group_remove', icon='REMOVE', text="")
-            rowColumn.menu('DATA_MT_bone_group_context_menu',icon='DOWNARROW_HLT', text="") #sav
-            if boneGroups:
-                rowColumn.separator()
-                rowColumn.operator('pose.group_move', icon='TRIA_UP',text="").direction = 'UP'
-                rowColumn.operator('pose.group_move', icon='TRIA_DOWN',text="").direction = 'DOWN'
-                rowColumn.separator()
-                columnSplit.active = object.proxy is None
-                columnSplit = column.split()
-                columnSplit.prop(boneGroups, 'color_set', text="")
-                if boneGroups.color_set:
-                    subSplit = columnSplit.split(align=True)
-                    subSplit.prop(boneGroups.colors, 'normal', text="")
-                    subSplit.prop(boneGroups.colors, 'select', text="")
-                    subSplit.prop(boneGroups.colors, 'active', text="")
-            column.separator()
-            columnRow = column.row()
-            columnRow.active = object.proxy is None
-            subRow = columnRow.row(align=True)
-            subRow.operator('pose.group_assign', text="Assign")
-            subRow.operator('pose.group_unassign', text="Remove")
-            subRow = columnRow.row(align=True)
-            subRow.operator('pose.group_select', text="Select")
-            subRow.operator('pose.group_deselect', text="Deselect")
-
-            # Pose library.
-            poseLibrary = object.pose_library
-            column.separator()
-            column.label(text="Pose Library:")
-            column.separator()
-            columnRow = column.row()
-            column.separator()
-            columnRow.template_ID(object, 'pose_library', new='poselib.new',unlink='poselib.unlink')
-            if poseLibrary:
-                columnRow = column.row()
-                columnRow.template_list('UI_UL_list', 'pose_markers',
-                                        poseLibrary, 'pose_markers',
-                                        poseLibrary.pose_markers, 'active_i'
-                                        'ndex', rows=3)
-                rowColumn = columnRow.column(align=True)
-                rowColumn.active = poseLibrary.library is None
-                rowColumn.operator('poselib.pose_add', icon='ZOOM_IN',text="")
-                rowColumn.operator_context = 'EXEC_DEFAULT'
-                poseMarkerActive = poseLibrary.pose_markers.active
-                if poseMarkerActive:
-                    rowColumn.operator('poselib.pose_remove',icon='ZOOM_OUT', text="")
-                    activeIndex = poseLibrary.pose_markers.active_index
-                    rowColumn.operator('poselib.apply_pose', icon='ZOOM_SELECTED',text="").pose_index = activeIndex
-                rowColumn.operator('poselib.action_sanitize', icon='HELP',text="")
-        
-        # Bone options.
-        if armaturePanelOptions.displayContext == 'BONE':
-            column.separator()
-            columnRow = column.row()
-            subRow = columnRow.row()
-            subRow.label(text="", icon='BONE_DATA')
-            columnRow.prop(bone, 'name', text="")
-            column.separator()
-        
-            # Relations
-            column.label(text="Relations:")
-            column.separator()
-            column.prop(bone, 'layers', text="")
-            column.separator()
-            if context.mode == 'POSE':
-                column.prop_search(poseBone, 'bone_group', object.pose,'bone_groups', text="")
-                column.prop(bone, 'use_relative_parent', toggle=True)
-            column.prop(bone, 'parent', text="")
-            subColumn = column.column(align=True)
-            subColumn.active = bone.parent is not None
-            subColumn.prop(bone, 'use_connect', toggle=True)
-            columnSplit = column.split(align=True)
-            columnSplit.active = bone.parent is not None
-            columnSplit.prop(bone, 'use_inherit_rotation', toggle=True)
-            columnSplit.prop(bone, 'use_inherit_scale', toggle=True)
-            subColumn = column.column(align=True)
-            subColumn.active = not bone.parent or not bone.use_connect
-            subColumn.prop(bone, 'use_local_location', toggle=True)
-            column.separator()
-            
-            # Deform
-            column.prop(bone, 'use_deform', text="Deform:")
-            column.separator()
-            column = column.column(align=True)
-            column.active = bone.use_deform
-            column.prop(bone, 'use_envelope_multiply', text="Multiply",
-                        toggle=True)
-            column.prop(bone, 'envelope_distance', text="Distance")
-            column.prop(bone, 'envelope_weight', text="Weight")
-            column.separator()
-            column.prop(bone, 'head_radius', text="Head")
-            column.prop(bone, 'tail_radius', text="Tail")
-            column.separator()
-            column.prop(bone, 'bbone_segments', text="Segments")
-            column.prop(bone, 'bbone_easein', text="Ease In")
-            column.prop(bone, 'bbone_easeout', text="Ease Out")
-            if context.mode == 'POSE':
-                column.prop(bone, 'bbone_handle_type_start', text="Start Handle")
-                column.prop_search(bone, "bbone_custom_handle_start", armature, bone_list, text="Custom")
-                column.prop(bone, 'bbone_handle_type_end', text="End Handle")
-                column.prop_search(bone, "bbone_custom_handle_end", armature, bone_list, text="Custom")
-        # Bone constraint options.
-        if armaturePanelOptions.displayContext == 'BONE_CONSTRAINT':
-            if context.mode == 'POSE':
-                column.separator()
-                column.operator_menu_enum('pose.constraint_add', 'type',text="Add Bone Constraint")
-                for constraint in poseBone.constraints:
-                    column.separator()
-                    columnRow = column.row(align=True)
-                    columnRow.prop(constraint, 'show_expanded', text="")
-                    columnRow.prop(constraint, 'name', text="")
-                    if constraint.mute:
-                        muteIcon = 'RESTRICT_VIEW_ON'
-                    else:
-                        muteIcon = 'RESTRICT_VIEW_OFF'
-                    columnRow.prop(constraint, 'mute', text="",icon=muteIcon)
-                    columnRow.operator('constraint.move_up', text="",icon='TRIA_UP')
-                    columnRow.operator('constraint.move_down', text="",icon='TRIA_DOWN')
-                    columnRow.operator('constraint.delete', text="",icon='X')
-                    if constraint.show_expanded:
-                        column.prop(constraint, 'target', text="")
-                        if constraint.target:
-                            if constraint.target.type == 'ARMATURE':
-                                column.prop_search(constraint, 'subtarget',constraint.target.data,'bones', text="")
-                        column.prop(constraint, 'influence')
-            else:
-                column.separator()
-                column.label(text="Must be in pose mode.")
-
-        # Shape to bone options.
-        if armaturePanelOptions.displayContext == 'SHAPE_TO_BONE':
-            if context.mode == 'POSE':
-                column.separator()
-                subColumn = column.column(align=True)
-                subColumn.active = bool(poseBone.custom_shape)
-                subColumn.scale_y = 1.5
-                subColumn.operator('pose.shape_to_bone', text="Align Custom Shape")
-                column.separator()
-                
-                # Display
-                column.label(text="Display:")
-                column.separator()
-                column.prop(poseBone, 'custom_shape', text="")
-                if poseBone.custom_shape:
-                    column.prop_search(poseBone, 'custom_shape_transform',object.pose, 'bones', text="")
-                columnSplit = column.split(align=True)
-                columnSplit.prop(bone, 'hide', text="Hide", toggle=True)
-                columnSplitRow = columnSplit.row(align=True)
-                columnSplitRow.active = bool(poseBone.custom_shape)
-                columnSplitRow.prop(bone, 'show_wire', text="Wireframe", toggle=True)
-            else:
-                column.separator()
-                column.label(text="Must be in pose mode.")
+    # Execute.
+    def execute(self, context):
+        """ Activate the bone and the tab. """
+        armatureObject = context.active_object
+        bones = armatureObject.data.bones
+        bone = bones.get(self.boneName)
+        if bone is None:
+            return {'CANCELLED'}
+        for otherBone in bones:
+            otherBone.select = False
+        bone.select = True
+        bones.active = bone
+        context.window_manager.armaturePanelSettings.displayContext = self.displayContext
+        if self.constraintIndex >= 0:
+            armatureObject.pose.bones[bone.name].armaturePanelConstraintIndex = self.constraintIndex
+        return {'FINISHED'}
+
+
+# Armature cache report operator class.
+class armatureCacheReportOperator(bpy.types.Operator):
+    """
+    Report the hits and misses of the armature cache.
+    """
+    # Main variables.
+    bl_idname = 'view3d.armature_panel_cache_report'
+    bl_label = 'Cache Report'
+    bl_description = ("Report the hits and misses of the armature cache and their average time.")
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute armatureCacheReport """
+        self.report({'INFO'}, armatureCacheReport())
+        return {'FINISHED'}
+
+# Profile export operator class.
+class profileExportOperator(bpy.types.Operator):
+    """
+    Export the profiling samples and statistics.
+    """
+    # Main variables.
+    bl_idname = 'view3d.armature_panel_profile_export'
+    bl_label = 'Export Profile'
+    bl_description = ("Export the profiling samples and statistics to JSON or CSV.")
+    
+    # File path.
+    filepath : StringProperty(name='File Path', description="Path of the expor"
+                              "ted file.", subtype='FILE_PATH')
+    
+    # File filter.
+    filter_glob : StringProperty(default='*.json;*.csv', options={'HIDDEN'})
+    
+    # File format.
+    fileFormat : EnumProperty(name='Format', description="File format of the e"
+                              "xport.",
+                              items=[('JSON', 'JSON', "Statistics and samples."),
+                                     ('CSV', 'CSV', "One row per sample.")],
+                              default='JSON')
+    
+    # Format extension.
+    def formatExtension(self):
+        """ Extension of the chosen file format. """
+        return ('.csv' if self.fileFormat == 'CSV' else '.json')
+    
+    # Format path.
+    def formatPath(self):
+        """ File path with its extension replaced by the chosen format's. """
+        base, extension = os.path.splitext(self.filepath)
+        if extension.lower() not in ('.json', '.csv'):
+            base = self.filepath
+        return (base + self.formatExtension())
+    
+    # Check.
+    def check(self, context):
+        """
+        Keep the chosen format's extension on the file path; True redraws the
+        browser.
+        """
+        filepath = self.formatPath()
+        if filepath != self.filepath:
+            self.filepath = filepath
+            return True
+        return False
+    
+    # Invoke.
+    def invoke(self, context, event):
+        """ Open the file browser on a file named after the blend file. """
+        if not self.filepath:
+            self.filepath = (os.path.splitext(bpy.data.filepath or 'untitled')[0]
+                             + self.formatExtension())
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    # Execute.
+    def execute(self, context):
+        """ Write the profile. """
+        import csv
+        import json
+        filepath = self.formatPath()
+        if self.fileFormat == 'CSV':
+            with open(filepath, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(('name', 'milliseconds', 'subject'))
+                for name, duration, subject in profileSamples:
+                    writer.writerow((name, (duration * 1000), subject))
+        else:
+            with open(filepath, 'w') as file:
+                json.dump({'statistics': profileStatistics(),
+                           'samples': list(profileSamples)}, file, indent=2)
+        self.report({'INFO'}, "Exported profile to {}".format(filepath))
+        return {'FINISHED'}
+
+
+# Profile reset operator class.
+class profileResetOperator(bpy.types.Operator):
+    """
+    Forget the profiling samples.
+    """
+    # Main variables.
+    bl_idname = 'view3d.armature_panel_profile_reset'
+    bl_label = 'Reset Profile'
+    bl_description = ("Forget every profiling sample and call count.")
+    
+    # Execute.
+    def execute(self, context):
+        """ Execute resetProfile """
+        resetProfile()
+        return {'FINISHED'}
+
+# ##### PROPERTY FUNCTIONS #####
+
+# Tree index update function.
+def treeIndexUpdate(self, context):
+    """ Make the bone clicked in the bone tree the active bone. """
+    bones = self.edit_bones if self.is_editmode else self.bones
+    if self.armaturePanelTreeIndex < len(bones):
+        bones.active = bones[self.armaturePanelTreeIndex]
+
+
+# Constraint index update function.
+def constraintIndexUpdate(self, context):
+    """ Make the constraint selected in the panel's list the active one. """
+    constraints = self.constraints
+    if 0 <= self.armaturePanelConstraintIndex < len(constraints):
+        constraints.active = constraints[self.armaturePanelConstraintIndex]
 
 
 # ##### REGISTER FUNCTIONS #####
 
-# Register function.
+# Armature cache handlers; (handler list, function), defined after every
+# handler it lists.
+armatureCacheHandlers = (
+    (bpy.app.handlers.depsgraph_update_post, armatureCacheDepsgraphUpdate),
+    (bpy.app.handlers.depsgraph_update_post, lintDepsgraphUpdate),
+    (bpy.app.handlers.undo_post, clearArmatureCache),
+    (bpy.app.handlers.redo_post, clearArmatureCache),
+    (bpy.app.handlers.load_post, armatureCacheLoad))
+
+
+# Interface state; the interface module once its classes are registered.
+interfaceState = {'module': None}
+# Interface owner; msgbus owner of the object mode subscription.
+interfaceOwner = object()
+# Interface modes; entering one of these registers the interface.
+interfaceModes = {'POSE', 'EDIT_ARMATURE'}
+
+
+# Register interface function.
+@profiled('registerInterface')
+def registerInterface():
+    """
+    Import the interface module and register its panels and lists; only the
+    first call does anything. Returns the interface module.
+    """
+    if interfaceState['module'] is None:
+        from . import interface
+        interface.register()
+        interfaceState['module'] = interface
+        bpy.msgbus.clear_by_owner(interfaceOwner)
+        windowManager = getattr(bpy.context, 'window_manager', None)
+        if windowManager:
+            # Assign names for completeness.
+            windowManager.armaturePanelSettings.name = 'Armature Panel'
+            windowManager.shapeToBoneSettings.name = 'Shape to Bone'
+    return interfaceState['module']
+
+
+# Interface mode function.
+def interfaceMode(*args):
+    """ Register the interface once pose or armature edit mode is entered. """
+    if getattr(bpy.context, 'mode', None) in interfaceModes:
+        registerInterface()
 
+
+# Interface load handler.
+@persistent
+def interfaceLoad(*args):
+    """
+    Files may open in pose mode; otherwise wait for the mode change again, as
+    loading a file drops msgbus subscriptions.
+    """
+    if interfaceState['module'] is None:
+        subscribeInterface()
+        interfaceMode()
+
+
+# Interface timer function.
+def interfaceTimer():
+    """ The add-on may be enabled in pose mode, where no mode change follows. """
+    interfaceMode()
+    return None
+
+
+# Subscribe interface function.
+def subscribeInterface():
+    """ Object mode changes register the interface. """
+    bpy.msgbus.clear_by_owner(interfaceOwner)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.Object, 'mode'),
+                             owner=interfaceOwner, args=(),
+                             notify=interfaceMode)
+
+
+# Register function.
+@profiled('register')
 def register():
-    bpy.utils.register_class(ARMATURE_PT_armaturePanel)
+    """
+    Register the core; operators, property groups, properties and cache
+    handlers. The panels and lists are registered on the first entry into pose
+    or armature edit mode and never in background sessions, which have no use
+    for them.
+    """
     bpy.utils.register_class(shapeToBoneOperator)
+    bpy.utils.register_class(shareShapesOperator)
+    bpy.utils.register_class(widgetOperator)
+    bpy.utils.register_class(shapeToBoneModalOperator)
+    bpy.utils.register_class(armatureCacheReportOperator)
+    bpy.utils.register_class(bulkConstraintOperator)
+    bpy.utils.register_class(treeToggleOperator)
+    bpy.utils.register_class(reparentOperator)
+    bpy.utils.register_class(lintOperator)
+    bpy.utils.register_class(lintJumpOperator)
+    bpy.utils.register_class(poseCaptureOperator)
+    bpy.utils.register_class(poseRemoveOperator)
+    bpy.utils.register_class(poseApplyOperator)
+    bpy.utils.register_class(selectionSetAddOperator)
+    bpy.utils.register_class(selectionSetRemoveOperator)
+    bpy.utils.register_class(selectionSetOperator)
+    bpy.utils.register_class(profileExportOperator)
+    bpy.utils.register_class(profileResetOperator)
+    bpy.utils.register_class(boneSearchOperator)
+    bpy.utils.register_class(boneGroupRulesOperator)
+    bpy.utils.register_class(boneGroupRuleEditOperator)
     bpy.utils.register_class(shapeToBonePropertyGroup)
+    bpy.utils.register_class(boneGroupRulePropertyGroup)
+    bpy.utils.register_class(poseSnapshotPropertyGroup)
+    bpy.utils.register_class(selectionSetPropertyGroup)
     bpy.utils.register_class(armaturePanelPropertyGroup)
 
     shapeToBoneProperties = bpy.props.PointerProperty(type=shapeToBonePropertyGroup)
@@ -455,29 +3381,110 @@ def register():
     windowManager = bpy.types.WindowManager
     windowManager.armaturePanelSettings = armaturePanelProperties
     windowManager.shapeToBoneSettings = shapeToBoneProperties
+    bpy.types.PoseBone.armaturePanelConstraintIndex = bpy.props.IntProperty(
+        name='Active Constraint', default=0, min=0,
+        update=constraintIndexUpdate)
+    bpy.types.Object.armaturePanelPoses = bpy.props.CollectionProperty(
+        type=poseSnapshotPropertyGroup)
+    bpy.types.Object.armaturePanelPoseIndex = bpy.props.IntProperty(
+        name='Active Pose', default=0, min=0)
+    bpy.types.Armature.armaturePanelTreeIndex = bpy.props.IntProperty(
+        name='Active Bone', default=0, min=0, update=treeIndexUpdate)
+    bpy.types.Armature.armaturePanelGroupRules = bpy.props.CollectionProperty(
+        type=boneGroupRulePropertyGroup)
+    bpy.types.Armature.armaturePanelGroupRuleIndex = bpy.props.IntProperty(
+        name='Active Rule', default=0, min=0)
+    bpy.types.Bone.armaturePanelBoneId = bpy.props.IntProperty(
+        name='Bone Id', description="Stable id of the bone in selection sets.",
+        default=0, min=0)
+    bpy.types.Armature.armaturePanelNextBoneId = bpy.props.IntProperty(
+        name='Next Bone Id', default=1, min=1)
+    bpy.types.Armature.armaturePanelSelectionSets = bpy.props.CollectionProperty(
+        type=selectionSetPropertyGroup)
+    bpy.types.Armature.armaturePanelSelectionSetIndex = bpy.props.IntProperty(
+        name='Active Selection Set', default=0, min=0)
 
-# Assign names for completeness.
-    bpy.context.window_manager.armaturePanelSettings.name = 'Armature Panel'
-    bpy.context.window_manager.shapeToBoneSettings.name = 'Shape to Bone'
+    # Armature cache invalidation.
+    for handlers, handler in armatureCacheHandlers:
+        handlers.append(handler)
+    subscribeArmatureCache()
 
+    # Lazy interface.
+    if not bpy.app.background:
+        bpy.app.handlers.load_post.append(interfaceLoad)
+        subscribeInterface()
+        bpy.app.timers.register(interfaceTimer, first_interval=0.0)
 
 
 # Unregister function.
-
+@profiled('unregister')
 def unregister():
     """ Unregister """
-    bpy.utils.unregister_class(ARMATURE_PT_armaturePanel)
+    
+    # Lazy interface.
+    if interfaceLoad in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(interfaceLoad)
+    if bpy.app.timers.is_registered(interfaceTimer):
+        bpy.app.timers.unregister(interfaceTimer)
+    bpy.msgbus.clear_by_owner(interfaceOwner)
+    if interfaceState['module'] is not None:
+        interfaceState['module'].unregister()
+        interfaceState['module'] = None
+    
     bpy.utils.unregister_class(shapeToBoneOperator)
+    bpy.utils.unregister_class(shareShapesOperator)
+    bpy.utils.unregister_class(widgetOperator)
+    bpy.utils.unregister_class(shapeToBoneModalOperator)
+    bpy.utils.unregister_class(armatureCacheReportOperator)
+    bpy.utils.unregister_class(bulkConstraintOperator)
+    bpy.utils.unregister_class(treeToggleOperator)
+    bpy.utils.unregister_class(reparentOperator)
+    bpy.utils.unregister_class(lintOperator)
+    bpy.utils.unregister_class(lintJumpOperator)
+    bpy.utils.unregister_class(poseCaptureOperator)
+    bpy.utils.unregister_class(poseRemoveOperator)
+    bpy.utils.unregister_class(poseApplyOperator)
+    bpy.utils.unregister_class(selectionSetAddOperator)
+    bpy.utils.unregister_class(selectionSetRemoveOperator)
+    bpy.utils.unregister_class(selectionSetOperator)
+    bpy.utils.unregister_class(profileExportOperator)
+    bpy.utils.unregister_class(profileResetOperator)
+    bpy.utils.unregister_class(boneSearchOperator)
+    bpy.utils.unregister_class(boneGroupRulesOperator)
+    bpy.utils.unregister_class(boneGroupRuleEditOperator)
     bpy.utils.unregister_class(shapeToBonePropertyGroup)
     bpy.utils.unregister_class(armaturePanelPropertyGroup)
+    bpy.utils.unregister_class(boneGroupRulePropertyGroup)
+    bpy.utils.unregister_class(poseSnapshotPropertyGroup)
+    bpy.utils.unregister_class(selectionSetPropertyGroup)
 
     # Main variables.
     windowManager = bpy.types.WindowManager
 
+    # Armature cache invalidation.
+    for handlers, handler in armatureCacheHandlers:
+        if handler in handlers:
+            handlers.remove(handler)
+    bpy.msgbus.clear_by_owner(msgbusOwner)
+    clearArmatureCache()
+    stopLiveAlign()
+    if bpy.app.timers.is_registered(lintTimer):
+        bpy.app.timers.unregister(lintTimer)
+
     # Delete window manager's property group references.
     try:
         del windowManager.armaturePanelSettings
         del windowManager.shapeToBoneSettings
+        del bpy.types.PoseBone.armaturePanelConstraintIndex
+        del bpy.types.Object.armaturePanelPoses
+        del bpy.types.Object.armaturePanelPoseIndex
+        del bpy.types.Armature.armaturePanelTreeIndex
+        del bpy.types.Armature.armaturePanelGroupRules
+        del bpy.types.Armature.armaturePanelGroupRuleIndex
+        del bpy.types.Bone.armaturePanelBoneId
+        del bpy.types.Armature.armaturePanelNextBoneId
+        del bpy.types.Armature.armaturePanelSelectionSets
+        del bpy.types.Armature.armaturePanelSelectionSetIndex
     except:
         pass
 
@@ -0,0 +1,295 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Headless shape to bone alignment and naming for many .blend files.
+
+Driver; fans the files out to a pool of background Blender processes:
+
+    python batch.py rigs/*.blend --blender /opt/blender/blender --jobs 8 \
+        --output-dir aligned --summary summary.json --prefix WGT-
+
+Worker; aligns a single file inside Blender:
+
+    blender -b rig.blend --python batch.py -- --worker --in-place --prefix WGT-
+"""
+
+#############
+## IMPORTS ##
+#############
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+# Result marker; prefixes the worker's JSON result line on stdout.
+resultMarker = 'ARMATURE_PANEL_RESULT '
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### ARGUMENT FUNCTIONS #####
+
+# Argument parser function.
+def argumentParser():
+    """ Options shared by the driver and the worker. """
+    parser = argparse.ArgumentParser(description="Align and name the custom sh"
+                                     "apes of every armature in .blend files.")
+    parser.add_argument('files', nargs='*', help="Rig .blend files (driver).")
+    parser.add_argument('--worker', action='store_true', help="Process the fil"
+                        "e Blender opened; used inside 'blender -b'.")
+    parser.add_argument('--blender', default='blender', help="Blender executab"
+                        "le used by the driver.")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Numb"
+                        "er of Blender processes run in parallel.")
+    parser.add_argument('--timeout', type=float, default=600.0, help="Seconds "
+                        "before a file is given up on.")
+    parser.add_argument('--summary', help="Write the JSON summary to this file"
+                        " instead of stdout.")
+    parser.add_argument('--output-dir', help="Save processed files to this dir"
+                        "ectory, keeping their paths relative to the common di"
+                        "rectory of the inputs.")
+    parser.add_argument('--in-place', action='store_true', help="Overwrite the"
+                        " processed files.")
+    parser.add_argument('--dry-run', action='store_true', help="Align without "
+                        "saving anything, to time or check the files.")
+    # Shape to bone options.
+    parser.add_argument('--prefix', default='', help="Prefix for shape names.")
+    parser.add_argument('--prefix-data-name', action='store_true', help="Prefi"
+                        "x the shape's object data name too.")
+    parser.add_argument('--include-armature-name', action='store_true',
+                        help="Include the armature name in shape names.")
+    parser.add_argument('--separator', default='-', help="Separates the armatu"
+                        "re and bone names.")
+    parser.add_argument('--no-name', action='store_true', help="Do not rename "
+                        "the custom shapes.")
+    parser.add_argument('--no-show-wire', action='store_true', help="Leave the"
+                        " bones' wire drawing unchanged.")
+    parser.add_argument('--no-wire-draw-type', action='store_true', help="Leav"
+                        "e the shapes' display type unchanged.")
+    parser.add_argument('--shared-shapes', action='store_true', help="Fit shar"
+                        "ed shapes through the bones instead of moving them.")
+    parser.add_argument('--mirror', action='store_true', help="Place right sid"
+                        "e shapes by mirroring their left side partners.")
+    return parser
+
+
+# Shape to bone arguments function.
+def shapeToBoneArguments(arguments):
+    """ The shape to bone and output options, as worker command line flags. """
+    flags = ['--prefix', arguments.prefix, '--separator', arguments.separator]
+    for name in ('prefix_data_name', 'include_armature_name', 'no_name',
+                 'no_show_wire', 'no_wire_draw_type', 'shared_shapes',
+                 'mirror', 'in_place', 'dry_run'):
+        if getattr(arguments, name):
+            flags.append('--' + name.replace('_', '-'))
+    return flags
+
+
+# ##### WORKER FUNCTIONS #####
+
+# Shape to bone options class.
+class shapeToBoneOptions:
+    """
+    Stand-in for shapeToBonePropertyGroup, so the add-on's alignment functions
+    run without registering the add-on.
+    """
+
+    # Init.
+    def __init__(self, arguments):
+        """ Options from the command line. """
+        self.showWire = not arguments.no_show_wire
+        self.wireDrawType = not arguments.no_wire_draw_type
+        self.nameShape = not arguments.no_name
+        self.prefixShapeName = arguments.prefix
+        self.prefixShapeDataName = arguments.prefix_data_name
+        self.includeArmatureName = arguments.include_armature_name
+        self.separateArmatureName = arguments.separator
+        self.shareShapes = arguments.shared_shapes
+        self.mirrorShapes = arguments.mirror
+
+
+# Load add-on function.
+def loadAddon():
+    """ Import the add-on that sits next to this script. """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    spec = importlib.util.spec_from_file_location(
+        'armaturePanel', os.path.join(directory, '__init__.py'),
+        submodule_search_locations=[directory])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Worker function.
+def worker(arguments):
+    """
+    Align the custom shapes of every armature in the open file, save it as
+    requested and print the result for the driver.
+    """
+
+    # Main variables.
+    import bpy
+    addon = loadAddon()
+    options = shapeToBoneOptions(arguments)
+    result = {'file': bpy.data.filepath, 'armatures': {}}
+    start = perf_counter()
+
+    # Align.
+    bpy.context.view_layer.update()
+    for object in bpy.data.objects:
+        if object.type == 'ARMATURE' and object.pose and not object.library:
+            result['armatures'][object.name] = addon.shapeToBones(
+                object, list(object.pose.bones), options)
+    result['align'] = (perf_counter() - start)
+
+    # Save.
+    if arguments.output_dir:
+        os.makedirs(arguments.output_dir, exist_ok=True)
+        filepath = os.path.join(arguments.output_dir,
+                                os.path.basename(bpy.data.filepath))
+        bpy.ops.wm.save_as_mainfile(filepath=filepath, copy=True)
+        result['saved'] = filepath
+    elif arguments.in_place:
+        bpy.ops.wm.save_mainfile()
+        result['saved'] = bpy.data.filepath
+    else:
+        result['saved'] = None
+    print(resultMarker + json.dumps(result))
+
+
+# ##### DRIVER FUNCTIONS #####
+
+# Output directories function.
+def outputDirectories(files, outputDirectory):
+    """
+    Directory each file is saved to; the files' paths relative to their common
+    directory are kept under outputDirectory, so equal file names in different
+    directories do not overwrite each other.
+    """
+    directories = [os.path.dirname(os.path.abspath(filepath))
+                   for filepath in files]
+    if not directories:
+        return {}
+    common = os.path.commonpath(directories)
+    return {filepath: os.path.normpath(os.path.join(
+            os.path.abspath(outputDirectory), os.path.relpath(directory, common)))
+            for filepath, directory in zip(files, directories)}
+
+
+# Check arguments function.
+def checkArguments(parser, arguments):
+    """
+    Exit with a usage error when the driver would save nothing, or save a file
+    more than once.
+    """
+    outputs = sum(1 for output in (arguments.output_dir, arguments.in_place,
+                                   arguments.dry_run) if output)
+    if outputs != 1:
+        parser.error("choose exactly one of --output-dir, --in-place and "
+                     "--dry-run")
+    paths = [os.path.normcase(os.path.abspath(filepath))
+             for filepath in arguments.files]
+    duplicates = sorted({path for path in paths if paths.count(path) > 1})
+    if duplicates:
+        parser.error("files given more than once: {}".format(
+                     ", ".join(duplicates)))
+
+# Process file function.
+def processFile(filepath, arguments, outputDirectory=None):
+    """
+    Run one background Blender process on a file, saving it to outputDirectory
+    when given; failures are reported in the result and never affect other
+    files.
+    """
+
+    # Main variables.
+    command = [arguments.blender, '-b', '--factory-startup', '-noaudio',
+               filepath, '--python-exit-code', '1', '--python',
+               os.path.abspath(__file__), '--', '--worker']
+    command += shapeToBoneArguments(arguments)
+    if outputDirectory:
+        command += ['--output-dir', outputDirectory]
+    result = {'file': filepath, 'ok': False}
+    start = perf_counter()
+
+    # Run.
+    try:
+        process = subprocess.run(command, stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT, universal_newlines=True,
+                                 timeout=arguments.timeout)
+    except (OSError, subprocess.TimeoutExpired) as error:
+        result['error'] = str(error)
+        result['time'] = (perf_counter() - start)
+        return result
+    result['time'] = (perf_counter() - start)
+    result['returncode'] = process.returncode
+
+    # Result line.
+    for line in process.stdout.splitlines():
+        if line.startswith(resultMarker):
+            result.update(json.loads(line[len(resultMarker):]))
+            result['ok'] = (process.returncode == 0)
+    if not result['ok']:
+        result['error'] = process.stdout[-4000:]
+    return result
+
+
+# Driver function.
+def driver(arguments):
+    """ Process every file in parallel and write the JSON summary. """
+    start = perf_counter()
+    directories = (outputDirectories(arguments.files, arguments.output_dir)
+                   if arguments.output_dir else {})
+    with ThreadPoolExecutor(max_workers=max(1, arguments.jobs)) as pool:
+        results = list(pool.map(lambda filepath: processFile(
+                                filepath, arguments, directories.get(filepath)),
+                                arguments.files))
+    summary = {'files': len(results),
+               'failed': sum(1 for result in results if not result['ok']),
+               'time': (perf_counter() - start),
+               'results': results}
+    if arguments.summary:
+        with open(arguments.summary, 'w') as file:
+            json.dump(summary, file, indent=2)
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+    return 1 if summary['failed'] else 0
+
+
+# Main function.
+def main():
+    """ Worker inside Blender, driver everywhere else. """
+    argv = sys.argv[(sys.argv.index('--') + 1):] if '--' in sys.argv else sys.argv[1:]
+    parser = argumentParser()
+    arguments = parser.parse_args(argv)
+    checkArguments(parser, arguments)
+    if arguments.worker:
+        worker(arguments)
+        return 0
+    return driver(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Reproducible benchmarks of the add-on on a synthetic rig, run headless:
+
+    blender -b --factory-startup --python benchmark.py -- --bones 2000 \
+        --depth 8 --constraints 3 --shapes unique --output results.json
+
+Pass --compare baseline.json to fail (exit code 1) when a timing regressed by
+more than --tolerance against an earlier run. The add-on's import and core
+registration are held to --import-budget and --register-budget the same way.
+"""
+
+#############
+## IMPORTS ##
+#############
+import argparse
+import json
+import os
+import resource
+import sys
+import tracemalloc
+from time import perf_counter
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from batch import loadAddon
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### RIG FUNCTIONS #####
+
+# Generate rig function.
+def generateRig(boneCount, depth, constraintCount, sharedShapes):
+    """
+    Synthetic armature object of boneCount bones in chains of depth bones, with
+    constraintCount constraints and a custom shape per pose bone; the shapes
+    share one mesh object when sharedShapes is set.
+    """
+
+    # Armature.
+    armature = bpy.data.armatures.new('BenchmarkRig')
+    armatureObject = bpy.data.objects.new('BenchmarkRig', armature)
+    bpy.context.scene.collection.objects.link(armatureObject)
+    bpy.context.view_layer.objects.active = armatureObject
+
+    # Bones.
+    bpy.ops.object.mode_set(mode='EDIT')
+    editBones = armature.edit_bones
+    for index in range(boneCount):
+        chain, link = divmod(index, depth)
+        editBone = editBones.new('bone_{:05d}{}'.format(index, ('.L', '.R', '')[chain % 3]))
+        editBone.head = ((chain * 0.1), 0.0, (link * 0.2))
+        editBone.tail = ((chain * 0.1), 0.0, ((link * 0.2) + 0.2))
+        if link:
+            editBone.parent = editBones[index - 1]
+    bpy.ops.object.mode_set(mode='POSE')
+
+    # Custom shapes.
+    mesh = bpy.data.meshes.new('WGT-benchmark')
+    mesh.from_pydata([(-0.5, 0.0, -0.5), (0.5, 0.0, -0.5), (0.5, 0.0, 0.5),
+                      (-0.5, 0.0, 0.5)], [(0, 1), (1, 2), (2, 3), (3, 0)], [])
+    sharedShape = bpy.data.objects.new('WGT-benchmark', mesh)
+    poseBones = armatureObject.pose.bones
+    for index, poseBone in enumerate(poseBones):
+        if sharedShapes:
+            poseBone.custom_shape = sharedShape
+        else:
+            poseBone.custom_shape = bpy.data.objects.new(
+                'WGT-' + poseBone.name, mesh.copy())
+
+        # Constraints.
+        for constraintIndex in range(constraintCount):
+            constraint = poseBone.constraints.new('COPY_ROTATION')
+            constraint.target = armatureObject
+            constraint.subtarget = poseBones[index - 1 - constraintIndex].name
+            constraint.influence = 0.5
+    armature.bones.active = armature.bones[0]
+    return armatureObject
+
+
+# ##### TIMING FUNCTIONS #####
+
+# Layout recorder class.
+class layoutRecorder:
+    """
+    Stands in for UILayout and everything it returns while a panel is drawn
+    headless; counts the calls so the draw's own Python cost can be timed.
+    """
+
+    # Init.
+    def __init__(self):
+        """ No calls recorded yet. """
+        self.__dict__['calls'] = 0
+
+    # Get attribute.
+    def __getattr__(self, name):
+        """ Every layout method records the call and returns the recorder. """
+        def call(*args, **kwargs):
+            self.__dict__['calls'] += 1
+            return self
+        return call
+
+    # Set attribute.
+    def __setattr__(self, name, value):
+        """ Layout and operator properties are ignored. """
+
+
+# Context stub class.
+class contextStub:
+    """ The members of bpy.context the add-on reads, for headless timing. """
+
+    # Init.
+    def __init__(self, armatureObject):
+        """ Pose mode on armatureObject with its active bone. """
+        self.object = armatureObject
+        self.active_object = armatureObject
+        self.active_bone = armatureObject.data.bones.active
+        self.mode = 'POSE'
+        self.window_manager = bpy.context.window_manager
+
+
+# UI list stub class.
+class uiListStub:
+    """ The members of a UIList that its filter_items reads. """
+    bitflag_filter_item = (1 << 30)
+
+    # Init.
+    def __init__(self, **filters):
+        """ No filter unless given, e.g. filter_name or filterType. """
+        self.filter_name = ''
+        self.use_filter_invert = False
+        self.filterType = 'ALL'
+        self.filterMuted = 'ALL'
+        self.__dict__.update(filters)
+
+
+# Operator stub class.
+class operatorStub:
+    """ The members of shapeToBoneOperator that its execute reads. """
+    compareTiming = False
+
+    # Report.
+    def report(self, type, message):
+        """ Reports are dropped. """
+
+
+# Resident memory function.
+def residentMemory():
+    """
+    Current resident set size of the process in kilobytes, unlike the peak
+    ru_maxrss; None where /proc is not available.
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            pages = int(file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return ((pages * resource.getpagesize()) // 1024)
+
+
+# Measure function.
+def measure(function, repeat):
+    """ Timing statistics of repeat calls of function, in milliseconds. """
+    samples = []
+    for index in range(repeat):
+        start = perf_counter()
+        function()
+        samples.append((perf_counter() - start) * 1000)
+    samples.sort()
+    return {'mean': (sum(samples) / len(samples)), 'min': samples[0],
+            'median': samples[len(samples) // 2], 'max': samples[-1],
+            'samples': len(samples)}
+
+
+# Run benchmarks function.
+def runBenchmarks(addon, arguments):
+    """ Every benchmark on a fresh synthetic rig; returns the results. """
+
+    # Registration; the core alone, as in background sessions, and with the
+    # interface a first entry into pose mode adds.
+    def registration():
+        addon.register()
+        addon.unregister()
+    def interfaceRegistration():
+        addon.register()
+        addon.registerInterface()
+        addon.unregister()
+    results = {'register': measure(registration, arguments.repeat),
+               'register.interface': measure(interfaceRegistration,
+                                             arguments.repeat)}
+    addon.register()
+    interface = addon.registerInterface()
+
+    # Rig.
+    start = perf_counter()
+    armatureObject = generateRig(arguments.bones, arguments.depth,
+                                 arguments.constraints,
+                                 (arguments.shapes == 'shared'))
+    results['generate'] = {'mean': ((perf_counter() - start) * 1000)}
+    context = contextStub(armatureObject)
+    windowManager = bpy.context.window_manager
+    armaturePanelOptions = windowManager.armaturePanelSettings
+    shapeToBoneOptions = windowManager.shapeToBoneSettings
+
+    # Panel draw per display context, with the armature cache on and off; the
+    # difference of the means is what the cache saves per redraw.
+    panel = layoutRecorder()
+    panel.__dict__['layout'] = layoutRecorder()
+    for displayContext in ('ARMATURE', 'BONE', 'BONE_CONSTRAINT',
+                           'SHAPE_TO_BONE'):
+        armaturePanelOptions.displayContext = displayContext
+        name = 'draw.' + displayContext
+        results[name] = measure(
+            lambda: interface.ARMATURE_PT_armaturePanel.drawPanel(panel, context),
+            arguments.repeat)
+        addon.armatureCacheState['enabled'] = False
+        try:
+            results[name + '.uncached'] = measure(
+                lambda: interface.ARMATURE_PT_armaturePanel.drawPanel(panel,
+                                                                      context),
+                arguments.repeat)
+        finally:
+            addon.armatureCacheState['enabled'] = True
+        results[name + '.cacheSaving'] = {'milliseconds': (
+            results[name + '.uncached']['mean'] - results[name]['mean'])}
+
+    # List filters; Blender only calls filter_items when a list is drawn in a
+    # real region, so they are timed directly.
+    constraintList = interface.ARMATURE_UL_constraintList
+    poseBone = armatureObject.pose.bones[0]
+    for name, listStub in (('filter.constraints', uiListStub()),
+                           ('filter.constraints.type',
+                            uiListStub(filterType='COPY_ROTATION',
+                                       filterMuted='UNMUTED'))):
+        results[name] = measure(
+            lambda: constraintList.filter_items(listStub, context, poseBone,
+                                                'constraints'),
+            arguments.repeat)
+    boneTree = interface.ARMATURE_UL_boneTree
+    armature = armatureObject.data
+    def treeRebuild():
+        addon.hierarchyCache.clear()
+        boneTree.filter_items(uiListStub(), context, armature, 'bones')
+    for name, function in (
+            ('filter.boneTree', lambda: boneTree.filter_items(
+                uiListStub(), context, armature, 'bones')),
+            ('filter.boneTree.rebuild', treeRebuild),
+            ('filter.boneTree.name', lambda: boneTree.filter_items(
+                uiListStub(filter_name='*_001*'), context, armature, 'bones'))):
+        results[name] = measure(function, arguments.repeat)
+
+    # Shape to bone operator per target.
+    for target in ('ACTIVE', 'ALL'):
+        shapeToBoneOptions.boneTarget = target
+        results['shapeToBone.' + target] = measure(
+            lambda: addon.shapeToBoneOperator.execute(operatorStub(), context),
+            arguments.repeat)
+
+    # Undo memory growth; current resident memory, since the peak was already
+    # raised by the rig and the draws, and Python allocations still held.
+    # Background sessions may have undo disabled.
+    memory = residentMemory()
+    tracemalloc.start()
+    try:
+        for index in range(arguments.repeat):
+            addon.shapeToBoneOperator.execute(operatorStub(), context)
+            bpy.ops.ed.undo_push(message="Benchmark")
+        resident = residentMemory()
+        results['undoMemory'] = {
+            'kilobytes': (None if memory is None else (resident - memory)),
+            'pythonKilobytes': (tracemalloc.get_traced_memory()[0] // 1024)}
+    except RuntimeError:
+        results['undoMemory'] = {'kilobytes': None, 'pythonKilobytes': None}
+    finally:
+        tracemalloc.stop()
+    addon.unregister()
+    return results
+
+
+# Compare function.
+def compare(results, baseline, tolerance):
+    """ Names of the timings whose mean regressed by more than tolerance. """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name, {}).get('mean')
+        if previous and result.get('mean', 0.0) > (previous * (1.0 + tolerance)):
+            regressions.append(name)
+    return regressions
+
+
+# Budget failures function.
+def budgetFailures(results, budgets):
+    """ Names of the timings whose mean exceeded their budget in milliseconds. """
+    return [name for name, budget in budgets.items()
+            if results[name]['mean'] > budget]
+
+
+# Main function.
+def main():
+    """ Run the benchmarks, write the results and compare to a baseline. """
+
+    # Arguments.
+    parser = argparse.ArgumentParser(description="Benchmark the add-on on a s"
+                                     "ynthetic rig.")
+    parser.add_argument('--bones', type=int, default=1000)
+    parser.add_argument('--depth', type=int, default=8, help="Bones per chain.")
+    parser.add_argument('--constraints', type=int, default=2, help="Constraint"
+                        "s per bone.")
+    parser.add_argument('--shapes', choices=('shared', 'unique'),
+                        default='unique')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help="Write the JSON results to this file.")
+    parser.add_argument('--compare', help="JSON results of an earlier run.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed "
+                        "slow-down against --compare, 0.2 is 20%%.")
+    parser.add_argument('--import-budget', type=float, default=250.0, help="Mi"
+                        "lliseconds the add-on's import may take.")
+    parser.add_argument('--register-budget', type=float, default=10.0, help="M"
+                        "illiseconds the core registration may take.")
+    argv = sys.argv[(sys.argv.index('--') + 1):] if '--' in sys.argv else []
+    arguments = parser.parse_args(argv)
+
+    # Run.
+    start = perf_counter()
+    addon = loadAddon()
+    importTime = ((perf_counter() - start) * 1000)
+    report = {'addon': list(addon.bl_info['version']),
+              'blender': bpy.app.version_string,
+              'config': {'bones': arguments.bones, 'depth': arguments.depth,
+                         'constraints': arguments.constraints,
+                         'shapes': arguments.shapes,
+                         'repeat': arguments.repeat},
+              'results': runBenchmarks(addon, arguments)}
+    report['results']['import'] = {'mean': importTime}
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    # Budgets.
+    failed = budgetFailures(report['results'],
+                            {'import': arguments.import_budget,
+                             'register': arguments.register_budget})
+    for name in failed:
+        print("Over budget: {} {:.3f} ms".format(
+              name, report['results'][name]['mean']))
+
+    # Compare.
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)
+        if baseline.get('config') != report['config']:
+            print("Baseline was run with a different configuration")
+            return 1
+        regressions = compare(report['results'], baseline['results'],
+                              arguments.tolerance)
+        for name in regressions:
+            print("Regression: {} {:.3f} ms -> {:.3f} ms".format(
+                  name, baseline['results'][name]['mean'],
+                  report['results'][name]['mean']))
+        return 1 if (regressions or failed) else 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,658 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Panels and lists of the add-on; imported and registered by registerInterface
+on the first entry into pose or armature edit mode, and never in background
+sessions. The operators are registered with the core so scripts can call them.
+"""
+
+#############
+## IMPORTS ##
+#############
+import bpy
+from bpy.props import *
+from . import (armatureCacheReport, boneHierarchy, bulkConstraints,
+               constraintTypeOptions, lintEntries, lintRows, panelData,
+               profileStatistics, profiled, treeRows)
+
+
+#############
+## CLASSES ##
+#############
+# ##### INTERFACE CLASSES #####
+
+# Bone group rule list class.
+class ARMATURE_UL_groupRuleList(bpy.types.UIList):
+    """
+    Bone group rules of the armature panel.
+    """
+    
+    # Draw item.
+    def draw_item(self, context, layout, data, item, icon, active_data,
+                  active_propname, index):
+        """ Draw a single rule row. """
+        row = layout.row(align=True)
+        row.prop(item, 'enabled', text="")
+        row.prop(item, 'groupName', text="", emboss=False, icon='GROUP_BONE')
+        row.label(text=item.bl_rna.properties['matchType'].enum_items[
+                  item.matchType].name)
+
+
+# Bone tree class.
+class ARMATURE_UL_boneTree(bpy.types.UIList):
+    """
+    Collapsible bone hierarchy; the rows come from the cached parent index
+    array, so only the expanded branches are drawn.
+    """
+    
+    # Draw item.
+    def draw_item(self, context, layout, data, item, icon, active_data,
+                  active_propname, index):
+        """ A bone row indented by its depth, with its expand toggle. """
+        tree = boneHierarchy(data)
+        row = layout.row(align=True)
+        if not self.filter_name:
+            for level in range(tree['depths'][index]):
+                row.separator()
+            if tree['children'].get(index):
+                row.operator('view3d.armature_panel_tree_toggle', text="",
+                             icon=('DISCLOSURE_TRI_DOWN' if item.name in
+                                   tree['expanded'] else 'DISCLOSURE_TRI_RIGHT'),
+                             emboss=False).boneName = item.name
+            else:
+                row.label(text="", icon='BLANK1')
+        row.label(text=item.name, icon='BONE_DATA')
+        if data.is_editmode:
+            row.operator('armature.armature_panel_reparent', text="",
+                         icon='LINKED', emboss=False).parentName = item.name
+    
+    # Filter items.
+    def filter_items(self, context, data, propname):
+        """ Visible rows in depth-first order; a flat list while filtering. """
+        if self.filter_name:
+            return (bpy.types.UI_UL_list.filter_items_by_name(
+                    self.filter_name, self.bitflag_filter_item,
+                    getattr(data, propname), 'name'), [])
+        return treeRows(boneHierarchy(data), self.bitflag_filter_item)
+
+
+# Constraint list class.
+class ARMATURE_UL_constraintList(bpy.types.UIList):
+    """
+    Constraint list for the armature panel; only the rows in view are drawn and
+    the list can be filtered by name, constraint type and muted state.
+    """
+    # Filter type.
+    filterType : EnumProperty(name='Type', description="Only show constraints "
+                              "of this type.", items=constraintTypeOptions,
+                              default='ALL')
+    # Filter muted.
+    filterMuted : EnumProperty(name='Muted', description="Filter constraints b"
+                               "y their muted state.",
+                               items=[('ALL', 'All', "Show muted and unmuted co"
+                                       "nstraints."),
+                                      ('MUTED', 'Muted', "Only show muted const"
+                                       "raints."),
+                                      ('UNMUTED', 'Unmuted', "Only show unmuted"
+                                       " constraints.")],
+                               default='ALL')
+    
+    # Draw item.
+    def draw_item(self, context, layout, data, item, icon, active_data,
+                  active_propname, index):
+        """ Draw a single constraint row. """
+        if item.mute:
+            muteIcon = 'RESTRICT_VIEW_ON'
+        else:
+            muteIcon = 'RESTRICT_VIEW_OFF'
+        row = layout.row(align=True)
+        row.prop(item, 'name', text="", emboss=False, icon='CONSTRAINT')
+        row.prop(item, 'mute', text="", emboss=False, icon=muteIcon)
+    
+    # Draw filter.
+    def draw_filter(self, context, layout):
+        """ Draw the name, type and muted filters. """
+        row = layout.row(align=True)
+        row.prop(self, 'filter_name', text="")
+        row.prop(self, 'use_filter_invert', text="", icon='ARROW_LEFTRIGHT')
+        row = layout.row(align=True)
+        row.prop(self, 'filterType', text="")
+        row.prop(self, 'filterMuted', text="")
+    
+    # Filter items.
+    def filter_items(self, context, data, propname):
+        """ Filter by name, type and muted state; the order is unchanged. """
+        
+        # Main variables.
+        constraints = getattr(data, propname)
+        visible = self.bitflag_filter_item
+        
+        # Name.
+        flags = bpy.types.UI_UL_list.filter_items_by_name(
+                    self.filter_name, visible, constraints, 'name')
+        if self.filterType == 'ALL' and self.filterMuted == 'ALL':
+            return flags, []
+        if not flags:
+            flags = [visible] * len(constraints)
+        
+        # Type, muted.
+        for index, constraint in enumerate(constraints):
+            if self.filterType != 'ALL' and constraint.type != self.filterType:
+                flags[index] &= ~visible
+            elif self.filterMuted != 'ALL' and (constraint.mute !=
+                                                (self.filterMuted == 'MUTED')):
+                flags[index] &= ~visible
+        return flags, []
+
+
+    # Armature panel class.
+class ARMATURE_PT_armaturePanel(bpy.types.Panel):
+    """
+    Armature panel for the add-on; space_view3d_armature.py
+    This panel is located in the 3D view's properties window, while in pose or
+    armature edit mode, decided to go with a unique design here.
+    """
+    # Main variables.
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_label = 'Armature'
+    bl_category = "Armature"
+    
+    # Poll.
+    @classmethod
+    def poll(cls, context):
+        """ poll; context.mode in {'POSE', 'EDIT_ARMATURE'}. """
+        return context.mode in {'POSE', 'EDIT_ARMATURE'}
+    
+    # Draw.
+    def draw(self, context):
+        """ Draw the panel; Blender checks the argument count of draw itself. """
+        self.drawPanel(context)
+    
+    # Draw panel.
+    @profiled(lambda self, context: ('draw.' + context.window_manager.
+                                     armaturePanelSettings.displayContext),
+              lambda self, context: (context.object.name + ':' + getattr(
+                                     context.active_bone, 'name', '')))
+    def drawPanel(self, context):
+        
+        # Main variables.
+        armaturePanelOptions = context.window_manager.armaturePanelSettings
+        object = context.object
+        panel = panelData(context)
+        armature = panel['armature']
+        bone = context.active_bone
+        poseBone = panel['poseBone']
+        
+        # Layout
+        layout = self.layout
+        column = layout.column(align=True)
+        
+        # Display options.
+        columnRow = column.row()
+        columnRow.prop(armaturePanelOptions, 'displayContext', text="",expand=True)
+        if armaturePanelOptions.progressLabel:
+            columnRow = column.row()
+            columnRow.enabled = False
+            columnRow.prop(armaturePanelOptions, 'progress', slider=True,
+                           text=(armaturePanelOptions.progressLabel + " (Esc to cancel)"))
+        if armaturePanelOptions.displayContext != 'ARMATURE' and not bone:
+            column.separator()
+            column.label(text="No active bone.")
+            return
+
+        # Armature options.
+        if armaturePanelOptions.displayContext == 'ARMATURE':
+            column.separator()
+            column.template_ID(object, 'data')
+            column.separator()
+            column.label(text="Skeleton:")
+            column.separator()
+            if context.mode == 'POSE':
+                columnRow = column.row()
+                columnRow.prop(armature, 'pose_position', text="")
+                column.separator()
+            column.prop(armature, 'layers', text="")
+            column.separator()
+            column.label(text="Display :")
+            column.separator()
+            column.prop(armature, 'display_type', text="")
+            columnSplit = column.split(align=True)
+            columnSplit.prop(armature, 'show_names', text="Names",toggle=True)
+            columnSplit.prop(armature, 'show_group_colors', text="Colors",toggle=True)
+            columnSplit = column.split(align=True)
+            columnSplit.prop(armature, 'show_axes', text="Axes",toggle=True)
+            if object:
+                columnSplit.prop(object, 'show_in_front', text="In Front",toggle=True)
+
+            columnSplit = column.split(align=True)
+            columnSplit.prop(armature, 'show_bone_custom_shapes',text="Shapes", toggle=True)
+
+            # Bone groups
+            boneGroups = object.pose.bone_groups.active
+            column.separator()
+            column.label(text="Bone Groups:")
+            column.separator()
+            if boneGroups:
+                rowCount = 4
+            else:
+                rowCount = 1
+            columnRow = column.row()
+            columnRow.template_list('UI_UL_list', 'bone_groups',
+                                    object.pose, 'bone_groups',
+                                    object.pose.bone_groups,
+                                    'active_index', rows=rowCount)
+            rowColumn = columnRow.column(align=True)
+            rowColumn.active = object.proxy is None
+            rowColumn.operator('pose.group_add', icon='ADD', text="")
+            rowColumn.operator('pose.group_remove', icon='REMOVE', text="")
+            rowColumn.menu('DATA_MT_bone_group_context_menu',icon='DOWNARROW_HLT', text="") #sav
+            if boneGroups:
+                rowColumn.separator()
+                rowColumn.operator('pose.group_move', icon='TRIA_UP',text="").direction = 'UP'
+                rowColumn.operator('pose.group_move', icon='TRIA_DOWN',text="").direction = 'DOWN'
+                rowColumn.separator()
+                columnSplit.active = object.proxy is None
+                columnSplit = column.split()
+                columnSplit.prop(boneGroups, 'color_set', text="")
+                if boneGroups.color_set:
+                    subSplit = columnSplit.split(align=True)
+                    subSplit.prop(boneGroups.colors, 'normal', text="")
+                    subSplit.prop(boneGroups.colors, 'select', text="")
+                    subSplit.prop(boneGroups.colors, 'active', text="")
+            column.separator()
+            columnRow = column.row()
+            columnRow.active = object.proxy is None
+            subRow = columnRow.row(align=True)
+            subRow.operator('pose.group_assign', text="Assign")
+            subRow.operator('pose.group_unassign', text="Remove")
+            subRow = columnRow.row(align=True)
+            subRow.operator('pose.group_select', text="Select")
+            subRow.operator('pose.group_deselect', text="Deselect")
+            
+            # Bone group rules.
+            if context.mode == 'POSE':
+                column.separator()
+                column.label(text="Group Rules:")
+                columnRow = column.row()
+                columnRow.template_list('ARMATURE_UL_groupRuleList', 'group_rules',
+                                        armature, 'armaturePanelGroupRules',
+                                        armature, 'armaturePanelGroupRuleIndex',
+                                        rows=3)
+                rowColumn = columnRow.column(align=True)
+                rowColumn.operator('view3d.armature_panel_group_rule_edit', icon='ADD', text="").action = 'ADD'
+                rowColumn.operator('view3d.armature_panel_group_rule_edit', icon='REMOVE', text="").action = 'REMOVE'
+                rules = armature.armaturePanelGroupRules
+                if 0 <= armature.armaturePanelGroupRuleIndex < len(rules):
+                    rule = rules[armature.armaturePanelGroupRuleIndex]
+                    subColumn = column.column(align=True)
+                    subColumn.prop_search(rule, 'groupName', object.pose, 'bone_groups', text="")
+                    subColumn.prop(rule, 'matchType', text="")
+                    if rule.matchType in {'GLOB', 'REGEX'}:
+                        subColumn.prop(rule, 'pattern', text="")
+                    elif rule.matchType == 'LAYER':
+                        subColumn.prop(rule, 'layer')
+                    else:
+                        subColumnRow = subColumn.row(align=True)
+                        subColumnRow.prop(rule, 'depthMin', text="Min")
+                        subColumnRow.prop(rule, 'depthMax', text="Max")
+                column.operator('pose.armature_panel_group_rules', text="Apply Rules")
+
+            # Pose store.
+            column.separator()
+            column.label(text="Poses:")
+            column.separator()
+            columnRow = column.row()
+            columnRow.template_list('UI_UL_list', 'armature_panel_poses',
+                                    object, 'armaturePanelPoses',
+                                    object, 'armaturePanelPoseIndex', rows=3)
+            rowColumn = columnRow.column(align=True)
+            rowColumn.operator('pose.armature_panel_pose_capture', icon='ADD', text="")
+            rowColumn.operator('pose.armature_panel_pose_remove', icon='REMOVE', text="")
+            rowColumn.operator('pose.armature_panel_pose_apply', icon='ZOOM_SELECTED', text="")
+            columnRow = column.row(align=True)
+            columnRow.prop_search(armaturePanelOptions, 'poseBlendName', object, 'armaturePanelPoses', text="")
+            columnRow.prop(armaturePanelOptions, 'poseBlendFactor', slider=True)
+            
+            # Selection sets.
+            column.separator()
+            column.label(text="Selection Sets:")
+            column.separator()
+            columnRow = column.row()
+            columnRow.template_list('UI_UL_list', 'armature_panel_selection_sets',
+                                    armature, 'armaturePanelSelectionSets',
+                                    armature, 'armaturePanelSelectionSetIndex', rows=3)
+            rowColumn = columnRow.column(align=True)
+            rowColumn.operator('pose.armature_panel_selection_set_add', icon='ADD', text="")
+            rowColumn.operator('pose.armature_panel_selection_set_remove', icon='REMOVE', text="")
+            columnRow = column.row(align=True)
+            for action, icon in (('SELECT', 'RESTRICT_SELECT_OFF'), ('DESELECT', 'RESTRICT_SELECT_ON'),
+                                 ('HIDE', 'HIDE_ON'), ('REVEAL', 'HIDE_OFF')):
+                columnRow.operator('pose.armature_panel_selection_set', text="", icon=icon).action = action
+            columnRow.prop_search(armaturePanelOptions, 'selectionSetOperand', armature, 'armaturePanelSelectionSets', text="")
+            columnRow = column.row(align=True)
+            for action in ('ASSIGN', 'UNION', 'INTERSECT', 'SUBTRACT'):
+                columnRow.operator('pose.armature_panel_selection_set', text=action.title()).action = action
+        
+        # Bone options.
+        if armaturePanelOptions.displayContext == 'BONE':
+            column.separator()
+            columnRow = column.row()
+            subRow = columnRow.row()
+            subRow.label(text="", icon='BONE_DATA')
+            columnRow.prop(bone, 'name', text="")
+            column.separator()
+        
+            # Relations
+            column.label(text="Relations:")
+            column.separator()
+            column.prop(bone, 'layers', text="")
+            column.separator()
+            if context.mode == 'POSE':
+                column.prop_search(poseBone, 'bone_group', object.pose,'bone_groups', text="")
+                column.prop(bone, 'use_relative_parent', toggle=True)
+            column.label(text="Parent: " + panel['parentName'])
+            column.template_list('ARMATURE_UL_boneTree', 'bone_tree', armature,
+                                 ('edit_bones' if armature.is_editmode else 'bones'),
+                                 armature, 'armaturePanelTreeIndex', rows=8)
+            if context.mode == 'EDIT_ARMATURE':
+                column.operator('armature.armature_panel_reparent',
+                                text="Clear Parent").parentName = ''
+            subColumn = column.column(align=True)
+            subColumn.active = bone.parent is not None
+            subColumn.prop(bone, 'use_connect', toggle=True)
+            columnSplit = column.split(align=True)
+            columnSplit.active = bone.parent is not None
+            columnSplit.prop(bone, 'use_inherit_rotation', toggle=True)
+            columnSplit.prop(bone, 'use_inherit_scale', toggle=True)
+            subColumn = column.column(align=True)
+            subColumn.active = not bone.parent or not bone.use_connect
+            subColumn.prop(bone, 'use_local_location', toggle=True)
+            column.separator()
+            
+            # Deform
+            column.prop(bone, 'use_deform', text="Deform:")
+            column.separator()
+            column = column.column(align=True)
+            column.active = bone.use_deform
+            column.prop(bone, 'use_envelope_multiply', text="Multiply",
+                        toggle=True)
+            column.prop(bone, 'envelope_distance', text="Distance")
+            column.prop(bone, 'envelope_weight', text="Weight")
+            column.separator()
+            column.prop(bone, 'head_radius', text="Head")
+            column.prop(bone, 'tail_radius', text="Tail")
+            column.separator()
+            column.prop(bone, 'bbone_segments', text="Segments")
+            column.prop(bone, 'bbone_easein', text="Ease In")
+            column.prop(bone, 'bbone_easeout', text="Ease Out")
+            if context.mode == 'POSE':
+                column.prop(bone, 'bbone_handle_type_start', text="Start Handle")
+                boneSearchRow(column, 'BBONE_START', bone.bbone_custom_handle_start, "Custom")
+                column.prop(bone, 'bbone_handle_type_end', text="End Handle")
+                boneSearchRow(column, 'BBONE_END', bone.bbone_custom_handle_end, "Custom")
+        # Bone constraint options.
+        if armaturePanelOptions.displayContext == 'BONE_CONSTRAINT':
+            if context.mode == 'POSE':
+                column.separator()
+                column.operator_menu_enum('pose.constraint_add', 'type',text="Add Bone Constraint")
+                column.prop(armaturePanelOptions, 'bulkConstraints', toggle=True)
+                column.separator()
+                
+                # Multi-bone.
+                if armaturePanelOptions.bulkConstraints:
+                    columnRow = column.row(align=True)
+                    columnRow.prop(armaturePanelOptions, 'bulkConstraintType', text="")
+                    columnRow.prop(armaturePanelOptions, 'bulkConstraintName', text="")
+                    matches = bulkConstraints(object, armaturePanelOptions.bulkConstraintType,
+                                              armaturePanelOptions.bulkConstraintName)
+                    column.label(text="{} constraints on {} bones".format(
+                                 sum(len(names) for matchBone, names in matches),
+                                 len(matches)))
+                    columnRow = column.row(align=True)
+                    columnRow.prop(armaturePanelOptions, 'bulkInfluence', slider=True)
+                    columnRow.operator('pose.armature_panel_bulk_constraints', text="Apply", icon='CHECKMARK').action = 'INFLUENCE'
+                    columnRow = column.row(align=True)
+                    columnRow.operator('pose.armature_panel_bulk_constraints', text="Mute", icon='RESTRICT_VIEW_ON').action = 'MUTE'
+                    columnRow.operator('pose.armature_panel_bulk_constraints', text="Unmute", icon='RESTRICT_VIEW_OFF').action = 'UNMUTE'
+                    columnRow = column.row(align=True)
+                    columnRow.prop_search(armaturePanelOptions, 'bulkSubtarget', armature, 'bones', text="")
+                    columnRow.operator('pose.armature_panel_bulk_constraints', text="Set").action = 'SUBTARGET'
+                    return
+                constraints = poseBone.constraints
+                columnRow = column.row()
+                columnRow.template_list('ARMATURE_UL_constraintList',
+                                        'constraints', poseBone, 'constraints',
+                                        poseBone, 'armaturePanelConstraintIndex',
+                                        rows=(5 if constraints else 1))
+                
+                # Active constraint.
+                activeIndex = poseBone.armaturePanelConstraintIndex
+                if 0 <= activeIndex < len(constraints):
+                    constraint = constraints[activeIndex]
+                    column.context_pointer_set('constraint', constraint)
+                    column.separator()
+                    columnRow = column.row(align=True)
+                    columnRow.prop(constraint, 'name', text="")
+                    if constraint.mute:
+                        muteIcon = 'RESTRICT_VIEW_ON'
+                    else:
+                        muteIcon = 'RESTRICT_VIEW_OFF'
+                    columnRow.prop(constraint, 'mute', text="",icon=muteIcon)
+                    columnRow.operator('constraint.move_up', text="",icon='TRIA_UP')
+                    columnRow.operator('constraint.move_down', text="",icon='TRIA_DOWN')
+                    columnRow.operator('constraint.delete', text="",icon='X')
+                    if hasattr(constraint, 'target'):
+                        column.prop(constraint, 'target', text="")
+                        if constraint.target:
+                            if constraint.target.type == 'ARMATURE':
+                                boneSearchRow(column, 'SUBTARGET', constraint.subtarget, "Bone")
+                    column.prop(constraint, 'influence')
+            else:
+                column.separator()
+                column.label(text="Must be in pose mode.")
+
+        # Shape to bone options.
+        if armaturePanelOptions.displayContext == 'SHAPE_TO_BONE':
+            if context.mode == 'POSE':
+                column.separator()
+                subColumn = column.column(align=True)
+                subColumn.active = bool(poseBone.custom_shape)
+                subColumn.scale_y = 1.5
+                subColumn.operator('pose.shape_to_bone', text="Align Custom Shape")
+                columnRow = column.row(align=True)
+                columnRow.prop(context.window_manager.shapeToBoneSettings,
+                               'boneTarget', expand=True)
+                columnRow = column.row(align=True)
+                columnRow.prop(context.window_manager.shapeToBoneSettings,
+                               'shareShapes', toggle=True)
+                columnRow.operator('pose.share_custom_shapes', text="Share Duplicates")
+                column.prop(context.window_manager.shapeToBoneSettings,
+                            'mirrorShapes', toggle=True)
+                column.prop(context.window_manager.shapeToBoneSettings,
+                            'liveAlign', toggle=True)
+                column.operator('pose.shape_to_bone_modal', text="Align in Background")
+                column.separator()
+                
+                # Widgets
+                column.label(text="Widgets:")
+                column.separator()
+                column.prop(context.window_manager.shapeToBoneSettings, 'widgetType', text="")
+                columnRow = column.row(align=True)
+                columnRow.prop(context.window_manager.shapeToBoneSettings, 'widgetRadius')
+                columnRow.prop(context.window_manager.shapeToBoneSettings, 'widgetResolution')
+                column.prop(context.window_manager.shapeToBoneSettings, 'widgetOffset')
+                column.operator('pose.armature_panel_widget', text="Assign to Selected")
+                column.separator()
+                
+                # Display
+                column.label(text="Display:")
+                column.separator()
+                column.prop(poseBone, 'custom_shape', text="")
+                if poseBone.custom_shape:
+                    boneSearchRow(column, 'SHAPE_TRANSFORM', poseBone.custom_shape_transform, "Transform")
+                columnSplit = column.split(align=True)
+                columnSplit.prop(bone, 'hide', text="Hide", toggle=True)
+                columnSplitRow = columnSplit.row(align=True)
+                columnSplitRow.active = bool(poseBone.custom_shape)
+                columnSplitRow.prop(bone, 'show_wire', text="Wireframe", toggle=True)
+            else:
+                column.separator()
+                column.prop(context.window_manager.shapeToBoneSettings,
+                            'liveAlign', toggle=True)
+                column.label(text="Must be in pose mode.")
+
+
+# Diagnostics panel class.
+class ARMATURE_PT_diagnostics(bpy.types.Panel):
+    """
+    Collapsible diagnostics of the armature panel; profiling statistics and the
+    armature cache.
+    """
+    # Main variables.
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_label = 'Diagnostics'
+    bl_category = "Armature"
+    bl_parent_id = 'ARMATURE_PT_armaturePanel'
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    # Draw.
+    def draw(self, context):
+        """ Draw the profiling statistics. """
+        
+        # Main variables.
+        armaturePanelOptions = context.window_manager.armaturePanelSettings
+        layout = self.layout
+        column = layout.column(align=True)
+        
+        # Profiling.
+        columnRow = column.row(align=True)
+        columnRow.prop(armaturePanelOptions, 'profiling', toggle=True)
+        columnRow.operator('view3d.armature_panel_profile_reset', text="", icon='X')
+        columnRow.operator('view3d.armature_panel_profile_export', text="", icon='EXPORT')
+        column.separator()
+        for name, statistics in profileStatistics().items():
+            box = column.box()
+            box.label(text="{}: {} calls".format(name, statistics['calls']))
+            box.label(text="p50 {:.3f} ms, p99 {:.3f} ms".format(
+                      statistics['p50'], statistics['p99']))
+            if statistics['worst'] and statistics['worst'][0][1]:
+                box.label(text="Worst: {} ({:.3f} ms)".format(
+                          statistics['worst'][0][1], statistics['worst'][0][0]))
+        
+        # Armature cache.
+        column.separator()
+        column.label(text=armatureCacheReport())
+
+
+# Lint panel class.
+class ARMATURE_PT_lint(bpy.types.Panel):
+    """
+    Rig check results of the armature panel; clicking a result jumps to the
+    bone and tab.
+    """
+    # Main variables.
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_label = 'Rig Check'
+    bl_category = "Armature"
+    bl_parent_id = 'ARMATURE_PT_armaturePanel'
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    # Poll.
+    @classmethod
+    def poll(cls, context):
+        """ poll; context.mode == 'POSE'. """
+        return context.mode == 'POSE'
+    
+    # Draw.
+    def draw(self, context):
+        """ Draw the cached results; draw never runs the checks. """
+        
+        # Main variables.
+        armaturePanelOptions = context.window_manager.armaturePanelSettings
+        layout = self.layout
+        column = layout.column(align=True)
+        columnRow = column.row(align=True)
+        columnRow.operator('pose.armature_panel_lint', text="Check", icon='CHECKMARK')
+        columnRow.operator('pose.armature_panel_lint', text="", icon='FILE_REFRESH').full = True
+        columnRow.prop(armaturePanelOptions, 'lintContinuous', toggle=True)
+        entry = lintEntries.get(context.object.as_pointer())
+        if entry is None:
+            return
+        
+        # Results.
+        column.separator()
+        column.label(text="{} bones with issues".format(len(entry['results'])))
+        rows = lintRows(entry)
+        for name, displayContext, text, constraintIndex in rows[:50]:
+            jump = column.operator('pose.armature_panel_lint_jump', text=text,
+                                   icon='ERROR', emboss=False)
+            jump.boneName = name
+            jump.displayContext = displayContext
+            jump.constraintIndex = constraintIndex
+        if len(rows) > 50:
+            column.label(text="...")
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### DRAW FUNCTIONS #####
+
+# Bone search row function.
+def boneSearchRow(layout, field, value, label):
+    """
+    Bone field drawn as the indexed bone search, showing the current bone, with
+    a button to empty it; replaces prop_search, which scans every bone.
+    """
+    name = getattr(value, 'name', value)
+    row = layout.row(align=True)
+    row.operator('pose.armature_panel_bone_search', text=(name or label),
+                 icon='BONE_DATA' if name else 'VIEWZOOM').field = field
+    if name:
+        clearOperator = row.operator('pose.armature_panel_bone_search', text="",
+                                     icon='X')
+        clearOperator.field = field
+        clearOperator.clear = True
+
+
+# ##### REGISTER FUNCTIONS #####
+
+# Register function.
+def register():
+    """ Register the interface classes. """
+    bpy.utils.register_class(ARMATURE_UL_groupRuleList)
+    bpy.utils.register_class(ARMATURE_UL_boneTree)
+    bpy.utils.register_class(ARMATURE_UL_constraintList)
+    bpy.utils.register_class(ARMATURE_PT_armaturePanel)
+    bpy.utils.register_class(ARMATURE_PT_lint)
+    bpy.utils.register_class(ARMATURE_PT_diagnostics)
+
+
+# Unregister function.
+def unregister():
+    """ Unregister the interface classes. """
+    bpy.utils.unregister_class(ARMATURE_UL_groupRuleList)
+    bpy.utils.unregister_class(ARMATURE_UL_boneTree)
+    bpy.utils.unregister_class(ARMATURE_UL_constraintList)
+    bpy.utils.unregister_class(ARMATURE_PT_diagnostics)
+    bpy.utils.unregister_class(ARMATURE_PT_lint)
+    bpy.utils.unregister_class(ARMATURE_PT_armaturePanel)
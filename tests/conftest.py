@@ -0,0 +1,56 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Installs the bpy stand-in before collection, since the add-on directory is
+itself a package, and again for every test through the session fixture.
+"""
+
+#############
+## IMPORTS ##
+#############
+import sys
+
+import pytest
+
+from standin import addonName, fakeBpy, loadAddon
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### FIXTURE FUNCTIONS #####
+
+# Session fixture function.
+@pytest.fixture(params=[True, False], ids=['background', 'interactive'])
+def session(request, monkeypatch):
+    """ Fake bpy, the add-on and its import time for either kind of session. """
+    modules = fakeBpy(request.param)
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    addon, importTime = loadAddon()
+    yield modules['bpy'], addon, importTime
+    for name in [name for name in sys.modules
+                 if name == addonName or name.startswith(addonName + '.')]:
+        del sys.modules[name]
+
+
+##########
+## MAIN ##
+##########
+sys.modules.update(fakeBpy(True))
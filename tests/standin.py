@@ -0,0 +1,165 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Minimal stand-in for bpy so the add-on imports outside Blender. It imports
+nothing beyond the standard library, so a fresh interpreter can time a cold
+import of the add-on with it.
+"""
+
+#############
+## IMPORTS ##
+#############
+import importlib.util
+import os
+import sys
+import types
+from time import perf_counter
+
+
+###############
+## CONSTANTS ##
+###############
+# Add-on directory.
+addonDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Add-on module name.
+addonName = 'armaturePanel'
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### STAND-IN FUNCTIONS #####
+
+# Stand-in class.
+class standIn:
+    """ Any attribute, item or call of it is another stand-in. """
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return standIn()
+
+    def __getitem__(self, key):
+        return standIn()
+
+    def __call__(self, *args, **keywords):
+        return standIn()
+
+    def __iter__(self):
+        return iter(())
+
+    def __bool__(self):
+        return False
+
+
+# Stand-in type class.
+class standInType(type):
+    """ Blender types; unknown class attributes are stand-ins. """
+
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return standIn()
+
+
+# Fake bpy function.
+def fakeBpy(background):
+    """
+    Module objects for bpy and its submodules, recording registered
+    classes, handlers, timers and msgbus subscriptions.
+    """
+    bpy = types.ModuleType('bpy')
+
+    # Types.
+    bpyTypes = types.ModuleType('bpy.types')
+    typeCache = {}
+    def typeAttribute(name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name not in typeCache:
+            typeCache[name] = standInType(name, (), {})
+        return typeCache[name]
+    bpyTypes.__getattr__ = typeAttribute
+
+    # Properties.
+    bpyProps = types.ModuleType('bpy.props')
+    bpyProps.__all__ = ['BoolProperty', 'BoolVectorProperty',
+                        'CollectionProperty', 'EnumProperty', 'FloatProperty',
+                        'FloatVectorProperty', 'IntProperty',
+                        'IntVectorProperty', 'PointerProperty',
+                        'StringProperty']
+    for name in bpyProps.__all__:
+        setattr(bpyProps, name, lambda **keywords: keywords)
+
+    # Classes.
+    registered = []
+    def registerClass(cls):
+        assert cls not in registered, cls
+        registered.append(cls)
+    bpy.utils = types.SimpleNamespace(register_class=registerClass,
+                                      unregister_class=registered.remove)
+
+    # Handlers, timers and msgbus.
+    handlers = types.ModuleType('bpy.app.handlers')
+    for name in ('depsgraph_update_post', 'load_post', 'load_pre',
+                 'redo_post', 'save_post', 'save_pre', 'undo_post'):
+        setattr(handlers, name, [])
+    handlers.persistent = lambda function: function
+    timers = {}
+    bpy.app = types.SimpleNamespace(
+        background=background, handlers=handlers, version=(2, 80, 0),
+        timers=types.SimpleNamespace(
+            register=lambda function, first_interval=0.0, persistent=False:
+                timers.__setitem__(function, first_interval),
+            unregister=timers.pop, is_registered=timers.__contains__))
+    subscriptions = []
+    def clearByOwner(owner):
+        subscriptions[:] = [subscription for subscription in subscriptions
+                            if subscription['owner'] is not owner]
+    bpy.msgbus = types.SimpleNamespace(subscribe_rna=lambda **keywords:
+                                       subscriptions.append(keywords),
+                                       clear_by_owner=clearByOwner)
+
+    bpy.types = bpyTypes
+    bpy.props = bpyProps
+    bpy.context = standIn()
+    bpy.data = standIn()
+    bpy.ops = standIn()
+    bpy.registered = registered
+    bpy.timers = timers
+    bpy.subscriptions = subscriptions
+
+    return {'bpy': bpy, 'bpy.types': bpyTypes, 'bpy.props': bpyProps,
+            'bpy.app': bpy.app, 'bpy.app.handlers': handlers}
+
+
+# Load add-on function.
+def loadAddon():
+    """ Freshly imported add-on module and the import time in milliseconds. """
+    for name in [name for name in sys.modules
+                 if name == addonName or name.startswith(addonName + '.')]:
+        del sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        addonName, os.path.join(addonDirectory, '__init__.py'),
+        submodule_search_locations=[addonDirectory])
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[addonName] = addon
+    start = perf_counter()
+    spec.loader.exec_module(addon)
+    return addon, (perf_counter() - start) * 1000.0
@@ -0,0 +1,73 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Argument checks and output layout of the batch driver; neither needs Blender.
+"""
+
+#############
+## IMPORTS ##
+#############
+import os
+import sys
+
+import pytest
+
+from standin import addonDirectory
+
+sys.path.insert(0, addonDirectory)
+import batch
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### TEST FUNCTIONS #####
+
+# Output choice test function.
+@pytest.mark.parametrize('flags', [[], ['--in-place', '--dry-run'],
+                                   ['--output-dir', 'out', '--in-place']])
+def test_output_choice(flags, monkeypatch):
+    """ The driver refuses to run unless exactly one output is chosen. """
+    monkeypatch.setattr(sys, 'argv', ['batch.py', 'rig.blend'] + flags)
+    with pytest.raises(SystemExit) as raised:
+        batch.main()
+    assert raised.value.code == 2
+
+
+# Duplicate test function.
+def test_duplicates(monkeypatch):
+    """ The same file given twice is refused. """
+    monkeypatch.setattr(sys, 'argv', ['batch.py', 'rig.blend', './rig.blend',
+                                      '--dry-run'])
+    with pytest.raises(SystemExit) as raised:
+        batch.main()
+    assert raised.value.code == 2
+
+
+# Output directories test function.
+def test_output_directories(tmp_path):
+    """ Equal file names in different directories keep apart. """
+    files = [str(tmp_path / 'a' / 'rig.blend'), str(tmp_path / 'b' / 'rig.blend'),
+             str(tmp_path / 'a' / 'c' / 'arm.blend')]
+    output = str(tmp_path / 'out')
+    directories = batch.outputDirectories(files, output)
+    assert directories == {files[0]: os.path.join(output, 'a'),
+                           files[1]: os.path.join(output, 'b'),
+                           files[2]: os.path.join(output, 'a', 'c')}
+    assert batch.outputDirectories(files[:1], output) == {files[0]: output}
@@ -0,0 +1,84 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Panel data served by the armature cache, with the cache on and off, and the
+cached Rig Check rows.
+"""
+
+#############
+## IMPORTS ##
+#############
+import types
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### HELPER FUNCTIONS #####
+
+# Pose context function.
+def poseContext():
+    """ Pose mode context on an armature whose active bone has a parent. """
+    parent = types.SimpleNamespace(name='spine', parent=None)
+    bone = types.SimpleNamespace(name='hand.L', parent=parent)
+    lookups = []
+    def getPoseBone(name):
+        lookups.append(name)
+        return types.SimpleNamespace(name=name)
+    armature = types.SimpleNamespace(as_pointer=lambda: 2)
+    armatureObject = types.SimpleNamespace(
+        as_pointer=lambda: 1, data=armature,
+        pose=types.SimpleNamespace(bones=types.SimpleNamespace(get=getPoseBone)))
+    return types.SimpleNamespace(object=armatureObject, active_bone=bone,
+                                 mode='POSE'), lookups
+
+
+# ##### TEST FUNCTIONS #####
+
+# Panel data test function.
+def test_panel_data(session):
+    """ Redraws are served from the cache unless it is switched off. """
+    bpy, addon, importTime = session
+    context, lookups = poseContext()
+    first = addon.panelData(context)
+    second = addon.panelData(context)
+    assert first is second and len(lookups) == 1
+    assert second['poseBone'].name == 'hand.L'
+    assert second['parentName'] == 'spine'
+    addon.armatureCacheState['enabled'] = False
+    try:
+        addon.panelData(context)
+        addon.panelData(context)
+    finally:
+        addon.armatureCacheState['enabled'] = True
+    assert len(lookups) == 3
+    assert addon.armatureCacheReport().startswith("Cache: 1 hits")
+
+
+# Lint rows test function.
+def test_lint_rows(session):
+    """ Rows are sorted by bone name and kept until the results change. """
+    bpy, addon, importTime = session
+    entry = {'results': {'b': [('BONE', "second", -1)],
+                         'a': [('BONE_CONSTRAINT', "first", 0)]},
+             'rows': None}
+    rows = addon.lintRows(entry)
+    assert rows == [('a', 'BONE_CONSTRAINT', "a: first", 0),
+                    ('b', 'BONE', "b: second", -1)]
+    assert addon.lintRows(entry) is rows
@@ -0,0 +1,147 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Event handling of the chunked modal executor, driven with stand-in events, a
+stand-in timer and a window manager that records the progress calls.
+"""
+
+#############
+## IMPORTS ##
+#############
+import types
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### HELPER FUNCTIONS #####
+
+# Counting operator function.
+def countingOperator(addon, count):
+    """ Chunked operator over count items that records what it did. """
+
+    # Counting operator class.
+    class countingOperator(addon.chunkedOperator):
+        """ Records the processed indices, rollback and finish. """
+        bl_label = 'Count'
+        chunkBudget = 10.0
+
+        # Prepare.
+        def prepare(self, context):
+            """ Reset the record; returns count. """
+            self.processed = []
+            self.rolledBack = False
+            self.finished = False
+            return count
+
+        # Process.
+        def process(self, context, index):
+            """ Record the index. """
+            self.processed.append(index)
+
+        # Rollback.
+        def rollback(self, context):
+            """ Record the rollback. """
+            self.rolledBack = True
+
+        # Finish.
+        def finish(self, context):
+            """ Record the finish. """
+            self.finished = True
+
+        # Report.
+        def report(self, kind, message):
+            """ Ignore reports. """
+
+    return countingOperator()
+
+
+# Context function.
+def fakeContext():
+    """ Context whose window manager hands out a stand-in timer. """
+    timer = types.SimpleNamespace(time_duration=0.0)
+    windowManager = types.SimpleNamespace(
+        event_timer_add=lambda interval, window=None: timer,
+        event_timer_remove=lambda removed: None,
+        modal_handler_add=lambda operator: None,
+        progress_begin=lambda start, end: None,
+        progress_update=lambda value: None,
+        progress_end=lambda: None,
+        armaturePanelSettings=types.SimpleNamespace(progress=0.0,
+                                                    progressLabel=''))
+    return types.SimpleNamespace(window=None, window_manager=windowManager,
+                                 screen=types.SimpleNamespace(areas=[])), timer
+
+
+# Event function.
+def event(eventType):
+    """ Stand-in event of a type. """
+    return types.SimpleNamespace(type=eventType)
+
+
+# ##### TEST FUNCTIONS #####
+
+# Swallow test function.
+def test_swallow(session):
+    """ Undo, edit and mode events are swallowed while the work runs. """
+    bpy, addon, importTime = session
+    operator = countingOperator(addon, 3)
+    context, timer = fakeContext()
+    assert operator.invoke(context, event('LEFTMOUSE')) == {'RUNNING_MODAL'}
+    for eventType in ('Z', 'X', 'DEL', 'TAB', 'LEFTMOUSE', 'RET'):
+        assert operator.modal(context, event(eventType)) == {'RUNNING_MODAL'}
+    assert operator.modal(context, event('MIDDLEMOUSE')) == {'PASS_THROUGH'}
+    assert not operator.processed
+
+
+# Timer test function.
+def test_timer(session):
+    """ Only ticks of the own timer process a chunk. """
+    bpy, addon, importTime = session
+    operator = countingOperator(addon, 3)
+    context, timer = fakeContext()
+    operator.invoke(context, event('LEFTMOUSE'))
+    assert operator.modal(context, event('TIMER')) == {'PASS_THROUGH'}
+    assert operator.modal(context, event('TIMER_REPORT')) == {'PASS_THROUGH'}
+    assert not operator.processed
+    timer.time_duration += 0.01
+    assert operator.modal(context, event('TIMER')) == {'FINISHED'}
+    assert operator.processed == [0, 1, 2] and operator.finished
+
+
+# Cancel test function.
+def test_cancel(session):
+    """ Esc rolls back. """
+    bpy, addon, importTime = session
+    operator = countingOperator(addon, 3)
+    context, timer = fakeContext()
+    operator.invoke(context, event('LEFTMOUSE'))
+    assert operator.modal(context, event('ESC')) == {'CANCELLED'}
+    assert operator.rolledBack and not operator.finished
+
+
+# Execute test function.
+def test_execute(session):
+    """ Execute processes every item synchronously. """
+    bpy, addon, importTime = session
+    operator = countingOperator(addon, 5)
+    context, timer = fakeContext()
+    assert operator.execute(context) == {'FINISHED'}
+    assert operator.processed == [0, 1, 2, 3, 4] and operator.finished
+    assert addon.shapeToBoneModalOperator.execute is addon.chunkedOperator.execute
@@ -0,0 +1,143 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+"""
+Vectorized matrix reads and decomposition against a reference port of
+mathutils' to_translation(), to_euler() and to_scale(), including gimbal lock
+and negative scale.
+"""
+
+#############
+## IMPORTS ##
+#############
+import math
+
+import numpy
+import pytest
+
+
+###############
+## CONSTANTS ##
+###############
+# Transforms; (location, XYZ euler, scale) that the matrices are built from.
+transforms = [((1.0, 2.0, 3.0), (0.3, -0.7, 1.2), (1.0, 2.0, 0.5)),
+              ((0.0, 0.0, 0.0), (2.9, 1.2, 2.9), (1.0, 1.0, 1.0)),
+              ((-4.0, 0.5, 2.0), (0.4, (math.pi / 2), 0.3), (1.5, 1.5, 1.5)),
+              ((0.0, 1.0, 0.0), (-0.4, -(math.pi / 2), -0.3), (1.0, 2.0, 3.0)),
+              ((2.0, -1.0, 0.0), (0.2, 0.1, -0.6), (-1.0, -1.0, 1.0)),
+              ((0.5, 0.5, 0.5), (1.0, -0.5, 0.25), (1.0, 1.0, -2.0))]
+# Tolerance; matrices are float32, as read from Blender.
+tolerance = 2e-5
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### HELPER FUNCTIONS #####
+
+# Compose function.
+def compose(location, euler, scale):
+    """ Row-major 4x4 matrix of a location, XYZ euler rotation and scale. """
+    x, y, z = euler
+    rotationX = numpy.array([[1, 0, 0], [0, math.cos(x), -math.sin(x)],
+                             [0, math.sin(x), math.cos(x)]])
+    rotationY = numpy.array([[math.cos(y), 0, math.sin(y)], [0, 1, 0],
+                             [-math.sin(y), 0, math.cos(y)]])
+    rotationZ = numpy.array([[math.cos(z), -math.sin(z), 0],
+                             [math.sin(z), math.cos(z), 0], [0, 0, 1]])
+    matrix = numpy.identity(4)
+    matrix[:3, :3] = (rotationZ @ rotationY @ rotationX) * numpy.array(scale)
+    matrix[:3, 3] = location
+    return matrix
+
+
+# Reference function.
+def reference(matrix):
+    """
+    Location, XYZ euler and scale of a row-major matrix, following mathutils'
+    mat3_normalized_to_eul one element at a time.
+    """
+    columns = [[float(matrix[row][column]) for row in range(3)]
+               for column in range(3)]
+    scale = [math.sqrt(sum(value * value for value in column))
+             for column in columns]
+    m = [[(value / length) for value in column]
+         for column, length in zip(columns, scale)]
+    cy = math.hypot(m[0][0], m[0][1])
+    if cy > (16 * numpy.finfo(numpy.float32).eps):
+        first = (math.atan2(m[1][2], m[2][2]), math.atan2(-m[0][2], cy),
+                 math.atan2(m[0][1], m[0][0]))
+        second = (math.atan2(-m[1][2], -m[2][2]), math.atan2(-m[0][2], -cy),
+                  math.atan2(-m[0][1], -m[0][0]))
+    else:
+        first = second = (math.atan2(-m[2][1], m[1][1]),
+                          math.atan2(-m[0][2], cy), 0.0)
+    euler = (first if sum(map(abs, first)) <= sum(map(abs, second))
+             else second)
+    return [float(matrix[row][3]) for row in range(3)], list(euler), scale
+
+
+# Collection function.
+def collection(matrices):
+    """ Stand-in collection whose foreach_get reads column-major matrices. """
+    class matrixCollection(list):
+        def foreach_get(self, attribute, buffer):
+            buffer[:] = numpy.concatenate([numpy.asarray(matrix).T.ravel()
+                                           for matrix in self])
+    return matrixCollection(matrices)
+
+
+# ##### TEST FUNCTIONS #####
+
+# Decompose test function.
+@pytest.mark.parametrize('location, euler, scale', transforms)
+def test_decompose(session, location, euler, scale):
+    """ Every transform decomposes like the mathutils reference. """
+    bpy, addon, importTime = session
+    matrix = compose(location, euler, scale).astype(numpy.float32)
+    result = addon.decomposeMatrices(matrix[numpy.newaxis])
+    expected = reference(matrix)
+    for values, expectedValues in zip(result, expected):
+        assert values.dtype == numpy.float32
+        assert numpy.allclose(values[0], expectedValues, atol=tolerance)
+    if numpy.linalg.det(matrix[:3, :3]) > 0:
+        assert numpy.allclose(compose(*[values[0] for values in result]),
+                              matrix, atol=tolerance)
+
+
+# Smaller solution test function.
+def test_smaller_solution(session):
+    """ Of the two equivalent rotations the one with smaller angles is kept. """
+    bpy, addon, importTime = session
+    matrix = compose((0.0, 0.0, 0.0), (2.9, 1.2, 2.9), (1.0, 1.0, 1.0))
+    location, euler, scale = addon.decomposeMatrices(
+        matrix.astype(numpy.float32)[numpy.newaxis])
+    assert numpy.allclose(euler[0], ((2.9 - math.pi), (math.pi - 1.2),
+                                     (2.9 - math.pi)), atol=tolerance)
+
+
+# Matrix array test function.
+def test_matrix_array(session):
+    """ Column-major foreach_get data is returned row-major, one per item. """
+    bpy, addon, importTime = session
+    matrices = [compose(*transform) for transform in transforms]
+    result = addon.matrixArray(collection(matrices), 'matrix')
+    assert result.shape == (len(transforms), 4, 4)
+    assert result.dtype == numpy.float32
+    assert numpy.allclose(result, numpy.array(matrices), atol=tolerance)
@@ -0,0 +1,77 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+"""
+Profiling opted into from the environment, which times registration, and the
+profile export writing the chosen format under its own extension.
+"""
+
+#############
+## IMPORTS ##
+#############
+import json
+import os
+
+from standin import loadAddon
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### HELPER FUNCTIONS #####
+
+# Export operator function.
+def exportOperator(addon, filepath, fileFormat):
+    """ Profile export operator on a path and format that ignores reports. """
+    operator = addon.profileExportOperator()
+    operator.filepath = filepath
+    operator.fileFormat = fileFormat
+    operator.report = lambda kind, message: None
+    return operator
+
+
+# ##### TEST FUNCTIONS #####
+
+# Registration test function.
+def test_registration(session, monkeypatch):
+    """ ARMATURE_PANEL_PROFILE times register and unregister. """
+    bpy, addon, importTime = session
+    assert not addon.profiling['enabled']
+    monkeypatch.setenv('ARMATURE_PANEL_PROFILE', '1')
+    addon, importTime = loadAddon()
+    addon.register()
+    addon.unregister()
+    assert addon.profiling['enabled']
+    assert {'register', 'unregister'} <= set(addon.profileStatistics())
+
+
+# Export test function.
+def test_export(session, tmp_path):
+    """ The chosen format replaces the extension instead of being appended. """
+    bpy, addon, importTime = session
+    filepath = str(tmp_path / 'rig.json')
+    operator = exportOperator(addon, filepath, 'CSV')
+    assert operator.check(None)
+    assert operator.filepath == str(tmp_path / 'rig.csv')
+    assert operator.execute(None) == {'FINISHED'}
+    assert os.listdir(str(tmp_path)) == ['rig.csv']
+    operator = exportOperator(addon, str(tmp_path / 'rig.v2'), 'JSON')
+    operator.execute(None)
+    with open(str(tmp_path / 'rig.v2.json')) as file:
+        assert set(json.load(file)) == {'statistics', 'samples'}
@@ -0,0 +1,66 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+"""
+Ranking of the bone name index: exact and side matches first, typos and
+abbreviations found, and the synthetic benchmark rig answered in full.
+"""
+
+###############
+## CONSTANTS ##
+###############
+# Bone names.
+boneNames = ['hand.L', 'hand.R', 'hand_ik.L', 'forearm.L', 'DEF-hand.L',
+             'finger_01.L', 'finger_02.R', 'spine', 'x']
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### TEST FUNCTIONS #####
+
+# Ranking test function.
+def test_ranking(session):
+    """ Exact names rank first, then the preferred side. """
+    bpy, addon, importTime = session
+    index = addon.boneNameIndex(boneNames)
+    assert index.search('hand.L') == ['hand.L', 'hand_ik.L', 'hand.R',
+                                      'DEF-hand.L']
+    assert index.search('spine') == ['spine']
+    assert index.search('zzz') == []
+
+
+# Typo test function.
+def test_typos(session):
+    """ Transposed letters and abbreviations still find the bone. """
+    bpy, addon, importTime = session
+    index = addon.boneNameIndex(boneNames)
+    assert index.search('hnad.R')[0] == 'hand.R'
+    assert index.search('fngr') == ['finger_01.L', 'finger_02.R']
+
+
+# Benchmark test function.
+def test_benchmark(session):
+    """ Every benchmark query returns a full page of results. """
+    bpy, addon, importTime = session
+    results = addon.boneSearchBenchmark(count=1500)
+    assert results['bones'] == 1500
+    assert [results[query]['indexResults']
+            for query in ('hand.L', 'hnad.R', 'fngr', 'spine_0',
+                          'foot_ik_r')] == [20] * 5
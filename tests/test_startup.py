@@ -0,0 +1,144 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Startup checks of the add-on against a minimal stand-in for bpy, run outside
+Blender with:
+
+    python -m pytest -q
+
+Enabling the add-on must stay within the import and register budgets, timed
+cold in a fresh interpreter, without loading the modules only its operators
+need. It must register the operators everywhere and the panels and lists only
+once an armature enters pose or edit mode, never in background sessions.
+"""
+
+#############
+## IMPORTS ##
+#############
+import json
+import os
+import subprocess
+import sys
+import types
+
+from standin import addonName
+
+
+###############
+## CONSTANTS ##
+###############
+# Budgets in milliseconds; the defaults of benchmark.py.
+importBudget = 250.0
+registerBudget = 10.0
+# Deferred modules; imported by the operators and functions that use them.
+deferredModules = ('base64', 'bpy_extras', 'csv', 'json', 'numpy', 'zlib')
+# Startup script; cold import and background registration of the add-on,
+# printed as JSON.
+startupScript = """
+import sys
+from time import perf_counter
+import standin
+sys.modules.update(standin.fakeBpy(True))
+addon, importTime = standin.loadAddon()
+start = perf_counter()
+addon.register()
+registerTime = (perf_counter() - start) * 1000.0
+loaded = [name for name in {deferredModules!r} if name in sys.modules]
+addon.unregister()
+import json
+print(json.dumps({{'import': importTime, 'register': registerTime,
+                  'loaded': loaded}}))
+"""
+
+
+###############
+## FUNCTIONS ##
+###############
+# ##### TEST FUNCTIONS #####
+
+# Budget test function.
+def test_budget():
+    """
+    A cold import and core registration stay within their budgets and load
+    none of the deferred modules.
+    """
+    process = subprocess.run(
+        [sys.executable, '-c', startupScript.format(
+            deferredModules=deferredModules)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True,
+        text=True, check=True)
+    timings = json.loads(process.stdout.splitlines()[-1])
+    assert timings['import'] < importBudget, "import took {:.1f} ms".format(
+        timings['import'])
+    assert timings['register'] < registerBudget, "register took {:.1f} ms".format(
+        timings['register'])
+    assert not timings['loaded'], "loaded at startup: {}".format(
+        ", ".join(timings['loaded']))
+
+
+# Operators test function.
+def test_operators(session):
+    """ The operators are registered with the core in every session. """
+    bpy, addon, importTime = session
+    addon.register()
+    assert addon.shapeToBoneOperator in bpy.registered
+    assert addon.shapeToBoneOperator.bl_idname == 'pose.shape_to_bone'
+    assert not [cls for cls in bpy.registered
+                if cls.__name__.startswith(('ARMATURE_PT_', 'ARMATURE_UL_'))]
+    assert addonName + '.interface' not in sys.modules
+    addon.unregister()
+
+
+# Interface test function.
+def test_interface(session):
+    """ Pose mode registers the panels and lists, except in background. """
+    bpy, addon, importTime = session
+    addon.register()
+    bpy.context = types.SimpleNamespace(mode='POSE')
+    for subscription in bpy.subscriptions:
+        subscription['notify'](*subscription['args'])
+    for timer in list(bpy.timers):
+        if timer() is None:
+            bpy.timers.pop(timer)
+    panels = [cls for cls in bpy.registered
+              if cls.__name__.startswith('ARMATURE_PT_')]
+    subscriptions = [subscription for subscription in bpy.subscriptions
+                     if subscription['owner'] is addon.interfaceOwner]
+    if bpy.app.background:
+        assert not panels
+        assert addonName + '.interface' not in sys.modules
+    else:
+        assert addon.interfaceState['module'].ARMATURE_PT_armaturePanel in panels
+    assert not subscriptions and not bpy.timers
+    addon.unregister()
+
+
+# Unregister test function.
+def test_unregister(session):
+    """ Unregistering leaves no class, handler, timer or subscription behind. """
+    bpy, addon, importTime = session
+    addon.register()
+    addon.registerInterface()
+    addon.unregister()
+    assert not bpy.registered
+    assert not bpy.timers and not bpy.subscriptions
+    handlers = bpy.app.handlers
+    assert not [handler for name in dir(handlers)
+                if isinstance(getattr(handlers, name), list)
+                for handler in getattr(handlers, name)]
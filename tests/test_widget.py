@@ -0,0 +1,39 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the Free
+#  Software Foundation; either version 2 of the License, or (at your option)
+#  any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  this program; if not, write to the Free Software Foundation, Inc.,
+#  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+"""
+Keys of the shared widget meshes, which must tell apart every pair of
+parameters the shape properties can hold.
+"""
+
+###############
+## FUNCTIONS ##
+###############
+# ##### TEST FUNCTIONS #####
+
+# Key test function.
+def test_key(session):
+    """ Nearby radii and offsets get their own key; equal ones share it. """
+    bpy, addon, importTime = session
+    key = addon.widgetKey('CIRCLE', 0.12345, 16, 0.5)
+    assert key == addon.widgetKey('CIRCLE', 0.12345, 16, 0.5)
+    assert key != addon.widgetKey('CIRCLE', 0.12346, 16, 0.5)
+    assert key != addon.widgetKey('CIRCLE', 0.12345, 16, 0.50001)
+    assert key != addon.widgetKey('CIRCLE', 0.12345, 17, 0.5)
+    assert key != addon.widgetKey('SQUARE', 0.12345, 16, 0.5)